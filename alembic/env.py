@@ -6,7 +6,9 @@ from sqlalchemy import pool
 from alembic import context
 
 from app.core.database import Base
-from app.models.models import User, GeneratedContent
+from app.models.models import CONTENT_FTS_TABLE, User, GeneratedContent
+from app.models.jobs import GenerationJob
+from app.models.pipeline_runs import PipelineRun, PipelineStageRun
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -24,6 +26,12 @@ if config.config_file_name is not None:
 
 target_metadata = Base.metadata
 
+
+def include_object(object, name, type_, reflected, compare_to):
+    # The FTS5 index and its shadow tables are managed by hand-written
+    # migrations, not autogenerate
+    return not (type_ == "table" and name.startswith(CONTENT_FTS_TABLE))
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -46,6 +54,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -68,7 +77,11 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+        )
 
         with context.begin_transaction():
             context.run_migrations()
@@ -0,0 +1,59 @@
+"""Add content full-text search
+
+Revision ID: c5b8e2a7d041
+Revises: 7d2e4f9a1c3b
+Create Date: 2026-10-17 15:26:48.117392
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5b8e2a7d041'
+down_revision: Union[str, Sequence[str], None] = '7d2e4f9a1c3b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # FTS5 is SQLite-only; other backends keep search disabled
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute(
+        "CREATE VIRTUAL TABLE generated_content_fts USING fts5("
+        "idea_prompt, content_text, content='generated_content', "
+        "content_rowid='id', tokenize='porter unicode61')"
+    )
+    op.execute(
+        "CREATE TRIGGER generated_content_fts_ai AFTER INSERT ON generated_content BEGIN "
+        "INSERT INTO generated_content_fts (rowid, idea_prompt, content_text) "
+        "VALUES (new.id, new.idea_prompt, new.content_text); END"
+    )
+    op.execute(
+        "CREATE TRIGGER generated_content_fts_ad AFTER DELETE ON generated_content BEGIN "
+        "INSERT INTO generated_content_fts (generated_content_fts, rowid, idea_prompt, content_text) "
+        "VALUES ('delete', old.id, old.idea_prompt, old.content_text); END"
+    )
+    op.execute(
+        "CREATE TRIGGER generated_content_fts_au "
+        "AFTER UPDATE OF idea_prompt, content_text ON generated_content BEGIN "
+        "INSERT INTO generated_content_fts (generated_content_fts, rowid, idea_prompt, content_text) "
+        "VALUES ('delete', old.id, old.idea_prompt, old.content_text); "
+        "INSERT INTO generated_content_fts (rowid, idea_prompt, content_text) "
+        "VALUES (new.id, new.idea_prompt, new.content_text); END"
+    )
+    # Index the rows saved before this migration
+    op.execute("INSERT INTO generated_content_fts (generated_content_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute("DROP TRIGGER generated_content_fts_au")
+    op.execute("DROP TRIGGER generated_content_fts_ad")
+    op.execute("DROP TRIGGER generated_content_fts_ai")
+    op.execute("DROP TABLE generated_content_fts")
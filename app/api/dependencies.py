@@ -1,4 +1,4 @@
-from app.core.database import SessionLocal
+from app.core.database import AsyncReadSessionLocal, AsyncSessionLocal, SessionLocal
 
 
 # Dependency to get database session
@@ -8,3 +8,15 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# Dependency to get an async database session (request handlers)
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Dependency to get a read-only async session (listing and search)
+async def get_async_read_db():
+    async with AsyncReadSessionLocal() as db:
+        yield db
@@ -0,0 +1,52 @@
+import json
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+
+from app.models.response_models import JobResponse
+from app.models.schemas import ContentGenerateRequest
+from app.services.jobs import JOB_QUEUE
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+
+@router.post("/generate", response_model=JobResponse, status_code=202)
+async def enqueue_generation(request: ContentGenerateRequest):
+    """
+    Queue a generation request and return immediately.
+
+    Poll `GET /jobs/{job_id}` or subscribe to `GET /jobs/{job_id}/events`.
+    """
+    return await JOB_QUEUE.enqueue(request)
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str):
+    """Get a job's status and, once finished, its results."""
+    job = await JOB_QUEUE.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("/{job_id}/events")
+async def job_events(job_id: str):
+    """
+    Stream a job's progress as Server-Sent Events.
+
+    Emits `status` events (queued/running/completed/failed, retries),
+    plus `stage` and `result` events while a worker in this process runs
+    the job. The stream ends when the job reaches a final status.
+    """
+    if not await JOB_QUEUE.get(job_id):
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def event_source():
+        async for event in JOB_QUEUE.subscribe(job_id):
+            yield f"event: {event['event']}\ndata: {json.dumps(event)}\n\n"
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,12 +1,18 @@
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-
-from app.api.dependencies import get_db
+import asyncio
+import json
+from datetime import datetime
+from typing import Any, Awaitable, List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies import get_async_db, get_async_read_db
 from app.models.response_models import GenerationResponse
 from app.models.schemas import (
+    CampaignRequest,
     ContentGenerateRequest,
     ContentSaveRequest,
+    ContentSearchResult,
     GeneratedContentResponse,
     ContentUpdateRequest,
     PromptPreviewRequest,
@@ -14,22 +20,75 @@ from app.models.schemas import (
     PlatformPromptPreview,
 )
 from app.services import content as content_service
+from app.services.campaign import CAMPAIGN_SCHEDULER
+from app.services.run_log import PIPELINE_RUN_LOG
 from app.repositories import content_repo
-from app.core.platform_defaults import get_platform_policy
-from app.core.policy import get_merged_config
+from app.core.platform_defaults import PLATFORM_REGISTRY
+from app.core.compiled_policy import POLICY_CACHE, compile_policy
+from app.core.policy import CONFIG_WATCHER
+from app.utils.dedupe import DRAFT_DEDUPER
 from app.services.pipeline.generator import build_generation_prompt
-from app.utils.resilience import CIRCUIT_BREAKER
+from app.utils.resilience import (
+    CIRCUIT_BREAKER,
+    HEDGE_STATS,
+    LATENCY_TRACKER,
+    PROVIDER_HEALTH,
+)
+from app.utils.rate_limit import RATE_LIMITER
+from app.utils.result_cache import PROVIDER_CACHE, RESULT_CACHE
+from app.utils.singleflight import GENERATION_FLIGHTS
+from app.utils.deadline import TIMEOUT_HEADER, deadline_after, resolve_timeout
 
 router = APIRouter()
 
+# How often a running generation checks whether the client went away
+DISCONNECT_POLL_INTERVAL = 0.5
+
+
+def _request_deadline(
+    request: ContentGenerateRequest, http_request: Request
+) -> Optional[float]:
+    """Deadline from the body `timeout_s`, the timeout header or config."""
+    try:
+        timeout = resolve_timeout(
+            request.timeout_s, http_request.headers.get(TIMEOUT_HEADER)
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid {TIMEOUT_HEADER} header")
+    return deadline_after(timeout)
+
+
+async def _cancel_on_disconnect(http_request: Request, work: Awaitable[Any]) -> Any:
+    """
+    Await `work`, cancelling it if the client disconnects first.
+
+    Cancellation propagates down to the in-flight provider calls, so an
+    abandoned request stops spending tokens.
+    """
+    task = asyncio.ensure_future(work)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_INTERVAL)
+            if done:
+                return task.result()
+            if await http_request.is_disconnected():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+                # Status code is never seen by the departed client
+                raise HTTPException(status_code=499, detail="Client disconnected")
+    finally:
+        if not task.done():
+            task.cancel()
+
 
 @router.get("/platforms", tags=["System"])
 async def get_platform_limits():
     """
     Get hard limits/defaults for all supported platforms.
     """
-    platforms = ["linkedin", "x", "reddit", "instagram", "facebook", "tiktok"]
-    return {p: get_platform_policy(p) for p in platforms}
+    return Response(
+        content=PLATFORM_REGISTRY.response_bytes, media_type="application/json"
+    )
 
 
 @router.get("/", tags=["Health"])
@@ -44,20 +103,84 @@ async def health_check():
 
 @router.post("/content/generate", response_model=GenerationResponse, tags=["Content"])
 async def generate_content(
-    request: ContentGenerateRequest, db: Session = Depends(get_db)
+    request: ContentGenerateRequest,
+    http_request: Request,
 ):
     """
     Generate platform-specific content using AI models.
+
+    The time budget comes from `timeout_s` or the X-Request-Timeout header
+    and is split across pipeline stages. Platforms that run out of time are
+    reported with error_code TIMEOUT; if none produced content in time the
+    response is a 504. If the client disconnects, every platform's
+    in-flight provider calls are cancelled.
     """
     # Logic delegated to Service Layer (orchestrate.py / content.py) which uses config.yaml logic
+    deadline = _request_deadline(request, http_request)
+
+    return await _cancel_on_disconnect(
+        http_request,
+        content_service.generate_content(
+            idea=request.idea_prompt,
+            platforms=request.platforms,
+            platform_policies=request.platform_policies,
+            deadline=deadline,
+            cache_mode=request.cache_mode,
+        ),
+    )
+
+
+@router.post("/content/generate/stream", tags=["Content"])
+async def generate_content_stream(
+    request: ContentGenerateRequest, http_request: Request
+):
+    """
+    Generate content and stream progress as Server-Sent Events.
+
+    Emits a `stage` event when each pipeline stage finishes, a `result`
+    event per platform as soon as it completes (completion order), and a
+    final `done` event with the counts.
+    """
 
-    return await content_service.generate_content(
-        idea=request.idea_prompt,
-        platforms=request.platforms,
-        platform_policies=request.platform_policies,
+    deadline = _request_deadline(request, http_request)
+
+    async def event_source():
+        async for event in content_service.generate_content_stream(
+            idea=request.idea_prompt,
+            platforms=request.platforms,
+            platform_policies=request.platform_policies,
+            deadline=deadline,
+            cache_mode=request.cache_mode,
+        ):
+            yield f"event: {event['event']}\ndata: {json.dumps(event)}\n\n"
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
+@router.post("/content/generate/bulk", tags=["Content"])
+async def generate_campaign(request: CampaignRequest):
+    """
+    Generate content for many ideas at once, streaming NDJSON.
+
+    Every (idea, platform) run goes through a shared scheduler with a
+    global concurrency cap (plus per-provider caps on the calls). One
+    `result` line is written per run as it finishes, then a `summary`
+    line with throughput and latency percentiles.
+    """
+
+    async def lines():
+        async for record in CAMPAIGN_SCHEDULER.run(
+            request.items, timeout_s=request.timeout_s, cache_mode=request.cache_mode
+        ):
+            yield json.dumps(record) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 @router.post(
     "/content/preview-prompt", response_model=PromptPreviewResponse, tags=["Content"]
 )
@@ -75,27 +198,33 @@ async def preview_prompt(request: PromptPreviewRequest):
             policy = request.platform_policies[platform]
             overrides = policy.model_dump(exclude_none=True) if policy else None
 
-        # Merge config with overrides
-        config = get_merged_config(platform, overrides)
+        # Merged config with overrides (cached with its instructions)
+        config = compile_policy(platform, overrides)
 
         # Build the prompt
         prompt = build_generation_prompt(request.idea_prompt, platform, config)
 
-        previews.append(PlatformPromptPreview(platform=platform, prompt=prompt))
+        previews.append(
+            PlatformPromptPreview(
+                platform=platform, prompt=prompt, config_version=config.version
+            )
+        )
 
     return PromptPreviewResponse(previews=previews)
 
 
 @router.post("/content/save", response_model=GeneratedContentResponse, tags=["Content"])
-async def save_content(request: ContentSaveRequest, db: Session = Depends(get_db)):
+async def save_content(
+    request: ContentSaveRequest, db: AsyncSession = Depends(get_async_db)
+):
     """Save generated content."""
-    return content_repo.create_content(db, request)
+    return await content_repo.create_content(db, request)
 
 
 @router.delete("/content/{content_id}", tags=["Content"])
-async def delete_content(content_id: int, db: Session = Depends(get_db)):
+async def delete_content(content_id: int, db: AsyncSession = Depends(get_async_db)):
     """Delete saved content."""
-    success = content_repo.delete_content(db, content_id)
+    success = await content_repo.delete_content(db, content_id)
     if not success:
         raise HTTPException(status_code=404, detail="Content not found")
     return {"message": "Content deleted successfully", "id": content_id}
@@ -105,45 +234,151 @@ async def delete_content(content_id: int, db: Session = Depends(get_db)):
     "/content/{content_id}", response_model=GeneratedContentResponse, tags=["Content"]
 )
 async def update_content(
-    content_id: int, request: ContentUpdateRequest, db: Session = Depends(get_db)
+    content_id: int,
+    request: ContentUpdateRequest,
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Update content text."""
-    content = content_repo.update_content(db, content_id, request)
+    content = await content_repo.update_content(db, content_id, request)
     if not content:
         raise HTTPException(status_code=404, detail="Content not found")
     return content
 
 
+# Response header carrying the cursor of the next history page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
 @router.get("/content", response_model=List[GeneratedContentResponse], tags=["Content"])
-async def get_all_content(db: Session = Depends(get_db)):
-    """Get all saved content."""
-    return content_repo.get_all_content(db)
+async def get_all_content(
+    response: Response,
+    limit: int = Query(default=50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    sort: Literal["newest", "oldest"] = "newest",
+    platform: Optional[str] = None,
+    model_used: Optional[str] = None,
+    status: Optional[str] = None,
+    user_id: Optional[int] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    Get saved content, one page at a time.
 
+    Filters combine with AND; `created_from` is inclusive, `created_to`
+    exclusive. When more rows match, the X-Next-Cursor header holds the
+    `cursor` value for the next page (same filters and sort).
+    """
+    try:
+        items, next_cursor = await content_repo.list_content(
+            db,
+            limit=limit,
+            cursor=cursor,
+            sort=sort,
+            platform=platform,
+            model_used=model_used,
+            status=status,
+            user_id=user_id,
+            created_from=created_from,
+            created_to=created_to,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return items
 
-@router.get("/circuit-breaker/status", tags=["System"])
-async def get_model_status():
-    """Get system status."""
-    # Check standard providers + any that have failed
-    providers = ["gemini", "openai", "anthropic", "xai"]
-    tracked = list(CIRCUIT_BREAKER.failures.keys())
-    all_models = set(providers + tracked)
 
-    return {model: CIRCUIT_BREAKER.get_status(model) for model in all_models}
+# Response header set when search ranked only the most recent matches
+SEARCH_TRUNCATED_HEADER = "X-Search-Truncated"
+
 
+@router.get(
+    "/content/search", response_model=List[ContentSearchResult], tags=["Content"]
+)
+async def search_content(
+    response: Response,
+    q: str = Query(min_length=1, max_length=500),
+    platform: Optional[str] = None,
+    limit: int = Query(default=20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    Full-text search over saved ideas and content, best match first.
+
+    Every word must match (the last one as a prefix); results carry a
+    plain-text snippet with the offsets of the hits in it. Only the most
+    recent matches are ranked: when older ones were left out, the
+    X-Search-Truncated header is "true" (narrow the query to reach them).
+    """
+    try:
+        hits, truncated = await content_repo.search_content(
+            db, q, platform=platform, limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except NotImplementedError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    if truncated:
+        response.headers[SEARCH_TRUNCATED_HEADER] = "true"
+    return [
+        ContentSearchResult(
+            content=GeneratedContentResponse.model_validate(content),
+            snippet=snippet,
+            highlights=highlights,
+            rank=rank,
+        )
+        for content, snippet, highlights, rank in hits
+    ]
 
-@router.post("/circuit-breaker/reset/{model_name}", tags=["System"])
+
+@router.get("/circuit-breaker/status", tags=["System"])
+async def get_model_status():
+    """Get system status (per provider/model circuit, with window stats)."""
+    # Tracked provider/model circuits + standard providers not seen yet
+    providers = ["gemini", "openai", "anthropic", "xai"]
+    tracked = CIRCUIT_BREAKER.keys()
+    tracked_providers = {key.split("/")[0] for key in tracked}
+    untracked = [p for p in providers if p not in tracked_providers]
+
+    return {key: CIRCUIT_BREAKER.get_status(key) for key in tracked + untracked}
+
+
+@router.get("/metrics", tags=["System"])
+async def get_metrics():
+    """Get call metrics (health, hedging, latency, rate limiting, caching)."""
+    return {
+        "provider_health": PROVIDER_HEALTH.to_dict(),
+        "hedging": HEDGE_STATS.to_dict(),
+        "latency_ms": {
+            provider: {
+                "samples": LATENCY_TRACKER.count(provider),
+                "p50": LATENCY_TRACKER.percentile(provider, 50),
+                "p95": LATENCY_TRACKER.percentile(provider, 95),
+            }
+            for provider in LATENCY_TRACKER.samples
+        },
+        "rate_limits": RATE_LIMITER.stats,
+        "result_cache": RESULT_CACHE.to_dict(),
+        "provider_cache": PROVIDER_CACHE.to_dict(),
+        "coalescing": GENERATION_FLIGHTS.to_dict(),
+        "campaigns": CAMPAIGN_SCHEDULER.to_dict(),
+        "provider_in_flight": RATE_LIMITER.in_flight,
+        "pipeline_runs": PIPELINE_RUN_LOG.to_dict(),
+        "policy_cache": POLICY_CACHE.to_dict(),
+        "config": CONFIG_WATCHER.to_dict(),
+        "short_circuit": DRAFT_DEDUPER.to_dict(),
+    }
+
+
+@router.post("/circuit-breaker/reset/{model_name:path}", tags=["System"])
 async def reset_model_circuit(model_name: Optional[str] = None):
-    """Reset circuit breaker."""
+    """Reset circuit breaker ('all', a provider, or 'provider/model')."""
     if not model_name or model_name.lower() == "all":
         # Reset everything we know about
-        known_failures = list(CIRCUIT_BREAKER.failures.keys())
-        known_open = list(CIRCUIT_BREAKER.opened_at.keys())
-        targets = set(
-            known_failures + known_open + ["gemini", "openai", "anthropic", "xai"]
-        )
-
-        for m in targets:
-            CIRCUIT_BREAKER.reset(m)
+        for key in CIRCUIT_BREAKER.keys():
+            CIRCUIT_BREAKER.reset(key)
         return {"message": "All circuit breakers reset"}
     else:
         CIRCUIT_BREAKER.reset(model_name)
@@ -0,0 +1,129 @@
+"""
+Compiled policies: merged config and prompt instructions, built once.
+
+compile_policy(platform, overrides) canonicalizes its inputs and the
+current config.yaml snapshot version to a content hash and returns a
+CompiledPolicy: the merged config (get_merged_config), frozen so it can be
+shared between requests, with its rendered prompt instructions
+(build_prompt_instructions). Compiled policies are kept in a bounded LRU,
+so the pipeline stages and /content/preview-prompt reuse them instead of
+re-merging and re-rendering on every call. A config reload changes the
+version, so new requests compile fresh policies while in-flight ones keep
+their own: the snapshot's top-level `models` routing and
+`provider_cache.fresh_stages` travel with the policy for the same reason.
+
+Settings come from the `policy_cache` section of config.yaml.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from app.core.policy import (
+    FrozenDict,
+    build_prompt_instructions,
+    freeze,
+    get_config_snapshot,
+    load_config,
+    merge_config,
+    overrides_to_dict,
+)
+from app.utils.result_cache import cache_key
+
+
+class CompiledPolicy(FrozenDict):
+    """
+    Frozen merged config for one (platform, overrides) pair.
+
+    It is the config dict itself, so it can be passed wherever a merged
+    config is expected; `instructions` holds the rendered prompt block.
+    Settings the stages need from outside the merged sections are read
+    from the same snapshot: `configured_models` (config.yaml `models`) and
+    `configured_fresh_stages` (config.yaml `provider_cache.fresh_stages`).
+    """
+
+    def __init__(
+        self,
+        key: str,
+        platform: str,
+        version: str,
+        config: Dict[str, Any],
+        full_config: Optional[Dict[str, Any]] = None,
+    ):
+        # Subtrees the merge did not touch stay shared with the snapshot
+        super().__init__((k, freeze(v)) for k, v in config.items())
+        self.key = key
+        self.platform = platform
+        self.version = version  # Config snapshot it was merged from
+        self.instructions = build_prompt_instructions(self)
+        full_config = full_config or {}
+        self.configured_models = freeze(full_config.get("models") or {})
+        self.configured_fresh_stages = frozenset(
+            (full_config.get("provider_cache") or {}).get("fresh_stages") or []
+        )
+
+
+def policy_key(platform: str, overrides: Any = None, version: str = "") -> str:
+    """Content hash of a policy's inputs (override key order ignored)."""
+    return cache_key(platform, overrides_to_dict(overrides) or {}, version)
+
+
+def policy_instructions(config: Dict[str, Any]) -> str:
+    """Prompt instructions for a config, reusing a compiled rendering."""
+    if isinstance(config, CompiledPolicy):
+        return config.instructions
+    return build_prompt_instructions(config)
+
+
+class PolicyCache:
+    """Bounded LRU of CompiledPolicies keyed by policy_key()."""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CompiledPolicy]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    @classmethod
+    def from_config(cls) -> "PolicyCache":
+        settings = load_config().get("policy_cache") or {}
+        return cls(max_entries=int(settings.get("max_entries", 256)))
+
+    def compile(
+        self, platform: str, overrides: Any = None, config_path: Optional[str] = None
+    ) -> CompiledPolicy:
+        snapshot = get_config_snapshot(config_path)
+        key = policy_key(platform, overrides, f"{snapshot.path}:{snapshot.version}")
+        policy = self._entries.get(key)
+        if policy is not None:
+            self.stats["hits"] += 1
+            self._entries.move_to_end(key)
+            return policy
+
+        self.stats["misses"] += 1
+        config = merge_config(snapshot.data, platform, overrides)
+        policy = CompiledPolicy(key, platform, snapshot.version, config, snapshot.data)
+        self._entries[key] = policy
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+        return policy
+
+    def clear(self):
+        self._entries.clear()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            **self.stats,
+        }
+
+
+# Global Policy Cache (config.yaml `policy_cache` section)
+POLICY_CACHE = PolicyCache.from_config()
+
+
+def compile_policy(
+    platform: str, overrides: Any = None, config_path: Optional[str] = None
+) -> CompiledPolicy:
+    """Cached, frozen get_merged_config() with its prompt instructions."""
+    return POLICY_CACHE.compile(platform, overrides, config_path)
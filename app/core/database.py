@@ -1,23 +1,136 @@
 import os
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, make_url
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
+from app.core.policy import load_config
+
 load_dotenv()
 
 # Get database URL from environment or use default SQLite
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./database.sqlite")
 
-# Create SQLAlchemy engine
+# Async driver per dialect, used when DATABASE_URL names a sync (or no) driver
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg", "mysql": "aiomysql"}
+SYNC_DRIVERS = {"pysqlite", "psycopg2", "pg8000", "pymysql", "mysqldb"}
+
+
+def to_async_url(url: str) -> str:
+    """
+    Map a sync database URL to its asyncio equivalent.
+
+    e.g. sqlite:///./db.sqlite -> sqlite+aiosqlite:///./db.sqlite,
+    postgresql+psycopg2://... -> postgresql+asyncpg://... URLs that
+    already name an async driver are returned unchanged.
+    """
+    scheme, sep, rest = url.partition("://")
+    dialect, _, driver = scheme.partition("+")
+    if dialect == "postgres":
+        dialect = "postgresql"
+    if driver and driver not in SYNC_DRIVERS:
+        return f"{dialect}+{driver}{sep}{rest}"
+    async_driver = ASYNC_DRIVERS.get(dialect)
+    if async_driver is None:
+        raise ValueError(f"No async driver known for database dialect '{dialect}'")
+    return f"{dialect}+{async_driver}{sep}{rest}"
+
+
+def is_file_sqlite(url: str) -> bool:
+    """SQLite URL backed by a file (in-memory databases cannot be shared)."""
+    database = make_url(url).database
+    return url.startswith("sqlite") and database not in (None, "", ":memory:")
+
+
+def sqlite_pragmas(settings: Dict[str, Any], read_only: bool = False) -> List[str]:
+    """PRAGMA statements for a new SQLite connection (config `database`)."""
+    pragmas = [
+        f"PRAGMA journal_mode = {settings.get('journal_mode', 'wal')}",
+        f"PRAGMA synchronous = {settings.get('synchronous', 'normal')}",
+        # Negative cache_size is in KiB rather than pages
+        f"PRAGMA cache_size = -{int(settings.get('cache_size_kib', 65536))}",
+        f"PRAGMA mmap_size = {int(settings.get('mmap_size_mb', 256)) * 1024 * 1024}",
+        f"PRAGMA busy_timeout = {int(settings.get('busy_timeout_ms', 5000))}",
+    ]
+    if read_only:
+        pragmas.append("PRAGMA query_only = ON")
+    return pragmas
+
+
+def apply_sqlite_profile(
+    engine: Union[Engine, AsyncEngine],
+    settings: Dict[str, Any],
+    read_only: bool = False,
+):
+    """Run the profile's pragmas on every connection the engine opens."""
+    pragmas = sqlite_pragmas(settings, read_only)
+    sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+
+    @event.listens_for(sync_engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+
+def create_async_engines(
+    url: str, settings: Optional[Dict[str, Any]] = None
+) -> Tuple[AsyncEngine, AsyncEngine]:
+    """
+    (writer, reader) async engines for a database URL.
+
+    For a file-backed SQLite database the writer is a single pooled
+    connection - SQLite allows one writer at a time, so writes queue on
+    the pool instead of spinning on the file lock - and readers get their
+    own pool of read-only connections, which WAL lets run alongside the
+    writer. Other databases share one engine for both.
+    """
+    settings = settings if settings is not None else load_config().get("database") or {}
+    async_url = to_async_url(url)
+    if not is_file_sqlite(url):
+        engine = create_async_engine(async_url)
+        return engine, engine
+
+    writer = create_async_engine(async_url, pool_size=1, max_overflow=0)
+    apply_sqlite_profile(writer, settings)
+    reader = create_async_engine(
+        async_url,
+        pool_size=int(settings.get("read_pool_size", 8)),
+        max_overflow=0,
+    )
+    apply_sqlite_profile(reader, settings, read_only=True)
+    return writer, reader
+
+
+# Create SQLAlchemy engine (sync: job queue worker threads, create_all)
 engine = create_engine(
     DATABASE_URL,
     connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {},
 )
+if is_file_sqlite(DATABASE_URL):
+    apply_sqlite_profile(engine, load_config().get("database") or {})
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engines for request handlers, so queries do not block the event loop
+# that is also driving provider calls and streams
+async_engine, async_read_engine = create_async_engines(DATABASE_URL)
+
+# Objects stay usable after commit (no lazy refresh outside the session)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
+# Read-only sessions (history, search); same engine as writes off SQLite
+AsyncReadSessionLocal = async_sessionmaker(
+    async_read_engine, autoflush=False, expire_on_commit=False
+)
+
 # Create Base class for models
 Base = declarative_base()
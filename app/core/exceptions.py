@@ -41,3 +41,10 @@ class ContentNotFoundError(ContentCreatorException):
 
     def __init__(self, message: str):
         super().__init__(message, code="CONTENT_NOT_FOUND", status_code=404)
+
+
+class DeadlineExceededError(ContentCreatorException):
+    """Raised when a request runs out of its time budget."""
+
+    def __init__(self, message: str):
+        super().__init__(message, code="DEADLINE_EXCEEDED", status_code=504)
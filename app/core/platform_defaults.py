@@ -1,58 +1,181 @@
 """
 PLATFORM_DEFAULTS.PY
 The "Physics" of the social networks.
-Contains hard limits (max characters) and default models.
+Contains hard limits (max characters), default models and how characters
+are counted.
 
 These are the SOURCE OF TRUTH for constraints.
+
+Platforms come from three places, later ones winning per platform:
+1. BUILTIN_PLATFORMS below
+2. Plugins registered under the `content_creator.platforms` entry point
+   group (each loads to a {platform: limits} dict, or a callable returning one)
+3. The `platform_limits` section of config.yaml
+
+Everything is resolved once into PLATFORM_REGISTRY: frozen per-platform
+limits, looked up in O(1), and the pre-serialized /platforms response.
 """
 
-from typing import Dict, Any
+import json
+import logging
+import re
+from dataclasses import dataclass
+from importlib.metadata import entry_points
+from typing import Any, Callable, Dict, Optional
+
+from app.core.policy import FrozenDict, freeze, load_config
+
+logger = logging.getLogger(__name__)
+
+ENTRY_POINT_GROUP = "content_creator.platforms"
+
+BUILTIN_PLATFORMS: Dict[str, Dict[str, Any]] = {
+    # LinkedIn
+    "linkedin": {
+        "char_limit": 3000,
+        "primary_model": "gemini",
+    },
+    # X
+    "x": {
+        "char_limit": 280,
+        "primary_model": "xai",
+        "counting": "x",  # Links count as 23 characters
+    },
+    # Reddit
+    "reddit": {
+        "char_limit": 40000,
+        "primary_model": "gemini",
+    },
+    # Instagram
+    "instagram": {
+        "char_limit": 2200,
+        "max_hashtags": 30,  # Instagram Hard Limit
+        "primary_model": "openai",
+    },
+    # Facebook
+    "facebook": {
+        "char_limit": 63206,
+        "primary_model": "gemini",
+    },
+    # TikTok
+    "tiktok": {
+        "char_limit": 2200,
+        "primary_model": "openai",
+    },
+}
+
+# Limits of a platform nobody registered
+FALLBACK_POLICY = FrozenDict({"char_limit": 1000})
+
+_URL = re.compile(r"https?://\S+")
+X_URL_LENGTH = 23  # Every link is shortened to a t.co URL of this length
+
+
+def _count_x(text: str) -> int:
+    return len(_URL.sub("", text)) + X_URL_LENGTH * len(_URL.findall(text))
+
+
+# How a platform counts the length of a post
+COUNTING_RULES: Dict[str, Callable[[str], int]] = {
+    "characters": len,
+    "x": _count_x,
+}
+
+
+@dataclass(frozen=True)
+class PlatformSpec:
+    """Hard limits and defaults of one platform."""
+
+    name: str
+    char_limit: int
+    primary_model: Optional[str] = None
+    max_hashtags: Optional[int] = None
+    counting: str = "characters"
+
+    @classmethod
+    def from_dict(cls, name: str, limits: Dict[str, Any]) -> "PlatformSpec":
+        counting = limits.get("counting", "characters")
+        if counting not in COUNTING_RULES:
+            raise ValueError(f"Platform {name}: unknown counting rule '{counting}'")
+        max_hashtags = limits.get("max_hashtags")
+        return cls(
+            name=name,
+            char_limit=int(limits["char_limit"]),
+            primary_model=limits.get("primary_model"),
+            max_hashtags=int(max_hashtags) if max_hashtags is not None else None,
+            counting=counting,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        policy: Dict[str, Any] = {"char_limit": self.char_limit}
+        if self.max_hashtags is not None:
+            policy["max_hashtags"] = self.max_hashtags
+        if self.primary_model:
+            policy["primary_model"] = self.primary_model
+        policy["counting"] = self.counting
+        return policy
+
+
+def _plugin_platforms() -> Dict[str, Dict[str, Any]]:
+    """{platform: limits} from installed entry point plugins."""
+    platforms: Dict[str, Dict[str, Any]] = {}
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        try:
+            provided = entry_point.load()
+            if callable(provided):
+                provided = provided()
+            platforms.update(provided)
+        except Exception as e:
+            logger.error(f"Platform plugin {entry_point.name} failed to load: {e}")
+    return platforms
+
+
+class PlatformRegistry:
+    """Immutable platform name -> limits table, resolved once."""
+
+    def __init__(self, platforms: Dict[str, Dict[str, Any]]):
+        self.specs: Dict[str, PlatformSpec] = {
+            name.lower(): PlatformSpec.from_dict(name.lower(), limits)
+            for name, limits in platforms.items()
+        }
+        self._policies: Dict[str, FrozenDict] = {
+            name: freeze(spec.to_dict()) for name, spec in self.specs.items()
+        }
+        # GET /platforms never changes, so it is serialized once
+        self.response_bytes: bytes = json.dumps(self._policies).encode("utf-8")
+
+    @classmethod
+    def from_config(cls) -> "PlatformRegistry":
+        platforms = dict(BUILTIN_PLATFORMS)
+        platforms.update(_plugin_platforms())
+        for name, limits in (load_config().get("platform_limits") or {}).items():
+            platforms[name] = {**platforms.get(name, {}), **(limits or {})}
+        return cls(platforms)
+
+    def names(self) -> list[str]:
+        return list(self.specs)
+
+    def get(self, platform: str) -> Optional[PlatformSpec]:
+        return self.specs.get(platform.lower())
+
+    def policy(self, platform: str) -> FrozenDict:
+        return self._policies.get(platform.lower(), FALLBACK_POLICY)
+
+    def count(self, platform: str, text: str) -> int:
+        """Length of a post as the platform counts it."""
+        spec = self.get(platform)
+        return COUNTING_RULES[spec.counting if spec else "characters"](text)
+
+
+# Global Platform Registry (built-ins + plugins + config.yaml `platform_limits`)
+PLATFORM_REGISTRY = PlatformRegistry.from_config()
 
 
 def get_platform_policy(platform: str) -> Dict[str, Any]:
     """
-    Get hard limits for a platform.
+    Get hard limits for a platform (read-only).
     """
-    defaults = {
-        # LinkedIn
-        "linkedin": {
-            "char_limit": 3000,
-            "primary_model": "gemini",
-        },
-        # X
-        "x": {
-            "char_limit": 280,
-            "primary_model": "xai",
-        },
-        # Reddit
-        "reddit": {
-            "char_limit": 40000,
-            "primary_model": "gemini",
-        },
-        # Instagram
-        "instagram": {
-            "char_limit": 2200,
-            "max_hashtags": 30,  # Instagram Hard Limit
-            "primary_model": "openai",
-        },
-        # Facebook
-        "facebook": {
-            "char_limit": 63206,
-            "primary_model": "gemini",
-        },
-        # TikTok
-        "tiktok": {
-            "char_limit": 2200,
-            "primary_model": "openai",
-        },
-    }
-
-    return defaults.get(
-        platform.lower(),
-        {
-            "char_limit": 1000,  # Fallback
-        },
-    )
+    return PLATFORM_REGISTRY.policy(platform)
 
 
 def merge_policies(base: Dict, override: Dict) -> Dict:
@@ -1,13 +1,25 @@
 """
 POLICY_LOADER.PY - Reads config.yaml and converts weights to natural language prompts.
 Handles hierarchical merging: Defaults -> Platform -> Overrides -> Hard Limits.
+
+config.yaml is held as immutable, versioned snapshots. ConfigWatcher
+re-reads the file in the background when its mtime changes and swaps the
+new snapshot in atomically; code that already holds a snapshot (or a
+config merged from it) keeps using it.
 """
 
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+import time
 import yaml
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Dict, Any, Optional
 
-from app.core.platform_defaults import get_platform_policy
+logger = logging.getLogger(__name__)
 
 
 def weight_to_word(weight: float) -> str:
@@ -38,12 +50,49 @@ def build_weighted_list(weights: Dict[str, float]) -> list[str]:
     return result
 
 
-# Global cache for configuration
-_CONFIG_CACHE = {}
+def _readonly(self, *args, **kwargs):
+    raise TypeError("Config snapshots are read-only")
 
 
-def load_config(config_path: Optional[str] = None) -> Dict[str, Any]:
-    """Load the YAML config file (Cached)."""
+class FrozenDict(dict):
+    """dict that refuses mutation (copy() returns a plain, mutable dict)."""
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+    __ior__ = _readonly
+
+
+def freeze(value: Any) -> Any:
+    """Recursively turn dicts into FrozenDicts and lists into tuples."""
+    if isinstance(value, FrozenDict):
+        return value  # Already frozen: share it
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """One immutable version of a config file."""
+
+    path: str
+    version: str  # Content hash of the file ("missing" if it does not exist)
+    mtime: Optional[float]
+    data: FrozenDict
+    loaded_at: float = field(default_factory=time.time)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"path": self.path, "version": self.version, "loaded_at": self.loaded_at}
+
+
+# Current snapshot per config file (replaced whole, never modified)
+_SNAPSHOTS: Dict[str, ConfigSnapshot] = {}
+_SNAPSHOT_LOCK = threading.Lock()
+
+
+def _config_file(config_path: Optional[str] = None) -> str:
     if config_path is None:
         path_obj = Path(__file__).parent / "config.yaml"
     else:
@@ -51,26 +100,130 @@ def load_config(config_path: Optional[str] = None) -> Dict[str, Any]:
 
     # Use absolute string path as cache key to prevent duplicates
     try:
-        abs_path = str(path_obj.resolve())
+        return str(path_obj.resolve())
     except OSError:
         # Fallback if path is invalid (e.g. strict mock)
-        abs_path = str(path_obj)
+        return str(path_obj)
 
-    if abs_path in _CONFIG_CACHE:
-        return _CONFIG_CACHE[abs_path]
 
+def _read_snapshot(abs_path: str) -> ConfigSnapshot:
     try:
-        with open(abs_path, "r", encoding="utf-8") as f:
-            config = yaml.safe_load(f)
-            _CONFIG_CACHE[abs_path] = config
-            return config
+        mtime = os.stat(abs_path).st_mtime
+        with open(abs_path, "rb") as f:
+            raw = f.read()
     except FileNotFoundError:
-        return {"defaults": {}}
+        return ConfigSnapshot(abs_path, "missing", None, freeze({"defaults": {}}))
+    config = yaml.safe_load(raw.decode("utf-8"))
+    version = hashlib.sha256(raw).hexdigest()[:12]
+    return ConfigSnapshot(abs_path, version, mtime, freeze(config))
+
+
+def get_config_snapshot(config_path: Optional[str] = None) -> ConfigSnapshot:
+    """The current snapshot of a config file (read on first use)."""
+    abs_path = _config_file(config_path)
+    snapshot = _SNAPSHOTS.get(abs_path)
+    if snapshot is None:
+        with _SNAPSHOT_LOCK:
+            snapshot = _SNAPSHOTS.get(abs_path)
+            if snapshot is None:
+                snapshot = _read_snapshot(abs_path)
+                # A missing file is not remembered, so creating it takes effect
+                if snapshot.mtime is not None:
+                    _SNAPSHOTS[abs_path] = snapshot
+    return snapshot
+
+
+def load_config(config_path: Optional[str] = None) -> Dict[str, Any]:
+    """Load the YAML config file (current snapshot, read-only)."""
+    return get_config_snapshot(config_path).data
+
+
+def reload_config(config_path: Optional[str] = None) -> Optional[ConfigSnapshot]:
+    """
+    Re-read a config file whose mtime changed and swap in the new snapshot.
+
+    Returns the new snapshot, or None when the content did not change or
+    the file no longer parses (the current snapshot is kept).
+    """
+    abs_path = _config_file(config_path)
+    current = _SNAPSHOTS.get(abs_path)
+    try:
+        mtime = os.stat(abs_path).st_mtime
+    except OSError:
+        return None
+    if current is not None and current.mtime == mtime:
+        return None
+
+    try:
+        snapshot = _read_snapshot(abs_path)
+    except (yaml.YAMLError, UnicodeDecodeError) as e:
+        logger.error(f"Config reload failed, keeping the current version: {e}")
+        return None
+
+    with _SNAPSHOT_LOCK:
+        _SNAPSHOTS[abs_path] = snapshot
+    if current is not None and current.version == snapshot.version:
+        return None  # Touched, not changed
+    logger.info(f"Config {abs_path} reloaded: version {snapshot.version}")
+    return snapshot
+
+
+class ConfigWatcher:
+    """Background task polling config.yaml's mtime and reloading it."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        interval: float = 2.0,
+        config_path: Optional[str] = None,
+    ):
+        self.enabled = enabled
+        self.interval = interval
+        self.config_path = config_path
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {"reloads": 0}
+
+    @classmethod
+    def from_config(cls) -> "ConfigWatcher":
+        settings = load_config().get("config_reload") or {}
+        return cls(
+            enabled=bool(settings.get("enabled", True)),
+            interval=float(settings.get("interval_s", 2.0)),
+        )
+
+    async def start(self):
+        """Start polling (call from the app lifespan)."""
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._watch())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            if reload_config(self.config_path) is not None:
+                self.stats["reloads"] += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            **get_config_snapshot(self.config_path).to_dict(),
+            **self.stats,
+        }
 
 
 def deep_merge(base: Dict, override: Dict) -> Dict:
-    """Recursively merge dictionary overrides into base."""
-    merged = base.copy()
+    """
+    Recursively merge dictionary overrides into base (copy-on-write).
+
+    Neither input is modified: dicts on an overridden path are copied,
+    untouched subtrees are shared with base.
+    """
+    merged = dict(base)
     for key, value in override.items():
         if isinstance(value, dict) and key in merged and isinstance(merged[key], dict):
             merged[key] = deep_merge(merged[key], value)
@@ -79,20 +232,24 @@ def deep_merge(base: Dict, override: Dict) -> Dict:
     return merged
 
 
-def _apply_runtime_overrides(config: Dict, overrides: Any) -> Dict:
-    """Apply runtime request overrides (clean logic extraction)."""
-    if not overrides:
-        return config
-
+def overrides_to_dict(overrides: Any) -> Optional[Dict]:
+    """Plain dict of request overrides (Pydantic models keep set fields only)."""
     # Check if overrides is a Pydantic object (Handle v1 and v2)
     if hasattr(overrides, "model_dump"):
         # Pydantic v2
-        overrides_dict = overrides.model_dump(exclude_unset=True)
+        return overrides.model_dump(exclude_unset=True)
     elif hasattr(overrides, "dict"):
         # Pydantic v1
-        overrides_dict = overrides.dict(exclude_unset=True)
-    else:
-        overrides_dict = overrides
+        return overrides.dict(exclude_unset=True)
+    return overrides
+
+
+def _apply_runtime_overrides(config: Dict, overrides: Any) -> Dict:
+    """Apply runtime request overrides (clean logic extraction)."""
+    if not overrides:
+        return config
+
+    overrides_dict = overrides_to_dict(overrides)
 
     # Map overrides to config structure
 
@@ -103,19 +260,24 @@ def _apply_runtime_overrides(config: Dict, overrides: Any) -> Dict:
     # 2. Legacy Support (Old API)
     # If the user sent top-level 'target_chars', map it to constraints
     if "target_chars" in overrides_dict and overrides_dict["target_chars"]:
-        if "constraints" not in config:
-            config["constraints"] = {}
-        config["constraints"]["target_chars"] = overrides_dict["target_chars"]
+        config["constraints"] = {
+            **(config.get("constraints") or {}),
+            "target_chars": overrides_dict["target_chars"],
+        }
 
     return config
 
 
 def _enforce_hard_limits(config: Dict, platform: str) -> Dict:
     """Enforce platform hard limits (The Physics)."""
+    # Imported here: the platform registry is itself built from load_config()
+    from app.core.platform_defaults import get_platform_policy
+
     hard_limits = get_platform_policy(platform)
     char_limit = hard_limits.get("char_limit", 1000)
 
-    constraints = config.get("constraints", {})
+    # Copy, never modify: the constraints may belong to the config snapshot
+    constraints = dict(config.get("constraints") or {})
 
     # 1. Cap target_chars
     current_target = constraints.get("target_chars", 500)
@@ -132,8 +294,7 @@ def _enforce_hard_limits(config: Dict, platform: str) -> Dict:
         if current_tags > max_tags:
             constraints["hashtags"] = max_tags
 
-    config["constraints"] = constraints
-    return config
+    return {**config, "constraints": constraints}
 
 
 def get_merged_config(
@@ -147,13 +308,18 @@ def get_merged_config(
     3. Request Overrides (runtime)
     4. Hard Limits (platform_defaults.py)
     """
-    full_config = load_config(config_path)
+    return merge_config(load_config(config_path), platform, overrides)
+
 
+def merge_config(
+    full_config: Dict[str, Any], platform: str, overrides: Optional[Dict] = None
+) -> Dict[str, Any]:
+    """get_merged_config() against a given (snapshot) config."""
     # 1. Start with Global Defaults
-    final_config = full_config.get("defaults", {}).copy()
+    final_config = dict(full_config.get("defaults") or {})
 
     # 2. Merge Platform Specific Config
-    platform_config = full_config.get("platforms", {}).get(platform.lower(), {})
+    platform_config = (full_config.get("platforms") or {}).get(platform.lower(), {})
     if platform_config:
         final_config = deep_merge(final_config, platform_config)
 
@@ -310,3 +476,7 @@ def build_prompt_instructions(config: Dict[str, Any]) -> str:
     # Filter out empty sections and join with newlines
     non_empty = [s for s in sections if s]
     return "\n\n".join(non_empty)
+
+
+# Global Config Watcher (config.yaml `config_reload` section), started by the lifespan
+CONFIG_WATCHER = ConfigWatcher.from_config()
@@ -1,19 +1,45 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 
-from app.core.database import Base, engine
+from app.core.database import Base, async_engine, async_read_engine, engine
 from app.core.exceptions import ContentCreatorException
+from app.core.policy import CONFIG_WATCHER
 from app.api.routes import router as api_router
 from app.api.preferences import router as preferences_router
+from app.api.jobs import router as jobs_router
+from app.providers.registry import PROVIDER_REGISTRY
+from app.services.jobs import JOB_QUEUE
+from app.services.run_log import PIPELINE_RUN_LOG
 
 load_dotenv()
 
 # Create all database tables
 Base.metadata.create_all(bind=engine)
 
-app = FastAPI(title="Social Media Content Generator API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Pooled provider clients live for the whole process
+    PROVIDER_REGISTRY.startup()
+    # Background workers for POST /jobs/generate
+    await JOB_QUEUE.start()
+    # Reload config.yaml when it changes
+    await CONFIG_WATCHER.start()
+    yield
+    await CONFIG_WATCHER.stop()
+    await JOB_QUEUE.stop()
+    # Write the pipeline runs still buffered before the engines go away
+    await PIPELINE_RUN_LOG.stop()
+    await PROVIDER_REGISTRY.shutdown()
+    await async_engine.dispose()
+    await async_read_engine.dispose()
+
+
+app = FastAPI(title="Social Media Content Generator API", lifespan=lifespan)
 
 # Configure CORS
 app.add_middleware(
@@ -25,6 +51,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # GET /content pagination
 )
 
 
@@ -42,3 +69,4 @@ async def content_creator_exception_handler(
 # Include the API Router
 app.include_router(api_router)
 app.include_router(preferences_router)
+app.include_router(jobs_router)
@@ -0,0 +1,53 @@
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, DateTime, Index, Integer, String, Text
+
+from app.core.database import Base
+
+
+class JobStatus:
+    """Lifecycle of a queued generation job."""
+
+    QUEUED = "queued"  # waiting for a worker (new, or retry after backoff)
+    RUNNING = "running"  # leased by a worker until locked_until
+    COMPLETED = "completed"  # at least one platform succeeded
+    FAILED = "failed"  # attempts exhausted with no successful platform
+
+    TERMINAL = (COMPLETED, FAILED)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class GenerationJob(Base):
+    __tablename__ = "generation_jobs"
+
+    id = Column(String(32), primary_key=True, default=lambda: uuid.uuid4().hex)
+    status = Column(String, default=JobStatus.QUEUED, nullable=False)
+
+    # ContentGenerateRequest as JSON; result is a GenerationResponse as JSON
+    # (partial results are kept between retries)
+    request = Column(Text, nullable=False)
+    result = Column(Text, nullable=True)
+    error = Column(Text, nullable=True)
+
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, default=3, nullable=False)
+
+    # Visibility timeout: a running job whose lease expired is picked up again
+    available_at = Column(DateTime, default=_utcnow, nullable=False)
+    locked_until = Column(DateTime, nullable=True)
+    worker_id = Column(String, nullable=True)
+
+    created_at = Column(DateTime, default=_utcnow, nullable=False)
+    updated_at = Column(DateTime, default=_utcnow, onupdate=_utcnow, nullable=False)
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_generation_jobs_status_available_at", "status", "available_at"),
+    )
+
+    def __repr__(self):
+        return f"<GenerationJob(id={self.id}, status={self.status}, attempts={self.attempts})>"
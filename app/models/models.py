@@ -1,7 +1,18 @@
 from datetime import datetime, timezone
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    event,
+)
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import column, table
 
 from app.core.database import Base
 from app.models.user_preferences import UserPreference
@@ -50,5 +61,57 @@ class GeneratedContent(Base):
     # Relationship to user
     user = relationship("User", back_populates="generated_contents")
 
+    # History listing is keyset-paginated on (created_at, id), optionally
+    # filtered by user or platform (see content_repo.list_content)
+    __table_args__ = (
+        Index("ix_generated_content_created_at", "created_at"),
+        Index("ix_generated_content_user_id_created_at", "user_id", "created_at"),
+        Index("ix_generated_content_platform_created_at", "platform", "created_at"),
+    )
+
     def __repr__(self):
         return f"<GeneratedContent(id={self.id}, platform={self.platform}, model={self.model_used}, status={self.status})>"
+
+
+# Full-text index over saved content (SQLite FTS5, external content table).
+# Triggers keep it in sync with generated_content; existing databases get
+# it from the add_content_search migration, new ones on create_all.
+CONTENT_FTS_TABLE = "generated_content_fts"
+
+CONTENT_FTS_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {CONTENT_FTS_TABLE} USING fts5("
+    "idea_prompt, content_text, content='generated_content', "
+    "content_rowid='id', tokenize='porter unicode61')",
+    f"CREATE TRIGGER IF NOT EXISTS {CONTENT_FTS_TABLE}_ai "
+    "AFTER INSERT ON generated_content BEGIN "
+    f"INSERT INTO {CONTENT_FTS_TABLE} (rowid, idea_prompt, content_text) "
+    "VALUES (new.id, new.idea_prompt, new.content_text); END",
+    f"CREATE TRIGGER IF NOT EXISTS {CONTENT_FTS_TABLE}_ad "
+    "AFTER DELETE ON generated_content BEGIN "
+    f"INSERT INTO {CONTENT_FTS_TABLE} "
+    f"({CONTENT_FTS_TABLE}, rowid, idea_prompt, content_text) "
+    "VALUES ('delete', old.id, old.idea_prompt, old.content_text); END",
+    f"CREATE TRIGGER IF NOT EXISTS {CONTENT_FTS_TABLE}_au "
+    "AFTER UPDATE OF idea_prompt, content_text ON generated_content BEGIN "
+    f"INSERT INTO {CONTENT_FTS_TABLE} "
+    f"({CONTENT_FTS_TABLE}, rowid, idea_prompt, content_text) "
+    "VALUES ('delete', old.id, old.idea_prompt, old.content_text); "
+    f"INSERT INTO {CONTENT_FTS_TABLE} (rowid, idea_prompt, content_text) "
+    "VALUES (new.id, new.idea_prompt, new.content_text); END",
+]
+
+# Query-side handle on the virtual table (not part of Base.metadata)
+content_fts = table(CONTENT_FTS_TABLE, column("rowid"), column(CONTENT_FTS_TABLE))
+
+
+@event.listens_for(GeneratedContent.__table__, "after_create")
+def _create_content_fts(target, connection, **kw):
+    if connection.dialect.name == "sqlite":
+        for statement in CONTENT_FTS_DDL:
+            connection.exec_driver_sql(statement)
+
+
+@event.listens_for(GeneratedContent.__table__, "after_drop")
+def _drop_content_fts(target, connection, **kw):
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql(f"DROP TABLE IF EXISTS {CONTENT_FTS_TABLE}")
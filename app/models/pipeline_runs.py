@@ -0,0 +1,101 @@
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+)
+from sqlalchemy.orm import relationship
+
+from app.core.database import Base
+
+
+class PipelineRunStatus:
+    """Outcome of one run_pipeline call."""
+
+    # Produced a post: every stage of its pipeline_profile ran, or fewer
+    # when the run short-circuited (see skipped stages on the result)
+    COMPLETED = "completed"
+    CACHED = "cached"  # served from RESULT_CACHE, no provider calls
+    FAILED = "failed"  # a stage raised; stages that finished are kept
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class PipelineRun(Base):
+    __tablename__ = "pipeline_runs"
+
+    id = Column(String(32), primary_key=True, default=lambda: uuid.uuid4().hex)
+    platform = Column(String, nullable=False)
+    idea_prompt = Column(Text, nullable=False)
+    status = Column(String, nullable=False)
+    error = Column(Text, nullable=True)
+
+    winner_version = Column(String, nullable=True)  # v1, v2 or v3 (judge pick)
+
+    # Totals over the stage rows (tokens spent, wall time of the whole run)
+    input_tokens = Column(Integer, default=0, nullable=False)
+    output_tokens = Column(Integer, default=0, nullable=False)
+    latency_ms = Column(Float, nullable=True)
+
+    started_at = Column(DateTime, default=_utcnow, nullable=False)
+    finished_at = Column(DateTime, nullable=True)
+
+    stages = relationship(
+        "PipelineStageRun",
+        back_populates="run",
+        cascade="all, delete-orphan",
+        order_by="PipelineStageRun.id",
+    )
+
+    __table_args__ = (
+        Index("ix_pipeline_runs_started_at", "started_at"),
+        Index("ix_pipeline_runs_platform_started_at", "platform", "started_at"),
+    )
+
+    def __repr__(self):
+        return f"<PipelineRun(id={self.id}, platform={self.platform}, status={self.status})>"
+
+
+class PipelineStageRun(Base):
+    __tablename__ = "pipeline_stage_runs"
+
+    id = Column(Integer, primary_key=True)
+    run_id = Column(
+        String(32),
+        ForeignKey("pipeline_runs.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    stage = Column(String, nullable=False)  # generator, critic, improver, judge
+    version = Column(String, nullable=True)  # v1, v2, v3 (None for the judge)
+    attempt = Column(Integer, default=1, nullable=False)  # generator retries
+
+    provider = Column(String, nullable=False)
+    model = Column(String, nullable=False)
+    fallback_used = Column(Boolean, default=False, nullable=False)
+    cached = Column(Boolean, default=False, nullable=False)  # PROVIDER_CACHE hit
+
+    input_tokens = Column(Integer, default=0, nullable=False)
+    output_tokens = Column(Integer, default=0, nullable=False)
+    latency_ms = Column(Float, nullable=True)
+
+    draft = Column(Text, nullable=True)  # Stage output (raw JSON for the judge)
+    validation_passed = Column(Boolean, nullable=True)  # Generator only
+    scores = Column(Text, nullable=True)  # Judge only: {"v1": 80, ...} as JSON
+
+    created_at = Column(DateTime, default=_utcnow, nullable=False)
+
+    run = relationship("PipelineRun", back_populates="stages")
+
+    def __repr__(self):
+        return f"<PipelineStageRun(run_id={self.run_id}, stage={self.stage}, model={self.model})>"
@@ -14,6 +14,8 @@ class ProviderMetrics(BaseModel):
     input_tokens: int = 0
     output_tokens: int = 0
     latency_ms: float = 0.0
+    time_to_first_token_ms: Optional[float] = None  # Streaming calls only
+    cached: bool = False  # Served from PROVIDER_CACHE, no tokens spent
     total_cost: float = 0.0  # Optional: Estimated cost
 
 
@@ -32,3 +34,22 @@ class ProviderResponse(BaseModel):
     # Provider metadata
     provider_name: str
     model_name: str
+
+    # PROVIDER_CACHE entry this response was served from or stored as
+    cache_key: Optional[str] = Field(default=None, exclude=True)
+
+
+class StreamChunk(BaseModel):
+    """
+    One item yielded by AIProvider.generate_stream().
+
+    Every chunk carries a text delta; the last chunk also carries the
+    assembled ProviderResponse (full content + metrics incl. TTFT).
+    """
+
+    delta: str = ""
+    response: Optional[ProviderResponse] = None
+
+    @property
+    def is_final(self) -> bool:
+        return self.response is not None
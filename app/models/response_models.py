@@ -1,5 +1,6 @@
+from datetime import datetime
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 
 class Draft(BaseModel):
@@ -21,6 +22,12 @@ class PlatformResult(BaseModel):
     error_code: Optional[str] = None
 
     char_count: Optional[int] = None
+    cached: bool = False  # True when served from the result cache
+    config_version: Optional[str] = None  # config.yaml snapshot used for the run
+    pipeline_profile: Optional[str] = None  # fast, balanced or full
+    # Set when the pipeline stopped early (e.g. "critic_unchanged")
+    short_circuit: Optional[str] = None
+    duplicates: Optional[Dict[str, str]] = None  # {"v3": "v1"}: v3 repeated v1
     drafts: Optional[List[Draft]] = None  # For agentic flow transparent history
 
 
@@ -31,3 +38,17 @@ class GenerationResponse(BaseModel):
     success_count: int
     failure_count: int
     total_platforms: int
+
+
+class JobResponse(BaseModel):
+    """Status of a queued generation job (results once it has finished)."""
+
+    id: str
+    status: str  # queued, running, completed, failed
+    attempts: int
+    max_attempts: int
+    error: Optional[str] = None
+    result: Optional[GenerationResponse] = None
+    created_at: datetime
+    updated_at: datetime
+    finished_at: Optional[datetime] = None
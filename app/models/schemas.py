@@ -1,4 +1,4 @@
-from typing import List, Dict, Optional, Any, Union
+from typing import List, Dict, Literal, Optional, Any, Tuple, Union
 from datetime import datetime
 from pydantic import BaseModel, Field, ConfigDict
 
@@ -147,6 +147,10 @@ class PolicyOverride(CamelModel):
     writing_style: Optional[WritingStyle] = None
     format: Optional[FormatConfig] = None
     models: Optional[ModelRouting] = None  # Allow overriding models per request!
+    # Stages that must not reuse cached provider calls (fresh samples)
+    fresh_stages: Optional[List[str]] = None
+    # fast (generator only), balanced (+ critic) or full (+ improver + judge)
+    pipeline_profile: Optional[Literal["fast", "balanced", "full"]] = None
 
     # Backwards compatibility fields (mapped validation in policy.py might need check)
     # kept for simple UI parts if needed, but deep config is preferred
@@ -162,6 +166,27 @@ class ContentGenerateRequest(BaseModel):
     platforms: List[str]
     # Map platform_name -> Full Policy Override
     platform_policies: Optional[Dict[str, PolicyOverride]] = None
+    # Overall time budget in seconds (overrides the X-Request-Timeout header)
+    timeout_s: Optional[float] = Field(default=None, gt=0)
+    # Result cache: "use", "refresh" (recompute and store) or "bypass"
+    cache_mode: Literal["use", "refresh", "bypass"] = "use"
+
+
+class CampaignItem(BaseModel):
+    """One idea of a bulk campaign, with its own platforms and policies."""
+
+    idea_prompt: str
+    platforms: List[str]
+    platform_policies: Optional[Dict[str, PolicyOverride]] = None
+
+
+class CampaignRequest(BaseModel):
+    """Bulk generation request (e.g. a content calendar)."""
+
+    items: List[CampaignItem] = Field(min_length=1, max_length=1000)
+    # Time budget in seconds for each (idea, platform) run
+    timeout_s: Optional[float] = Field(default=None, gt=0)
+    cache_mode: Literal["use", "refresh", "bypass"] = "use"
 
 
 class ContentSaveRequest(BaseModel):
@@ -194,6 +219,17 @@ class GeneratedContentResponse(BaseModel):
         from_attributes = True
 
 
+class ContentSearchResult(BaseModel):
+    """One full-text search hit (GET /content/search)."""
+
+    content: GeneratedContentResponse
+    snippet: str  # Best-matching fragment, plain text (escape before rendering)
+    # [start, end) offsets of the hits in snippet, in UTF-16 code units (as
+    # JavaScript indexes strings), so emoji before a hit do not shift them
+    highlights: List[Tuple[int, int]] = []
+    rank: float  # bm25 score, lower is better
+
+
 class ContentUpdateRequest(BaseModel):
     """Request model for updating content text."""
 
@@ -216,6 +252,7 @@ class PlatformPromptPreview(BaseModel):
 
     platform: str
     prompt: str
+    config_version: Optional[str] = None  # config.yaml snapshot it was built from
 
 
 class PromptPreviewResponse(BaseModel):
@@ -3,15 +3,20 @@ import os
 import asyncio
 import logging
 from abc import ABC, abstractmethod
-from typing import Tuple, Optional
+from typing import Any, AsyncIterator, Dict, Tuple, Optional
 
 from dotenv import load_dotenv
 
-from app.models.provider import ProviderResponse, ProviderMetrics
+from app.models.provider import ProviderResponse, ProviderMetrics, StreamChunk
+from app.utils.rate_limit import RATE_LIMITER
+from app.utils.result_cache import PROVIDER_CACHE, cache_key
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Global timeout for all providers (seconds)
+REQUEST_TIMEOUT = 120.0
+
 # Optional Third-Party Imports
 try:
     import google.generativeai as genai
@@ -50,6 +55,16 @@ class AIProvider(ABC):
         """Return the default model ID."""
         pass
 
+    @property
+    def is_configured(self) -> bool:
+        """Whether credentials are present (calls can actually be made)."""
+        return getattr(self, "_has_key", True)
+
+    @property
+    def sampling_params(self) -> Dict[str, Any]:
+        """Sampling parameters sent with every call (part of the cache key)."""
+        return {}
+
     @abstractmethod
     async def _generate_raw(self, prompt: str, model: str) -> Tuple[str, int, int]:
         """
@@ -62,35 +77,69 @@ class AIProvider(ABC):
         """
         pass
 
-    async def generate(self, prompt: str, model: Optional[str] = None) -> ProviderResponse:
+    async def generate(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        timeout: Optional[float] = None,
+        use_cache: bool = True,
+    ) -> ProviderResponse:
         """
         Public generation method.
-        Handles logging, timing, timeouts, and error handling.
+        Handles logging, timing, timeouts, caching and error handling.
+
+        Args:
+            prompt: User prompt
+            model: Model ID (default: the provider's default model)
+            timeout: Time budget in seconds for this call, including any
+                rate-limit wait (capped at REQUEST_TIMEOUT)
+            use_cache: Reuse (and store) an identical earlier call from
+                PROVIDER_CACHE; False forces a fresh sample
         """
         target_model = model or self.default_model
+
+        call_key = None
+        if use_cache and PROVIDER_CACHE.enabled:
+            call_key = self._cache_key(prompt, target_model)
+            cached = await self._cached_response(call_key)
+            if cached is not None:
+                logger.info(
+                    f"{self.provider_name.title()}: Reusing cached call to {target_model}"
+                )
+                return cached
+
         logger.info(
             f"{self.provider_name.title()}: Generating content with model {target_model}"
         )
 
+        budget = _call_budget(timeout)
+        call_start = time.time()
+
+        # Wait for RPM/TPM capacity instead of firing a doomed request
+        reservation = await self._acquire_capacity(target_model, prompt, budget)
+
         start_time = time.time()
         try:
             # Global timeout for all providers for reliability
             content, in_tokens, out_tokens = await asyncio.wait_for(
-                self._generate_raw(prompt, target_model), timeout=120.0
+                self._generate_in_slot(prompt, target_model),
+                timeout=max(budget - (start_time - call_start), 0.0),
             )
 
         except asyncio.TimeoutError:
             logger.error(f"{self.provider_name.title()} request timed out")
             raise TimeoutError(
-                f"{self.provider_name.title()} API request timed out after 60 seconds"
+                f"{self.provider_name.title()} API request timed out after "
+                f"{budget:.0f} seconds"
             )
         except Exception as e:
             logger.error(f"{self.provider_name.title()} request failed: {e}")
             raise
 
         latency = (time.time() - start_time) * 1000
+        RATE_LIMITER.reconcile(reservation, in_tokens + out_tokens)
 
-        return ProviderResponse(
+        response = ProviderResponse(
             content=content.strip(),
             metrics=ProviderMetrics(
                 input_tokens=in_tokens,
@@ -100,10 +149,155 @@ class AIProvider(ABC):
             provider_name=self.provider_name,
             model_name=target_model,
         )
+        if call_key is not None and response.content:
+            await PROVIDER_CACHE.put(call_key, response.model_dump())
+            response.cache_key = call_key
+        return response
+
+    async def _generate_in_slot(
+        self, prompt: str, model: str
+    ) -> Tuple[str, int, int]:
+        """_generate_raw() under the provider's concurrency cap."""
+        async with RATE_LIMITER.slot(self.provider_name):
+            return await self._generate_raw(prompt, model)
+
+    async def _stream_in_slot(
+        self, prompt: str, model: str, usage: Dict[str, int]
+    ) -> AsyncIterator[str]:
+        """_stream_raw() holding a concurrency slot until the stream closes."""
+        async with RATE_LIMITER.slot(self.provider_name):
+            async for delta in self._stream_raw(prompt, model, usage):
+                yield delta
+
+    def _cache_key(self, prompt: str, model: str) -> str:
+        return cache_key(self.provider_name, model, prompt, self.sampling_params)
+
+    async def _cached_response(self, key: str) -> Optional[ProviderResponse]:
+        """Cached response for an identical call, marked as cached."""
+        data = await PROVIDER_CACHE.get(key)
+        if data is None:
+            return None
+        response = ProviderResponse(**data)
+        # Nothing was spent this time
+        response.metrics = ProviderMetrics(cached=True)
+        response.cache_key = key
+        return response
+
+    async def _stream_raw(
+        self, prompt: str, model: str, usage: Dict[str, int]
+    ) -> AsyncIterator[str]:
+        """
+        Internal implementation of a streaming generation call.
+        Yields text deltas as they arrive and fills `usage` with
+        input_tokens/output_tokens once the provider reports them.
+
+        Default: no native streaming, yields the full completion once.
+        """
+        content, in_tokens, out_tokens = await self._generate_raw(prompt, model)
+        usage["input_tokens"] = in_tokens
+        usage["output_tokens"] = out_tokens
+        yield content
+
+    async def generate_stream(
+        self, prompt: str, model: Optional[str] = None, timeout: Optional[float] = None
+    ) -> AsyncIterator[StreamChunk]:
+        """
+        Public streaming generation method.
+        Yields StreamChunk deltas; the final chunk carries the full
+        ProviderResponse with latency and time-to-first-token metrics.
+        `timeout` works as in generate().
+        """
+        target_model = model or self.default_model
+        logger.info(
+            f"{self.provider_name.title()}: Streaming content with model {target_model}"
+        )
+
+        budget = _call_budget(timeout)
+        call_start = time.time()
+        reservation = await self._acquire_capacity(target_model, prompt, budget)
+
+        usage: Dict[str, int] = {"input_tokens": 0, "output_tokens": 0}
+        parts = []
+        ttft = None
+        start_time = time.time()
+        stream = self._stream_in_slot(prompt, target_model, usage)
+        try:
+            while True:
+                # Same budget as generate(), spread across chunks
+                remaining = budget - (time.time() - call_start)
+                try:
+                    delta = await asyncio.wait_for(
+                        stream.__anext__(), timeout=max(remaining, 0.0)
+                    )
+                except StopAsyncIteration:
+                    break
+                if not delta:
+                    continue
+                if ttft is None:
+                    ttft = (time.time() - start_time) * 1000
+                parts.append(delta)
+                yield StreamChunk(delta=delta)
+
+        except asyncio.TimeoutError:
+            logger.error(f"{self.provider_name.title()} stream timed out")
+            raise TimeoutError(
+                f"{self.provider_name.title()} API stream timed out after "
+                f"{budget:.0f} seconds"
+            )
+        except Exception as e:
+            logger.error(f"{self.provider_name.title()} stream failed: {e}")
+            raise
+        finally:
+            await stream.aclose()
+
+        latency = (time.time() - start_time) * 1000
+        RATE_LIMITER.reconcile(
+            reservation, usage["input_tokens"] + usage["output_tokens"]
+        )
+
+        yield StreamChunk(
+            response=ProviderResponse(
+                content="".join(parts).strip(),
+                metrics=ProviderMetrics(
+                    input_tokens=usage["input_tokens"],
+                    output_tokens=usage["output_tokens"],
+                    latency_ms=latency,
+                    time_to_first_token_ms=ttft,
+                ),
+                provider_name=self.provider_name,
+                model_name=target_model,
+            )
+        )
+
+    async def _acquire_capacity(self, model: str, prompt: str, budget: float):
+        """Wait on the rate limiter, but never longer than the call budget."""
+        try:
+            return await asyncio.wait_for(
+                RATE_LIMITER.acquire(self.provider_name, model, prompt),
+                timeout=budget,
+            )
+        except asyncio.TimeoutError:
+            raise TimeoutError(
+                f"{self.provider_name.title()} rate limit wait exceeded the "
+                f"{budget:.0f} second budget"
+            )
 
     def get_name(self) -> str:
         return self.provider_name
 
+    async def aclose(self) -> None:
+        """Release the underlying client's connections (no-op by default)."""
+        client = getattr(self, "client", None)
+        if client is not None and hasattr(client, "close"):
+            await client.close()
+
+
+def _call_budget(timeout: Optional[float]) -> float:
+    """Effective time budget for one call (never above REQUEST_TIMEOUT)."""
+    if timeout is None:
+        return REQUEST_TIMEOUT
+    return max(0.0, min(timeout, REQUEST_TIMEOUT))
+
 
 class GeminiProvider(AIProvider):
     """Google Gemini AI provider."""
@@ -120,6 +314,8 @@ class GeminiProvider(AIProvider):
 
         genai.configure(api_key=api_key)  # type: ignore
         self.default_model_inst = genai.GenerativeModel("gemini-3-flash-preview")  # type: ignore
+        # Model handles are reused across calls (one per model ID)
+        self._models = {self.default_model: self.default_model_inst}
 
     @property
     def provider_name(self) -> str:
@@ -129,10 +325,15 @@ class GeminiProvider(AIProvider):
     def default_model(self) -> str:
         return "gemini-3-flash-preview"
 
-    async def _generate_raw(self, prompt: str, model: str) -> Tuple[str, int, int]:
-        active_model = self.default_model_inst
-        if model and model != self.default_model:
+    def _get_model(self, model: str):
+        active_model = self._models.get(model or self.default_model)
+        if active_model is None:
             active_model = genai.GenerativeModel(model)  # type: ignore
+            self._models[model] = active_model
+        return active_model
+
+    async def _generate_raw(self, prompt: str, model: str) -> Tuple[str, int, int]:
+        active_model = self._get_model(model)
 
         response = await active_model.generate_content_async(prompt)
 
@@ -145,6 +346,20 @@ class GeminiProvider(AIProvider):
 
         return response.text, input_tokens, output_tokens
 
+    async def _stream_raw(
+        self, prompt: str, model: str, usage: Dict[str, int]
+    ) -> AsyncIterator[str]:
+        active_model = self._get_model(model)
+
+        response = await active_model.generate_content_async(prompt, stream=True)
+        async for chunk in response:
+            # Usage metadata is cumulative; the last chunk has the totals
+            if getattr(chunk, "usage_metadata", None):
+                usage["input_tokens"] = chunk.usage_metadata.prompt_token_count
+                usage["output_tokens"] = chunk.usage_metadata.candidates_token_count
+            if chunk.parts:
+                yield chunk.text
+
 
 class OpenAIProvider(AIProvider):
     """OpenAI (ChatGPT) provider."""
@@ -185,6 +400,21 @@ class OpenAIProvider(AIProvider):
 
         return content, input_tokens, output_tokens
 
+    async def _stream_raw(
+        self, prompt: str, model: str, usage: Dict[str, int]
+    ) -> AsyncIterator[str]:
+        if not self._has_key or not self.client:
+            raise ValueError("OPENAI_API_KEY not configured")
+
+        stream = await self.client.chat.completions.create(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        async for chunk in _iter_openai_stream(stream, usage):
+            yield chunk
+
 
 class AnthropicProvider(AIProvider):
     """Anthropic (Claude) provider."""
@@ -211,14 +441,18 @@ class AnthropicProvider(AIProvider):
     def default_model(self) -> str:
         return "claude-haiku-4-5"
 
+    @property
+    def sampling_params(self) -> Dict[str, Any]:
+        return {"max_tokens": 1024}
+
     async def _generate_raw(self, prompt: str, model: str) -> Tuple[str, int, int]:
         if not self._has_key or not self.client:
             raise ValueError("ANTHROPIC_API_KEY not configured")
 
         message = await self.client.messages.create(
             model=model,
-            max_tokens=1024,
             messages=[{"role": "user", "content": prompt}],
+            **self.sampling_params,
         )
 
         content_block = message.content[0]
@@ -226,6 +460,24 @@ class AnthropicProvider(AIProvider):
 
         return text, message.usage.input_tokens, message.usage.output_tokens
 
+    async def _stream_raw(
+        self, prompt: str, model: str, usage: Dict[str, int]
+    ) -> AsyncIterator[str]:
+        if not self._has_key or not self.client:
+            raise ValueError("ANTHROPIC_API_KEY not configured")
+
+        async with self.client.messages.stream(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            **self.sampling_params,
+        ) as stream:
+            async for text in stream.text_stream:
+                yield text
+            message = await stream.get_final_message()
+
+        usage["input_tokens"] = message.usage.input_tokens
+        usage["output_tokens"] = message.usage.output_tokens
+
 
 class XAIProvider(AIProvider):
     """X.AI (Grok) provider."""
@@ -250,6 +502,10 @@ class XAIProvider(AIProvider):
     def default_model(self) -> str:
         return "grok-4-1-fast-reasoning"
 
+    @property
+    def sampling_params(self) -> Dict[str, Any]:
+        return {"temperature": 0.7, "max_tokens": 1000}
+
     async def _generate_raw(self, prompt: str, model: str) -> Tuple[str, int, int]:
         if not self._has_key or not self.client:
             raise ValueError("GROK_API_KEY not configured")
@@ -257,8 +513,7 @@ class XAIProvider(AIProvider):
         response = await self.client.chat.completions.create(
             model=model,
             messages=[{"role": "user", "content": prompt}],
-            temperature=0.7,
-            max_tokens=1000,
+            **self.sampling_params,
         )
 
         content = response.choices[0].message.content or ""
@@ -266,6 +521,35 @@ class XAIProvider(AIProvider):
         output_tokens = response.usage.completion_tokens if response.usage else 0
         return content, input_tokens, output_tokens
 
+    async def _stream_raw(
+        self, prompt: str, model: str, usage: Dict[str, int]
+    ) -> AsyncIterator[str]:
+        if not self._has_key or not self.client:
+            raise ValueError("GROK_API_KEY not configured")
+
+        stream = await self.client.chat.completions.create(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            **self.sampling_params,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        async for chunk in _iter_openai_stream(stream, usage):
+            yield chunk
+
+
+async def _iter_openai_stream(stream, usage: Dict[str, int]) -> AsyncIterator[str]:
+    """Yield text deltas from an OpenAI-compatible chat completion stream."""
+    async for chunk in stream:
+        # With include_usage, the last chunk has usage and no choices
+        if chunk.usage:
+            usage["input_tokens"] = chunk.usage.prompt_tokens
+            usage["output_tokens"] = chunk.usage.completion_tokens
+        if chunk.choices:
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield delta
+
 
 MODEL_REGISTRY = {
     "gpt-5-mini": ("openai", "gpt-5-mini"),
@@ -294,7 +578,12 @@ def resolve_model(model_id: str) -> Tuple[str, Optional[str]]:
 
 
 def create_provider(model_name: str) -> AIProvider:
-    """Factory function to create AI provider instances."""
+    """
+    Factory function to create AI provider instances.
+
+    Builds a NEW client every call. Request paths should use the pooled
+    instances from app.providers.registry.PROVIDER_REGISTRY instead.
+    """
     providers = {
         "gemini": GeminiProvider,
         "openai": OpenAIProvider,
@@ -0,0 +1,80 @@
+"""
+REGISTRY.PY
+Process-wide pool of AI provider clients.
+
+Each provider wraps an SDK client with its own HTTP connection pool.
+Building them per stage throws those pools away after a single call,
+so the registry keeps one instance per provider for the whole process.
+Created on FastAPI startup and closed on shutdown (see app/main.py).
+"""
+
+import asyncio
+import logging
+from typing import Dict, Optional
+
+from app.providers.ai_provider import AIProvider, create_provider
+
+logger = logging.getLogger(__name__)
+
+KNOWN_PROVIDERS = ("gemini", "openai", "anthropic", "xai")
+
+
+class ProviderRegistry:
+    """Holds one shared AIProvider instance per provider name."""
+
+    def __init__(self):
+        self._providers: Dict[str, AIProvider] = {}
+
+    def get(self, provider_name: str) -> AIProvider:
+        """
+        Get the shared provider instance, creating it on first use.
+
+        Args:
+            provider_name: Provider name (e.g., 'openai')
+
+        Returns:
+            The pooled AIProvider
+
+        Raises:
+            ValueError/ImportError: If the provider cannot be created
+        """
+        key = provider_name.lower()
+        provider = self._providers.get(key)
+        if provider is None:
+            # Creation failures are not cached so a later call can retry
+            provider = create_provider(key)
+            self._providers[key] = provider
+        return provider
+
+    def get_optional(self, provider_name: str) -> Optional[AIProvider]:
+        """Like get(), but returns None if the provider cannot be created."""
+        try:
+            return self.get(provider_name)
+        except (ValueError, ImportError) as e:
+            logger.warning(f"Provider {provider_name} unavailable: {e}")
+            return None
+
+    def startup(self):
+        """Eagerly create every known provider (called on app startup)."""
+        for name in KNOWN_PROVIDERS:
+            self.get_optional(name)
+
+    async def shutdown(self):
+        """Close all pooled clients (called on app shutdown)."""
+        providers = list(self._providers.values())
+        self._providers.clear()
+        results = await asyncio.gather(
+            *(p.aclose() for p in providers), return_exceptions=True
+        )
+        for provider, result in zip(providers, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Failed to close {provider.get_name()}: {result}")
+
+    def active(self) -> list[str]:
+        """Names of providers currently held in the pool."""
+        return list(self._providers.keys())
+
+
+# Global Provider Registry Instance
+# Shared by every pipeline stage, the router and generate_with_resilience
+PROVIDER_REGISTRY = ProviderRegistry()
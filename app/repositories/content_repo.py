@@ -1,21 +1,27 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from app.models.models import GeneratedContent, User
+import base64
+import json
+from datetime import datetime
+from typing import List, Optional, Tuple
+from sqlalchemy import and_, func, literal_column, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.models import CONTENT_FTS_TABLE, GeneratedContent, User, content_fts
 from app.models.schemas import ContentSaveRequest, ContentUpdateRequest
 
 
-def get_or_create_default_user(db: Session) -> User:
-    user = db.query(User).first()
+async def get_or_create_default_user(db: AsyncSession) -> User:
+    user = (await db.execute(select(User).limit(1))).scalar_one_or_none()
     if not user:
         user = User(email="default@example.com", voice_profile="Default voice profile")
         db.add(user)
-        db.commit()
-        db.refresh(user)
+        await db.commit()
+        await db.refresh(user)
     return user
 
 
-def create_content(db: Session, request: ContentSaveRequest) -> GeneratedContent:
-    user = get_or_create_default_user(db)
+async def create_content(
+    db: AsyncSession, request: ContentSaveRequest
+) -> GeneratedContent:
+    user = await get_or_create_default_user(db)
 
     content_record = GeneratedContent(
         idea_prompt=request.idea_prompt,
@@ -29,38 +35,249 @@ def create_content(db: Session, request: ContentSaveRequest) -> GeneratedContent
         regeneration_count=0,
     )
     db.add(content_record)
-    db.commit()
-    db.refresh(content_record)
+    await db.commit()
+    await db.refresh(content_record)
     return content_record
 
 
-def get_content_by_id(db: Session, content_id: int) -> Optional[GeneratedContent]:
-    return db.query(GeneratedContent).filter(GeneratedContent.id == content_id).first()
+async def get_content_by_id(
+    db: AsyncSession, content_id: int
+) -> Optional[GeneratedContent]:
+    return await db.get(GeneratedContent, content_id)
+
+
+HISTORY_SORTS = ("newest", "oldest")
+
+
+def encode_cursor(content: GeneratedContent) -> str:
+    """Opaque keyset cursor pointing just past `content`."""
+    payload = json.dumps([content.created_at.isoformat(), content.id])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Inverse of encode_cursor(); raises ValueError on a malformed cursor."""
+    try:
+        created_at, content_id = json.loads(base64.urlsafe_b64decode(cursor))
+        return datetime.fromisoformat(created_at), int(content_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+async def list_content(
+    db: AsyncSession,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    sort: str = "newest",
+    platform: Optional[str] = None,
+    model_used: Optional[str] = None,
+    status: Optional[str] = None,
+    user_id: Optional[int] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+) -> Tuple[List[GeneratedContent], Optional[str]]:
+    """
+    One page of saved content, keyset-paginated on (created_at, id).
+
+    Unlike OFFSET paging, every page costs the same: the cursor becomes a
+    range condition served by the (user_id|platform, created_at) indexes.
+
+    Returns:
+        (items, next_cursor); next_cursor is None on the last page
+    """
+    if sort not in HISTORY_SORTS:
+        raise ValueError(f"Unknown sort '{sort}'")
+    newest_first = sort == "newest"
+
+    query = select(GeneratedContent)
+    if platform is not None:
+        query = query.where(GeneratedContent.platform == platform)
+    if model_used is not None:
+        query = query.where(GeneratedContent.model_used == model_used)
+    if status is not None:
+        query = query.where(GeneratedContent.status == status)
+    if user_id is not None:
+        query = query.where(GeneratedContent.user_id == user_id)
+    if created_from is not None:
+        query = query.where(GeneratedContent.created_at >= created_from)
+    if created_to is not None:
+        query = query.where(GeneratedContent.created_at < created_to)
+
+    if cursor is not None:
+        after_created_at, after_id = decode_cursor(cursor)
+        if newest_first:
+            query = query.where(
+                # The plain range bound lets the index seek; the OR breaks ties
+                GeneratedContent.created_at <= after_created_at,
+                or_(
+                    GeneratedContent.created_at < after_created_at,
+                    and_(
+                        GeneratedContent.created_at == after_created_at,
+                        GeneratedContent.id < after_id,
+                    ),
+                ),
+            )
+        else:
+            query = query.where(
+                GeneratedContent.created_at >= after_created_at,
+                or_(
+                    GeneratedContent.created_at > after_created_at,
+                    and_(
+                        GeneratedContent.created_at == after_created_at,
+                        GeneratedContent.id > after_id,
+                    ),
+                ),
+            )
+
+    if newest_first:
+        query = query.order_by(
+            GeneratedContent.created_at.desc(), GeneratedContent.id.desc()
+        )
+    else:
+        query = query.order_by(GeneratedContent.created_at, GeneratedContent.id)
+
+    # One extra row tells us whether another page exists
+    rows = list((await db.execute(query.limit(limit + 1))).scalars().all())
+    items = rows[:limit]
+    next_cursor = encode_cursor(items[-1]) if len(rows) > limit else None
+    return items, next_cursor
+
+
+def fts_query(text: str) -> str:
+    """
+    Turn free text into an FTS5 query: every word must match.
+
+    Words are quoted so user input never hits FTS5 query syntax (AND,
+    NEAR, column filters...); the last word also matches as a prefix,
+    which suits search-as-you-type.
+    """
+    words = ['"' + word.replace('"', '""') + '"' for word in text.split()]
+    if not words:
+        raise ValueError("Empty search query")
+    words[-1] += "*"
+    return " ".join(words)
 
 
-def get_all_content(db: Session) -> List[GeneratedContent]:
-    return db.query(GeneratedContent).order_by(GeneratedContent.created_at.desc()).all()
+# snippet() wraps hits in these private-use characters, never HTML: the
+# snippet is saved user text, so markup is left to the client
+HIT_START, HIT_END = "\ue000", "\ue001"
+
+
+def utf16_len(text: str) -> int:
+    """Length in UTF-16 code units, the unit JavaScript strings index by."""
+    return len(text.encode("utf-16-le")) // 2
+
+
+def split_snippet(marked: str) -> Tuple[str, List[Tuple[int, int]]]:
+    """
+    Split a marked snippet into plain text and [start, end) hit offsets.
+
+    Offsets count UTF-16 code units, so a browser can slice the text with
+    them even after an emoji (one code point, two units).
+    """
+    first, *marked_hits = marked.split(HIT_START)
+    text = first
+    offset = utf16_len(first)
+    highlights: List[Tuple[int, int]] = []
+    for part in marked_hits:
+        hit, _, rest = part.partition(HIT_END)
+        end = offset + utf16_len(hit)
+        highlights.append((offset, end))
+        text += hit + rest
+        offset = end + utf16_len(rest)
+    return text, highlights
+
+
+# Only the most recent matches are ranked, so a very common word costs
+# about the same as a rare one (bm25 would otherwise score every match).
+# Searches that hit the window say so, so older matches are never dropped
+# silently: the client can narrow the query or filter by platform.
+SEARCH_RANK_WINDOW = 1000
+
+
+async def search_content(
+    db: AsyncSession,
+    query: str,
+    platform: Optional[str] = None,
+    limit: int = 20,
+) -> Tuple[List[Tuple[GeneratedContent, str, List[Tuple[int, int]], float]], bool]:
+    """
+    Full-text search over idea_prompt and content_text (SQLite FTS5).
+
+    Matches are ranked by bm25 within the SEARCH_RANK_WINDOW most recent
+    ones (all of them for selective queries).
+
+    Returns:
+        Tuple of (hits, truncated). Hits are (content, snippet, highlights,
+        rank) tuples, best match first: the snippet is the best-matching
+        fragment as plain text, highlights the [start, end) UTF-16 offsets
+        of the hits in it, rank the bm25 score (lower is better). truncated is
+        True when older matches fell outside the ranking window.
+    """
+    if db.bind.dialect.name != "sqlite":
+        raise NotImplementedError("Full-text search requires SQLite FTS5")
+
+    fts = literal_column(CONTENT_FTS_TABLE)
+    matches = (
+        select(content_fts.c.rowid)
+        .join(GeneratedContent, GeneratedContent.id == content_fts.c.rowid)
+        .where(fts.op("MATCH")(fts_query(query)))
+    )
+    if platform is not None:
+        matches = matches.where(GeneratedContent.platform == platform)
+
+    # Oldest row inside the window, and whether any match is older still;
+    # FTS5 walks its doclist newest-first here
+    edge = list(
+        await db.scalars(
+            matches.order_by(content_fts.c.rowid.desc())
+            .offset(SEARCH_RANK_WINDOW - 1)
+            .limit(2)
+        )
+    )
+    oldest = edge[0] if edge else None
+    truncated = len(edge) > 1
+
+    rank = literal_column(f"{CONTENT_FTS_TABLE}.rank")
+    statement = (
+        matches.with_only_columns(
+            GeneratedContent,
+            func.snippet(fts, -1, HIT_START, HIT_END, "…", 16),
+            rank,
+        )
+        .order_by(rank)
+        .limit(limit)
+    )
+    if oldest is not None:
+        statement = statement.where(content_fts.c.rowid >= oldest)
+
+    result = await db.execute(statement)
+    hits = [
+        (content, *split_snippet(snippet), score)
+        for content, snippet, score in result.all()
+    ]
+    return hits, truncated
 
 
-def update_content(
-    db: Session, content_id: int, request: ContentUpdateRequest
+async def update_content(
+    db: AsyncSession, content_id: int, request: ContentUpdateRequest
 ) -> Optional[GeneratedContent]:
-    content = get_content_by_id(db, content_id)
+    content = await get_content_by_id(db, content_id)
     if not content:
         return None
 
     content.content_text = request.content_text  # type: ignore
     content.char_count = len(request.content_text)  # type: ignore
-    db.commit()
-    db.refresh(content)
+    await db.commit()
+    await db.refresh(content)
     return content
 
 
-def delete_content(db: Session, content_id: int) -> bool:
-    content = get_content_by_id(db, content_id)
+async def delete_content(db: AsyncSession, content_id: int) -> bool:
+    content = await get_content_by_id(db, content_id)
     if not content:
         return False
 
-    db.delete(content)
-    db.commit()
+    await db.delete(content)
+    await db.commit()
     return True
@@ -0,0 +1,167 @@
+"""Persistence for the durable generation job queue."""
+
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from app.models.jobs import GenerationJob, JobStatus
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def create_job(db: Session, request_json: str, max_attempts: int) -> GenerationJob:
+    job = GenerationJob(request=request_json, max_attempts=max_attempts)
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def get_job(db: Session, job_id: str) -> Optional[GenerationJob]:
+    return db.query(GenerationJob).filter(GenerationJob.id == job_id).first()
+
+
+def _claimable(now: datetime):
+    """Queued jobs that are due, or running jobs whose lease has expired."""
+    return or_(
+        and_(
+            GenerationJob.status == JobStatus.QUEUED, GenerationJob.available_at <= now
+        ),
+        and_(
+            GenerationJob.status == JobStatus.RUNNING, GenerationJob.locked_until < now
+        ),
+    )
+
+
+def claim_next_job(
+    db: Session, worker_id: str, lease_s: float
+) -> Optional[GenerationJob]:
+    """
+    Lease the oldest claimable job for `worker_id`.
+
+    The UPDATE re-checks the claim condition, so when two workers race for
+    the same row only one sees rowcount == 1; the other tries the next one.
+    """
+    now = _now()
+    candidates = (
+        db.query(GenerationJob.id)
+        .filter(_claimable(now))
+        .order_by(GenerationJob.available_at)
+        .limit(5)
+        .all()
+    )
+    for (job_id,) in candidates:
+        claimed = (
+            db.query(GenerationJob)
+            .filter(GenerationJob.id == job_id, _claimable(now))
+            .update(
+                {
+                    GenerationJob.status: JobStatus.RUNNING,
+                    GenerationJob.worker_id: worker_id,
+                    GenerationJob.locked_until: now + timedelta(seconds=lease_s),
+                    GenerationJob.attempts: GenerationJob.attempts + 1,
+                    GenerationJob.updated_at: now,
+                },
+                synchronize_session=False,
+            )
+        )
+        db.commit()
+        if claimed == 1:
+            return get_job(db, job_id)
+    return None
+
+
+def _owned(db: Session, job_id: str, worker_id: str):
+    """Query for a job still leased by this worker."""
+    return db.query(GenerationJob).filter(
+        GenerationJob.id == job_id,
+        GenerationJob.worker_id == worker_id,
+        GenerationJob.status == JobStatus.RUNNING,
+    )
+
+
+def extend_lease(db: Session, job_id: str, worker_id: str, lease_s: float) -> bool:
+    """Renew a running job's lease. False if another worker has taken it."""
+    now = _now()
+    updated = _owned(db, job_id, worker_id).update(
+        {
+            GenerationJob.locked_until: now + timedelta(seconds=lease_s),
+            GenerationJob.updated_at: now,
+        },
+        synchronize_session=False,
+    )
+    db.commit()
+    return updated == 1
+
+
+def finish_job(
+    db: Session,
+    job_id: str,
+    worker_id: str,
+    status: str,
+    result_json: Optional[str] = None,
+    error: Optional[str] = None,
+) -> bool:
+    """Move a leased job to a terminal status."""
+    now = _now()
+    updated = _owned(db, job_id, worker_id).update(
+        {
+            GenerationJob.status: status,
+            GenerationJob.result: result_json,
+            GenerationJob.error: error,
+            GenerationJob.locked_until: None,
+            GenerationJob.finished_at: now,
+            GenerationJob.updated_at: now,
+        },
+        synchronize_session=False,
+    )
+    db.commit()
+    return updated == 1
+
+
+def retry_job(
+    db: Session,
+    job_id: str,
+    worker_id: str,
+    delay_s: float,
+    result_json: Optional[str] = None,
+    error: Optional[str] = None,
+) -> bool:
+    """Requeue a leased job after `delay_s`, keeping any partial result."""
+    now = _now()
+    updated = _owned(db, job_id, worker_id).update(
+        {
+            GenerationJob.status: JobStatus.QUEUED,
+            GenerationJob.result: result_json,
+            GenerationJob.error: error,
+            GenerationJob.available_at: now + timedelta(seconds=delay_s),
+            GenerationJob.locked_until: None,
+            GenerationJob.worker_id: None,
+            GenerationJob.updated_at: now,
+        },
+        synchronize_session=False,
+    )
+    db.commit()
+    return updated == 1
+
+
+def release_job(db: Session, job_id: str, worker_id: str) -> bool:
+    """Hand a leased job back untouched (graceful shutdown); the attempt is refunded."""
+    now = _now()
+    updated = _owned(db, job_id, worker_id).update(
+        {
+            GenerationJob.status: JobStatus.QUEUED,
+            GenerationJob.attempts: GenerationJob.attempts - 1,
+            GenerationJob.available_at: now,
+            GenerationJob.locked_until: None,
+            GenerationJob.worker_id: None,
+            GenerationJob.updated_at: now,
+        },
+        synchronize_session=False,
+    )
+    db.commit()
+    return updated == 1
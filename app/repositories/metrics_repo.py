@@ -1,11 +1,16 @@
 """Quality logging service for tracking content generation metrics."""
 
-from typing import Optional
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, List, Optional
 
 from sqlalchemy.orm import Session
 
 from app.models.models import GeneratedContent
 
+logger = logging.getLogger(__name__)
+
 
 class QualityLogger:
     """
@@ -94,3 +99,138 @@ class QualityLogger:
             char_count=None,
             regeneration_count=regeneration_count,
         )
+
+
+# Tells the flusher to write what it holds and exit
+_STOP = object()
+
+
+class MetricsBuffer:
+    """
+    Write-behind buffer for metric rows.
+
+    Like QualityLogger, callers never commit: put() only enqueues, and a
+    background task writes rows in batches - one write_batch() call (one
+    transaction) per `batch_size` rows or per `flush_interval` seconds,
+    whichever comes first. When the buffer is full, put() waits up to
+    `enqueue_timeout` for space (backpressure) and then drops the row.
+    stop() flushes everything still buffered.
+    """
+
+    def __init__(
+        self,
+        write_batch: Callable[[List[Any]], Awaitable[None]],
+        max_size: int = 1000,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        enqueue_timeout: float = 0.1,
+    ):
+        self.write_batch = write_batch
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {
+            "enqueued": 0,
+            "written": 0,
+            "batches": 0,
+            "delayed": 0,  # waited for space in a full buffer
+            "dropped": 0,  # still no space after enqueue_timeout
+            "failed": 0,  # lost to a failed batch write
+        }
+        self.last_flush_ms: Optional[float] = None
+
+    def _ensure_running(self) -> asyncio.Queue:
+        # Started lazily so the flusher binds to the running event loop
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._queue = asyncio.Queue(maxsize=self.max_size)
+            self._task = asyncio.create_task(self._flusher(self._queue))
+        return self._queue
+
+    async def put(self, row: Any) -> bool:
+        """Enqueue a row (never touches the database). False if dropped."""
+        queue = self._ensure_running()
+        try:
+            queue.put_nowait(row)
+        except asyncio.QueueFull:
+            self.stats["delayed"] += 1
+            try:
+                await asyncio.wait_for(queue.put(row), self.enqueue_timeout)
+            except asyncio.TimeoutError:
+                self.stats["dropped"] += 1
+                logger.warning("Metrics buffer full, dropping a row")
+                return False
+        self.stats["enqueued"] += 1
+        return True
+
+    async def stop(self, timeout: float = 10.0):
+        """Flush buffered rows and stop the flusher (call on shutdown)."""
+        if self._task is None or self._task.done():
+            return
+        await self._queue.put(_STOP)
+        try:
+            await asyncio.wait_for(self._task, timeout)
+        except asyncio.TimeoutError:
+            self._task.cancel()
+            logger.warning(
+                f"Metrics buffer: gave up flushing {self._queue.qsize()} rows"
+            )
+        self._task = None
+
+    async def _flusher(self, queue: asyncio.Queue):
+        while True:
+            batch = [await queue.get()]
+            stopping = batch[0] is _STOP
+            flush_at = time.monotonic() + self.flush_interval
+            while not stopping and len(batch) < self.batch_size:
+                timeout = flush_at - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    row = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if row is _STOP:
+                    stopping = True
+                else:
+                    batch.append(row)
+
+            if stopping:
+                # Drain whatever is left, in batch_size chunks
+                batch = [row for row in batch if row is not _STOP]
+                while not queue.empty():
+                    row = queue.get_nowait()
+                    if row is not _STOP:
+                        batch.append(row)
+                for start in range(0, len(batch), self.batch_size):
+                    await self._flush(batch[start : start + self.batch_size])
+                return
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[Any]):
+        if not batch:
+            return
+        start = time.perf_counter()
+        try:
+            await self.write_batch(batch)
+            self.stats["written"] += len(batch)
+            self.stats["batches"] += 1
+        except Exception as e:
+            self.stats["failed"] += len(batch)
+            logger.warning(f"Metrics buffer: batch of {len(batch)} failed: {e}")
+        self.last_flush_ms = (time.perf_counter() - start) * 1000
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def to_dict(self) -> dict:
+        return {
+            "pending": self.pending,
+            "last_flush_ms": self.last_flush_ms,
+            **self.stats,
+        }
@@ -0,0 +1,31 @@
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.pipeline_runs import PipelineRun, PipelineStageRun
+
+
+def build_run(run: Dict[str, Any], stages: List[Dict[str, Any]]) -> PipelineRun:
+    """PipelineRun row (with its stage rows) from plain recorder dicts."""
+    record = PipelineRun(**run)
+    record.stages = [PipelineStageRun(**stage) for stage in stages]
+    return record
+
+
+async def create_run(
+    db: AsyncSession, run: Dict[str, Any], stages: List[Dict[str, Any]]
+) -> PipelineRun:
+    record = build_run(run, stages)
+    db.add(record)
+    await db.commit()
+    return record
+
+
+async def create_runs(
+    db: AsyncSession, runs: List[Tuple[Dict[str, Any], List[Dict[str, Any]]]]
+) -> List[PipelineRun]:
+    """Insert a batch of (run, stages) pairs in one transaction."""
+    records = [build_run(run, stages) for run, stages in runs]
+    db.add_all(records)
+    await db.commit()
+    return records
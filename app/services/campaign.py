@@ -0,0 +1,153 @@
+"""
+Bulk campaign generation.
+
+A campaign is a list of (idea, platforms, policies) items. Every
+(item, platform) pair becomes one pipeline run, scheduled through a
+process-wide semaphore so concurrent campaigns share one global cap.
+Provider calls inside those runs are further limited per provider by
+RATE_LIMITER (`rate_limits.<provider>.max_concurrency`).
+
+Results are yielded as each run finishes, followed by a summary with
+throughput and latency percentiles.
+
+Settings come from the `campaigns` section of config.yaml.
+"""
+
+import asyncio
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from app.core.policy import load_config
+from app.models.schemas import CampaignItem
+from app.services import content as content_service
+from app.utils.deadline import deadline_after, resolve_timeout
+from app.utils.result_cache import CACHE_USE
+
+
+def _percentile(values: List[float], percentile: float) -> Optional[float]:
+    """Nearest-rank percentile of a list (None when empty)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, int(round(percentile / 100 * len(ordered))) - 1)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+class CampaignScheduler:
+    """Global concurrency cap shared by every running campaign."""
+
+    def __init__(self, max_concurrency: int = 8):
+        self.max_concurrency = max_concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.running = 0
+        self.waiting = 0
+
+    @classmethod
+    def from_config(cls) -> "CampaignScheduler":
+        settings = load_config().get("campaigns") or {}
+        return cls(max_concurrency=int(settings.get("max_concurrency", 8)))
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # Created lazily so it binds to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def _run_one(
+        self,
+        index: int,
+        item: CampaignItem,
+        platform: str,
+        deadline_s: Optional[float],
+        cache_mode: str,
+    ) -> Dict[str, Any]:
+        self.waiting += 1
+        try:
+            await self._get_semaphore().acquire()
+        finally:
+            self.waiting -= 1
+        self.running += 1
+        start = time.monotonic()
+        try:
+            result = await content_service.generate_for_platform_shared(
+                idea=item.idea_prompt,
+                platform=platform,
+                overrides=(item.platform_policies or {}).get(platform),
+                # Each run gets its own budget, counted from when it starts
+                deadline=deadline_after(deadline_s),
+                cache_mode=cache_mode,
+            )
+        finally:
+            self.running -= 1
+            self._get_semaphore().release()
+        return {
+            "type": "result",
+            "item": index,
+            "platform": platform,
+            "latency_ms": (time.monotonic() - start) * 1000,
+            "result": result.model_dump(),
+        }
+
+    async def run(
+        self,
+        items: List[CampaignItem],
+        timeout_s: Optional[float] = None,
+        cache_mode: str = CACHE_USE,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run every (item, platform) pair, yielding results in completion order.
+
+        The last record is a summary (counts, elapsed time, throughput and
+        latency percentiles). Closing the iterator early (client gone)
+        cancels the runs that have not finished.
+        """
+        run_timeout = resolve_timeout(timeout_s)
+        started = time.monotonic()
+        tasks = [
+            asyncio.create_task(
+                self._run_one(index, item, platform, run_timeout, cache_mode)
+            )
+            for index, item in enumerate(items)
+            for platform in item.platforms
+        ]
+
+        latencies: List[float] = []
+        success_count = 0
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                record = await next_done
+                latencies.append(record["latency_ms"])
+                if record["result"]["success"]:
+                    success_count += 1
+                yield record
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        elapsed = time.monotonic() - started
+        yield {
+            "type": "summary",
+            "items": len(items),
+            "runs": len(tasks),
+            "success_count": success_count,
+            "failure_count": len(tasks) - success_count,
+            "elapsed_s": elapsed,
+            "runs_per_minute": len(tasks) / elapsed * 60 if elapsed > 0 else None,
+            "latency_ms": {
+                "p50": _percentile(latencies, 50),
+                "p95": _percentile(latencies, 95),
+                "max": max(latencies) if latencies else None,
+            },
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "running": self.running,
+            "waiting": self.waiting,
+        }
+
+
+# Global Campaign Scheduler (config.yaml `campaigns` section)
+CAMPAIGN_SCHEDULER = CampaignScheduler.from_config()
@@ -5,45 +5,33 @@ This module coordinates content generation using the new pipeline.
 """
 
 import asyncio
-from typing import Optional, Dict, Any
+from typing import AsyncIterator, Optional, Dict, Any
+from app.core.compiled_policy import compile_policy
+from app.core.exceptions import DeadlineExceededError
+from app.core.platform_defaults import PLATFORM_REGISTRY
 from app.models.response_models import GenerationResponse, PlatformResult, Draft
-from app.services.orchestrate import run_pipeline
+from app.services.orchestrate import run_pipeline, StageCallback
+from app.utils.resilience import ErrorCode, classify_error  # noqa: F401
+from app.utils.deadline import remaining
+from app.utils.result_cache import CACHE_USE, cache_key
+from app.utils.singleflight import GENERATION_FLIGHTS
 
-
-# Error codes for classification
-class ErrorCode:
-    """Standard error codes for content generation failures."""
-
-    RATE_LIMIT = "RATE_LIMIT"
-    TIMEOUT = "TIMEOUT"
-    NETWORK_ERROR = "NETWORK_ERROR"
-    INVALID_API_KEY = "INVALID_API_KEY"
-    VALIDATION_FAILED = "VALIDATION_FAILED"
-    PROVIDER_ERROR = "PROVIDER_ERROR"
-    ALL_MODELS_FAILED = "ALL_MODELS_FAILED"
-    UNKNOWN = "UNKNOWN"
-
-
-def classify_error(error: Exception) -> str:
-    """Classify an error into a standard error code."""
-    error_str = str(error).lower()
-
-    if any(kw in error_str for kw in ["rate limit", "429", "quota"]):
-        return ErrorCode.RATE_LIMIT
-    if any(kw in error_str for kw in ["timeout", "timed out"]):
-        return ErrorCode.TIMEOUT
-    if any(kw in error_str for kw in ["network", "connection", "503", "502"]):
-        return ErrorCode.NETWORK_ERROR
-    if any(kw in error_str for kw in ["api key", "401", "403", "unauthorized"]):
-        return ErrorCode.INVALID_API_KEY
-    if any(kw in error_str for kw in ["500", "internal server error"]):
-        return ErrorCode.PROVIDER_ERROR
-
-    return ErrorCode.UNKNOWN
+# Display names of the pipeline stages, in order
+STAGE_NAMES = {
+    "generator": "Generator",
+    "critic": "Critic",
+    "improver": "Improver",
+    "judge": "Blind Judge",
+}
 
 
 async def generate_for_platform(
-    idea: str, platform: str, overrides: Optional[Dict[str, Any]] = None
+    idea: str,
+    platform: str,
+    overrides: Optional[Dict[str, Any]] = None,
+    on_stage: Optional[StageCallback] = None,
+    deadline: Optional[float] = None,
+    cache_mode: str = CACHE_USE,
 ) -> PlatformResult:
     """
     Generate content for a single platform using the new pipeline.
@@ -51,13 +39,22 @@ async def generate_for_platform(
     Args:
         idea: Content idea/prompt
         platform: Target platform (e.g., 'linkedin', 'x')
+        on_stage: Optional async callback for per-stage progress
+        deadline: Optional time.monotonic() deadline for the pipeline
+        cache_mode: Result cache mode ("use", "refresh" or "bypass")
 
     Returns:
-        PlatformResult with success/failure status and content
+        PlatformResult with success/failure status and content (a stage
+        that ran out of time gives error_code TIMEOUT)
     """
     try:
         pipeline_result = await run_pipeline(
-            user_input=idea, platform=platform, overrides=overrides
+            user_input=idea,
+            platform=platform,
+            overrides=overrides,
+            on_stage=on_stage,
+            deadline=deadline,
+            cache_mode=cache_mode,
         )
 
         # Get winning version from judge ranking
@@ -77,44 +74,54 @@ async def generate_for_platform(
         # Format judge results with mapping
         judge_output_lines = []
         judge_output_lines.append("SCORES:")
-        for label in ["A", "B", "C"]:
+        for label, version in sorted(pipeline_result.shuffle_map.items()):
             score = pipeline_result.judge_result.scores.get(label, 0)
-            version = pipeline_result.shuffle_map.get(label, "unknown")
             judge_output_lines.append(f"{label}: {version} - Score: {score}")
 
         judge_output_lines.append(f"\nWINNER: {winner_label} ({winner_version})")
         judge_content = "\n".join(judge_output_lines)
 
+        # Only the stages that actually ran
+        skipped = set(pipeline_result.skipped_stages)
+        drafts = [
+            Draft(
+                step=step,
+                content=getattr(pipeline_result, version),
+                model=getattr(pipeline_result, f"{version}_model"),
+            )
+            for stage, step, version in [
+                ("generator", "Generator (v1)", "v1"),
+                ("critic", "Critic (v2)", "v2"),
+                ("improver", "Improver (v3)", "v3"),
+            ]
+            if stage not in skipped
+        ]
+        if "judge" not in skipped:
+            drafts.append(
+                Draft(
+                    step="Judge",
+                    content=judge_content,
+                    model=pipeline_result.judge_result.model_name,
+                )
+            )
+        stage_names = [
+            name for stage, name in STAGE_NAMES.items() if stage not in skipped
+        ]
+
         return PlatformResult(
             platform=platform,
             success=True,
             content=content,
-            model_used="Pipeline (Generator + Critic + Improver + Blind Judge)",
+            model_used=f"Pipeline ({' + '.join(stage_names)})",
             error=None,
             error_code=None,
-            char_count=len(content),
-            drafts=[
-                Draft(
-                    step="Generator (v1)",
-                    content=pipeline_result.v1,
-                    model=pipeline_result.v1_model,
-                ),
-                Draft(
-                    step="Critic (v2)",
-                    content=pipeline_result.v2,
-                    model=pipeline_result.v2_model,
-                ),
-                Draft(
-                    step="Improver (v3)",
-                    content=pipeline_result.v3,
-                    model=pipeline_result.v3_model,
-                ),
-                Draft(
-                    step="Judge",
-                    content=judge_content,
-                    model=pipeline_result.judge_result.model_name,
-                ),
-            ],
+            char_count=PLATFORM_REGISTRY.count(platform, content),
+            cached=pipeline_result.cached,
+            config_version=pipeline_result.config_version,
+            pipeline_profile=pipeline_result.profile,
+            short_circuit=pipeline_result.short_circuit,
+            duplicates=pipeline_result.duplicates or None,
+            drafts=drafts,
         )
 
     except Exception as e:
@@ -130,20 +137,66 @@ async def generate_for_platform(
         )
 
 
+async def generate_for_platform_shared(
+    idea: str,
+    platform: str,
+    overrides: Optional[Dict[str, Any]] = None,
+    deadline: Optional[float] = None,
+    cache_mode: str = CACHE_USE,
+) -> PlatformResult:
+    """
+    generate_for_platform(), coalescing identical concurrent requests.
+
+    Requests with the same idea, platform, merged config and cache mode
+    that arrive while a run is in flight share that run's result. The run
+    is only cancelled once every request waiting on it has gone away.
+    The run keeps the deadline of the request that started it.
+    """
+    config = compile_policy(platform, overrides)
+    key = cache_key(idea, platform, config, cache_mode)
+
+    result = await GENERATION_FLIGHTS.do(
+        key,
+        lambda: generate_for_platform(
+            idea=idea,
+            platform=platform,
+            overrides=overrides,
+            deadline=deadline,
+            cache_mode=cache_mode,
+        ),
+    )
+    # Each caller gets its own copy of the shared result
+    return result.model_copy(deep=True)
+
+
 async def generate_content(
     idea: str,
     platforms: list[str],
     platform_policies: Optional[Dict[str, Any]] = None,
+    deadline: Optional[float] = None,
+    cache_mode: str = CACHE_USE,
 ) -> GenerationResponse:
     """
     Generate content for multiple platforms (in parallel).
 
+    Identical platform runs already in flight are joined rather than
+    repeated (see generate_for_platform_shared). Cancelling this coroutine
+    (e.g. on client disconnect) cancels every platform pipeline no other
+    request is waiting on, along with its in-flight provider calls.
+
     Args:
         idea: Content idea/prompt
         platforms: List of platform names
+        deadline: Optional time.monotonic() deadline shared by all platforms
+        cache_mode: Result cache mode ("use", "refresh" or "bypass")
 
     Returns:
-        GenerationResponse with all results
+        GenerationResponse with all results; platforms that ran out of time
+        are reported with error_code TIMEOUT
+
+    Raises:
+        DeadlineExceededError: If the request deadline expired before any
+            platform produced content (HTTP 504)
     """
     # Run all platforms in parallel
     tasks = []
@@ -151,16 +204,93 @@ async def generate_content(
         # Extract override for this specific platform if it exists
         overrides = (platform_policies or {}).get(platform)
         tasks.append(
-            generate_for_platform(idea=idea, platform=platform, overrides=overrides)
+            generate_for_platform_shared(
+                idea=idea,
+                platform=platform,
+                overrides=overrides,
+                deadline=deadline,
+                cache_mode=cache_mode,
+            )
         )
     results = await asyncio.gather(*tasks)
 
     success_count = sum(1 for r in results if r.success)
     failure_count = len(results) - success_count
 
+    # Nothing to return in time: the request itself timed out
+    if (
+        success_count == 0
+        and any(r.error_code == ErrorCode.TIMEOUT for r in results)
+        and deadline is not None
+        and remaining(deadline) == 0
+    ):
+        raise DeadlineExceededError("Request exceeded its deadline")
+
     return GenerationResponse(
         results=results,
         success_count=success_count,
         failure_count=failure_count,
         total_platforms=len(platforms),
     )
+
+
+async def generate_content_stream(
+    idea: str,
+    platforms: list[str],
+    platform_policies: Optional[Dict[str, Any]] = None,
+    deadline: Optional[float] = None,
+    cache_mode: str = CACHE_USE,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Generate content for multiple platforms, yielding progress events.
+
+    Events (dicts with an "event" key), in completion order:
+    - "stage": a pipeline stage (v1, v2, v3, judge) finished for a platform
+    - "result": a platform finished (PlatformResult fields under "result")
+    - "done": all platforms finished (counts, like GenerationResponse)
+
+    Closing the iterator early (e.g. client disconnect) cancels the
+    remaining platform pipelines.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def run_one(platform: str):
+        async def on_stage(stage: str, payload: Dict[str, Any]):
+            await queue.put(
+                {"event": "stage", "platform": platform, "stage": stage, **payload}
+            )
+
+        overrides = (platform_policies or {}).get(platform)
+        result = await generate_for_platform(
+            idea=idea,
+            platform=platform,
+            overrides=overrides,
+            on_stage=on_stage,
+            deadline=deadline,
+            cache_mode=cache_mode,
+        )
+        await queue.put({"event": "result", "result": result.model_dump()})
+        return result
+
+    tasks = [asyncio.create_task(run_one(platform)) for platform in platforms]
+    success_count = 0
+    try:
+        pending = len(tasks)
+        while pending:
+            event = await queue.get()
+            if event["event"] == "result":
+                pending -= 1
+                if event["result"]["success"]:
+                    success_count += 1
+            yield event
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    yield {
+        "event": "done",
+        "success_count": success_count,
+        "failure_count": len(platforms) - success_count,
+        "total_platforms": len(platforms),
+    }
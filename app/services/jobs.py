@@ -0,0 +1,346 @@
+"""
+Durable background job queue for content generation.
+
+Jobs live in the `generation_jobs` table, so they survive a restart.
+A pool of async workers leases due jobs (visibility timeout), runs the
+pipeline for every platform still missing a result, and either finishes
+the job or requeues it with exponential backoff. A worker renews its
+lease while it is alive; if it dies, the lease expires and another
+worker picks the job up.
+
+Progress is published to in-process subscribers (SSE); subscribers fall
+back to polling the table for jobs run by another process.
+
+Settings come from the `jobs` section of config.yaml.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set
+
+from app.core.database import SessionLocal
+from app.core.policy import load_config
+from app.models.jobs import GenerationJob, JobStatus
+from app.models.schemas import ContentGenerateRequest
+from app.repositories import job_repo
+from app.services import content as content_service
+from app.utils.deadline import deadline_after, resolve_timeout
+
+logger = logging.getLogger(__name__)
+
+
+def job_snapshot(job: Optional[GenerationJob]) -> Optional[Dict[str, Any]]:
+    """Plain-dict view of a job row (safe to use after the session closes)."""
+    if job is None:
+        return None
+    return {
+        "id": job.id,
+        "status": job.status,
+        "attempts": job.attempts,
+        "max_attempts": job.max_attempts,
+        "error": job.error,
+        "result": json.loads(job.result) if job.result else None,
+        "request": job.request,
+        "created_at": job.created_at,
+        "updated_at": job.updated_at,
+        "finished_at": job.finished_at,
+    }
+
+
+class JobQueue:
+    """Worker pool and pub/sub hub over the generation_jobs table."""
+
+    def __init__(
+        self,
+        workers: int = 2,
+        poll_interval: float = 1.0,
+        visibility_timeout: float = 300.0,
+        max_attempts: int = 3,
+        retry_delay: float = 30.0,
+        session_factory: Callable = SessionLocal,
+    ):
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.session_factory = session_factory
+
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._worker_prefix = f"{socket.gethostname()}-{os.getpid()}"
+
+    @classmethod
+    def from_config(cls) -> "JobQueue":
+        settings = load_config().get("jobs") or {}
+        return cls(
+            workers=int(settings.get("workers", 2)),
+            poll_interval=float(settings.get("poll_interval_s", 1.0)),
+            visibility_timeout=float(settings.get("visibility_timeout_s", 300)),
+            max_attempts=int(settings.get("max_attempts", 3)),
+            retry_delay=float(settings.get("retry_delay_s", 30)),
+        )
+
+    # --- Database access (sync repository calls run in a worker thread) ---
+
+    async def _db(self, fn: Callable, *args) -> Any:
+        def call():
+            db = self.session_factory()
+            try:
+                return fn(db, *args)
+            finally:
+                db.close()
+
+        return await asyncio.to_thread(call)
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await self._db(lambda db: job_snapshot(job_repo.get_job(db, job_id)))
+
+    # --- Producer side ---
+
+    async def enqueue(self, request: ContentGenerateRequest) -> Dict[str, Any]:
+        """Persist a generation request as a queued job."""
+        # exclude_none keeps policy overrides "unset" when reloaded
+        request_json = request.model_dump_json(exclude_none=True)
+        snapshot = await self._db(
+            lambda db: job_snapshot(
+                job_repo.create_job(db, request_json, self.max_attempts)
+            )
+        )
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return snapshot
+
+    # --- Pub/sub ---
+
+    def _publish(self, job_id: str, event: Dict[str, Any]):
+        for queue in self._subscribers.get(job_id, ()):
+            queue.put_nowait(event)
+
+    def _status_event(self, snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "event": "status",
+            "job_id": snapshot["id"],
+            "status": snapshot["status"],
+            "attempts": snapshot["attempts"],
+            "error": snapshot["error"],
+        }
+
+    async def subscribe(self, job_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield a job's events until it reaches a terminal status.
+
+        Starts with the current status; then stage/result/retry events
+        from this process, with a periodic status poll for jobs running
+        elsewhere.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.setdefault(job_id, set()).add(queue)
+        try:
+            snapshot = await self.get(job_id)
+            if snapshot is None:
+                return
+            yield self._status_event(snapshot)
+            last_status = snapshot["status"]
+
+            while last_status not in JobStatus.TERMINAL:
+                try:
+                    event = await asyncio.wait_for(
+                        queue.get(), timeout=max(self.poll_interval, 1.0)
+                    )
+                except asyncio.TimeoutError:
+                    snapshot = await self.get(job_id)
+                    if snapshot is None:
+                        return
+                    if snapshot["status"] != last_status:
+                        last_status = snapshot["status"]
+                        yield self._status_event(snapshot)
+                    continue
+                if event["event"] == "status":
+                    last_status = event["status"]
+                yield event
+        finally:
+            subscribers = self._subscribers.get(job_id)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del self._subscribers[job_id]
+
+    # --- Workers ---
+
+    async def start(self):
+        """Start the worker pool (call from the app lifespan)."""
+        if self._tasks:
+            return
+        self._wakeup = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._worker(f"{self._worker_prefix}-{n}"))
+            for n in range(self.workers)
+        ]
+        logger.info(f"Job queue: started {self.workers} workers")
+
+    async def stop(self):
+        """Stop the workers; jobs they hold are handed back to the queue."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _worker(self, worker_id: str):
+        while True:
+            try:
+                job = await self._db(
+                    lambda db: job_snapshot(
+                        job_repo.claim_next_job(db, worker_id, self.visibility_timeout)
+                    )
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Job queue: claim failed: {e}")
+                job = None
+
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                    self._wakeup.clear()
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self._process(job, worker_id)
+
+    async def _keep_lease(self, job_id: str, worker_id: str, run: asyncio.Task):
+        """Renew the lease while the job runs; stop the run if it is lost."""
+        while True:
+            await asyncio.sleep(self.visibility_timeout / 3)
+            try:
+                owned = await self._db(
+                    job_repo.extend_lease, job_id, worker_id, self.visibility_timeout
+                )
+            except Exception as e:
+                logger.warning(f"Job {job_id}: lease renewal failed: {e}")
+                continue
+            if not owned:
+                logger.warning(f"Job {job_id}: lease lost, abandoning run")
+                run.cancel()
+                return
+
+    async def _process(self, job: Dict[str, Any], worker_id: str):
+        job_id = job["id"]
+        self._publish(job_id, self._status_event(job))
+
+        if job["attempts"] > job["max_attempts"]:
+            # Lease expired on the final attempt (the worker died)
+            await self._finish(job, worker_id, job["result"], "Attempts exhausted")
+            return
+
+        run = asyncio.create_task(self._run(job))
+        keeper = asyncio.create_task(self._keep_lease(job_id, worker_id, run))
+        try:
+            results = await run
+            error = None
+        except asyncio.CancelledError:
+            if keeper.done() and not keeper.cancelled():
+                return  # Lease lost: the new owner reports the outcome
+            # We are shutting down: give the job back untouched
+            await self._db(job_repo.release_job, job_id, worker_id)
+            raise
+        except Exception as e:
+            logger.error(f"Job {job_id}: attempt {job['attempts']} crashed: {e}")
+            results, error = job["result"], str(e)
+        finally:
+            keeper.cancel()
+
+        await self._finish(job, worker_id, results, error)
+
+    async def _run(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the pipeline for every platform without a successful result."""
+        request = ContentGenerateRequest.model_validate_json(job["request"])
+        previous = {r["platform"]: r for r in (job["result"] or {}).get("results", [])}
+        results = {p: r for p, r in previous.items() if r["success"]}
+        pending = [p for p in request.platforms if p not in results]
+
+        deadline = deadline_after(resolve_timeout(request.timeout_s))
+        async for event in content_service.generate_content_stream(
+            idea=request.idea_prompt,
+            platforms=pending,
+            platform_policies=request.platform_policies,
+            deadline=deadline,
+            cache_mode=request.cache_mode,
+        ):
+            if event["event"] == "done":
+                continue  # The job's own status event closes the stream
+            self._publish(job["id"], {"job_id": job["id"], **event})
+            if event["event"] == "result":
+                results[event["result"]["platform"]] = event["result"]
+
+        ordered = [
+            results.get(p) or previous.get(p)
+            for p in request.platforms
+            if p in results or p in previous
+        ]
+        success_count = sum(1 for r in ordered if r["success"])
+        return {
+            "results": ordered,
+            "success_count": success_count,
+            "failure_count": len(request.platforms) - success_count,
+            "total_platforms": len(request.platforms),
+        }
+
+    async def _finish(
+        self,
+        job: Dict[str, Any],
+        worker_id: str,
+        result: Optional[Dict[str, Any]],
+        error: Optional[str],
+    ):
+        """Complete, fail or requeue a job after an attempt."""
+        job_id = job["id"]
+        failed = [r for r in (result or {}).get("results", []) if not r["success"]]
+        if error is None and failed:
+            error = "; ".join(f"{r['platform']}: {r['error']}" for r in failed)
+        result_json = json.dumps(result) if result else None
+
+        if error is not None and job["attempts"] < job["max_attempts"]:
+            delay = self.retry_delay * 2 ** (job["attempts"] - 1)
+            await self._db(
+                job_repo.retry_job, job_id, worker_id, delay, result_json, error
+            )
+            logger.info(f"Job {job_id}: retrying in {delay:.0f}s ({error})")
+            self._publish(
+                job_id,
+                {
+                    "event": "status",
+                    "job_id": job_id,
+                    "status": JobStatus.QUEUED,
+                    "attempts": job["attempts"],
+                    "error": error,
+                    "retry_in_s": delay,
+                },
+            )
+            return
+
+        succeeded = bool(result and result.get("success_count"))
+        status = JobStatus.COMPLETED if succeeded else JobStatus.FAILED
+        await self._db(
+            job_repo.finish_job, job_id, worker_id, status, result_json, error
+        )
+        self._publish(
+            job_id,
+            {
+                "event": "status",
+                "job_id": job_id,
+                "status": status,
+                "attempts": job["attempts"],
+                "error": error,
+            },
+        )
+
+
+# Global Job Queue (config.yaml `jobs` section), started by the app lifespan
+JOB_QUEUE = JobQueue.from_config()
@@ -1,14 +1,107 @@
-"""Model routing logic for selecting AI providers based on platform."""
+"""Model routing logic for selecting AI providers based on platform and stage."""
 
-from typing import Tuple, Optional
+from typing import Any, Dict, List, Tuple, Optional
 from app.core.platform_defaults import get_platform_policy
-from app.providers.ai_provider import AIProvider, create_provider
-from app.utils.resilience import CIRCUIT_BREAKER
+from app.core.policy import load_config
+from app.providers.ai_provider import AIProvider, resolve_model
+from app.providers.registry import KNOWN_PROVIDERS, PROVIDER_REGISTRY
+from app.utils.resilience import CIRCUIT_BREAKER, PROVIDER_HEALTH
+
+# A routed chain entry: (provider, specific model or None for its default)
+ChainEntry = Tuple[AIProvider, Optional[str]]
 
 
 class ModelRouter:
     """Routes platform requests to appropriate AI models."""
 
+    @staticmethod
+    def get_stage_model(config: Dict[str, Any], stage: str) -> str:
+        """
+        Get the preferred model for a pipeline stage.
+
+        Priority:
+        1. Request overrides (merged config -> models.pipeline[stage] / default)
+        2. config.yaml -> models.pipeline[stage]
+        3. config.yaml -> models.default
+        4. "gemini"
+
+        For a CompiledPolicy, config.yaml means the snapshot it was compiled
+        from, so a reload never reroutes the stages of a running pipeline.
+        """
+        models = config.get("models") or {}
+        stage_model = (models.get("pipeline") or {}).get(stage) or models.get("default")
+        if stage_model:
+            return stage_model
+
+        configured = getattr(config, "configured_models", None)
+        if configured is None:
+            configured = load_config().get("models") or {}
+        return (
+            (configured.get("pipeline") or {}).get(stage)
+            or configured.get("default")
+            or "gemini"
+        )
+
+    @staticmethod
+    def _rank_key(provider: AIProvider) -> Tuple[bool, float, float]:
+        """
+        Sort key for fallback providers (lower is better):
+        breaker state first, then success rate (10% bands), then EWMA latency.
+        """
+        name = provider.get_name()
+        available = CIRCUIT_BREAKER.is_available(name, provider.default_model)
+        success_band = round(PROVIDER_HEALTH.success_rate(name), 1)
+        latency = PROVIDER_HEALTH.latency_ms(name)
+        return (
+            not available,
+            -success_band,
+            latency if latency is not None else float("inf"),
+        )
+
+    @staticmethod
+    def route(config: Dict[str, Any], stage: str) -> List[ChainEntry]:
+        """
+        Build the ordered fallback chain for a pipeline stage.
+
+        The configured model leads the chain (with its specific model ID)
+        unless its circuit is open, in which case it drops behind the
+        healthy providers. Every other configured provider follows,
+        ranked by live health, using its default model.
+
+        Args:
+            config: Merged config for the request (from get_merged_config)
+            stage: Pipeline stage (generator, critic, improver, judge)
+
+        Returns:
+            List of (provider, model) pairs for generate_with_resilience
+        """
+        provider_name, specific_model = resolve_model(
+            ModelRouter.get_stage_model(config, stage)
+        )
+
+        # Preferred provider is kept even if unconfigured, so its error surfaces
+        preferred = PROVIDER_REGISTRY.get_optional(provider_name)
+
+        fallbacks = []
+        for name in KNOWN_PROVIDERS:
+            if name == provider_name:
+                continue
+            provider = PROVIDER_REGISTRY.get_optional(name)
+            if provider is not None and provider.is_configured:
+                fallbacks.append(provider)
+        fallbacks.sort(key=ModelRouter._rank_key)
+
+        chain: List[ChainEntry] = [(p, None) for p in fallbacks]
+        if preferred is not None:
+            entry = (preferred, specific_model)
+            circuit_model = specific_model or preferred.default_model
+            if CIRCUIT_BREAKER.is_available(provider_name, circuit_model):
+                chain.insert(0, entry)
+            else:
+                healthy = sum(1 for p in fallbacks if not ModelRouter._rank_key(p)[0])
+                chain.insert(healthy, entry)
+        return chain
+
     @staticmethod
     def select_model(
         platform: str, overrides: Optional[dict] = None
@@ -40,20 +133,7 @@ class ModelRouter:
                 if override_default:
                     primary_name = override_default
 
-        # Determine fallback dynamically if not set
-        fallback_name = policy.get("fallback_model")
-        if not fallback_name:
-            # Simple toggle fallback
-            fallback_name = "openai" if primary_name == "gemini" else "gemini"
-
-        # Circuit Breaker Check
-        if not CIRCUIT_BREAKER.is_available(primary_name):
-            if CIRCUIT_BREAKER.is_available(fallback_name):
-                # Swap: Fallback becomes primary
-                return create_provider(fallback_name), create_provider(primary_name)
-            else:
-                # Both down? Try primary anyway or raise error?
-                # For now, return primary and let it fail (to trigger retry/breaker open again)
-                pass
-
-        return create_provider(primary_name), create_provider(fallback_name)
+        chain = ModelRouter.route({"models": {"default": primary_name}}, "default")
+        if len(chain) < 2:
+            raise ValueError(f"No fallback provider available for {primary_name}")
+        return chain[0][0], chain[1][0]
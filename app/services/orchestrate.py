@@ -9,23 +9,49 @@ Responsibilities:
 5. Shuffle [v1, v2, v3] → assign A, B, C randomly
 6. Run judge with shuffled texts
 7. Reveal mapping and present results to user
+
+The merged config's `pipeline_profile` picks how many stages run:
+"fast" (generator + validation), "balanced" (generator + critic, no
+judge) or "full" (all of the above).
+
+Short-circuits: if the critic returns v1 unchanged, the improver and
+judge are skipped and v1 wins; if it makes only a small edit, v2 wins
+(when it passes validation). A v3 that repeats v1 or v2 is dropped
+before judging.
 """
 
 import random
-from typing import Dict, Tuple, Any, Optional
-from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Tuple, Any, Optional
+from dataclasses import asdict, dataclass, field
 from dotenv import load_dotenv
 
-from app.core.policy import get_merged_config, build_prompt_instructions
+from app.core.compiled_policy import compile_policy
 from app.services.pipeline.generator import generate
 from app.services.pipeline.critic import critique
 from app.services.pipeline.improver import improve
 from app.services.pipeline.judge import judge, JudgeResult
+from app.services.model_router import ModelRouter
+from app.services.run_log import PIPELINE_RUN_LOG, RunTrace
+from app.models.pipeline_runs import PipelineRunStatus
+from app.utils.deadline import stage_deadline
+from app.utils.result_cache import (
+    CACHE_BYPASS,
+    CACHE_REFRESH,
+    CACHE_USE,
+    PROVIDER_CACHE,
+    RESULT_CACHE,
+    cache_key,
+)
+from app.utils.dedupe import DRAFT_DEDUPER
 from app.utils.validation import OutputValidator
+from app.models.provider import ProviderResponse
 
 
 load_dotenv()  # Load API keys from .env
 
+# Progress hook: called as on_stage(stage, payload) after each stage finishes
+StageCallback = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
 
 @dataclass
 class PipelineResult:
@@ -39,6 +65,15 @@ class PipelineResult:
     v3_model: str
     shuffle_map: Dict[str, str]  # {"A": "v1", "B": "v3", "C": "v2"}
     judge_result: JudgeResult
+    cached: bool = False  # Served from RESULT_CACHE instead of a fresh run
+    config_version: Optional[str] = None  # config.yaml snapshot the run used
+    profile: str = "full"  # pipeline_profile the run used
+    # Set when the run stopped before its profile's last stage:
+    # "critic_unchanged" (v2 is v1, v1 wins) or "critic_minor_edit" (v2 is
+    # a near-identical edit of v1, v2 wins); neither runs improver or judge
+    short_circuit: Optional[str] = None
+    skipped_stages: List[str] = field(default_factory=list)
+    duplicates: Dict[str, str] = field(default_factory=dict)  # {"v3": "v1"}
 
 
 def shuffle_versions(
@@ -52,26 +87,109 @@ def shuffle_versions(
         - texts_for_judge: {"A": "text...", "B": "text...", "C": "text..."}
         - reveal_map: {"A": "v1", "B": "v3", "C": "v2"} (for revealing after)
     """
-    versions = [("v1", v1), ("v2", v2), ("v3", v3)]
+    return shuffle_drafts([("v1", v1), ("v2", v2), ("v3", v3)])
+
+
+def shuffle_drafts(
+    versions: List[Tuple[str, str]],
+) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """shuffle_versions() for any number of (version, text) drafts."""
+    versions = list(versions)
     random.shuffle(versions)
 
-    labels = ["A", "B", "C"]
     texts_for_judge = {}
     reveal_map = {}
 
     for i, (version_name, content) in enumerate(versions):
-        label = labels[i]
+        label = chr(ord("A") + i)
         texts_for_judge[label] = content
         reveal_map[label] = version_name
 
     return texts_for_judge, reveal_map
 
 
+def _stage_payload(response: ProviderResponse) -> Dict[str, Any]:
+    """Progress payload for a drafting stage."""
+    return {
+        "model": response.model_name,
+        "content": response.content,
+        "latency_ms": response.metrics.latency_ms,
+    }
+
+
+# Bump when PipelineResult or the prompts change shape, to orphan old entries
+RESULT_CACHE_VERSION = 2
+
+PIPELINE_STAGES = ["generator", "critic", "improver", "judge"]
+
+# Stages each `pipeline_profile` runs
+PIPELINE_PROFILES = {
+    "fast": ["generator"],
+    "balanced": ["generator", "critic"],
+    "full": PIPELINE_STAGES,
+}
+
+
+def pipeline_cache_key(user_input: str, platform: str, config: Dict[str, Any]) -> str:
+    """Content hash of everything that determines a pipeline run's output."""
+    routing = {
+        stage: ModelRouter.get_stage_model(config, stage) for stage in PIPELINE_STAGES
+    }
+    return cache_key(RESULT_CACHE_VERSION, user_input, platform, config, routing)
+
+
+def _result_from_dict(data: Dict[str, Any]) -> PipelineResult:
+    """Rebuild a cached PipelineResult (stored as plain JSON)."""
+    data = dict(data)
+    data["judge_result"] = JudgeResult(**data["judge_result"])
+    data["cached"] = True
+    return PipelineResult(**data)
+
+
+def _judge_payload(result: PipelineResult) -> Dict[str, Any]:
+    """Progress payload for the judge stage, labels revealed as versions."""
+    reveal_map = result.shuffle_map
+    return {
+        "model": result.judge_result.model_name,
+        "scores": {
+            reveal_map[label]: score
+            for label, score in result.judge_result.scores.items()
+            if label in reveal_map
+        },
+        "ranking": [
+            reveal_map[label]
+            for label in result.judge_result.ranking
+            if label in reveal_map
+        ],
+    }
+
+
+async def _replay_stages(result: PipelineResult, on_stage: StageCallback):
+    """Fire the progress events of a cached run, so streams look the same."""
+    for stage, name in [("v1", "generator"), ("v2", "critic"), ("v3", "improver")]:
+        if name in result.skipped_stages:
+            continue
+        await on_stage(
+            stage,
+            {
+                "model": getattr(result, f"{stage}_model"),
+                "content": getattr(result, stage),
+                "latency_ms": None,
+                "cached": True,
+            },
+        )
+    if "judge" not in result.skipped_stages:
+        await on_stage("judge", {**_judge_payload(result), "cached": True})
+
+
 async def run_pipeline(
     user_input: str,
     platform: str,
     config_path: Optional[str] = None,
     overrides: Optional[Dict[str, Any]] = None,
+    on_stage: Optional[StageCallback] = None,
+    deadline: Optional[float] = None,
+    cache_mode: str = CACHE_USE,
 ) -> PipelineResult:
     """
     Run the complete content generation pipeline.
@@ -80,44 +198,206 @@ async def run_pipeline(
         user_input: The user's content/topic/brief
         platform: Target platform (linkedin, x, etc.)
         config_path: Optional path to config.yaml
+        on_stage: Optional async callback fired when each stage
+            (v1, v2, v3, judge) finishes, for progress streaming
+        deadline: Optional time.monotonic() deadline for the whole run,
+            split across the stages still to run
+        cache_mode: "use" (default), "refresh" (skip the cached result and
+            store a fresh one) or "bypass" (do not touch RESULT_CACHE); with
+            either of the last two no stage reuses a cached provider call
 
     Returns:
         PipelineResult with all versions, shuffle map, and judge scores
     """
-    # Load config with overrides
-    config = get_merged_config(platform, overrides, config_path)
+    # Load config with overrides (compiled once, shared by every stage).
+    # The run keeps this snapshot even if config.yaml is reloaded meanwhile.
+    config = compile_policy(platform, overrides, config_path)
+    trace = PIPELINE_RUN_LOG.trace(user_input, platform)
+
+    # Identical idea + platform + config + routing: reuse the whole run
+    result_key = None
+    if cache_mode != CACHE_BYPASS:
+        result_key = pipeline_cache_key(user_input, platform, config)
+        # Asking any stage for a fresh sample implies a fresh run
+        if cache_mode != CACHE_REFRESH and not config.get("fresh_stages"):
+            cached = await RESULT_CACHE.get(result_key)
+            if cached is not None:
+                result = _result_from_dict(cached)
+                result.config_version = config.version
+                if on_stage:
+                    await _replay_stages(result, on_stage)
+                await trace.finish(
+                    PipelineRunStatus.CACHED, winner_version=_winner_version(result)
+                )
+                return result
+
+    try:
+        result = await _run_stages(
+            user_input,
+            platform,
+            config,
+            trace,
+            on_stage,
+            deadline,
+            # refresh/bypass mean fresh provider calls too, not replayed ones
+            use_cache=cache_mode == CACHE_USE,
+        )
+    except Exception as e:
+        await trace.finish(PipelineRunStatus.FAILED, error=str(e))
+        raise
+    result.config_version = config.version
+    await trace.finish(
+        PipelineRunStatus.COMPLETED, winner_version=_winner_version(result)
+    )
+
+    # An unparseable judge response is worth retrying, not caching (its
+    # provider call was already evicted in _run_stages)
+    if result_key is not None and result.judge_result.ranking:
+        await RESULT_CACHE.put(result_key, asdict(result))
+
+    return result
+
+
+def _winner_version(result: PipelineResult) -> Optional[str]:
+    """Version (v1, v2, v3) the judge ranked first, if it ranked at all."""
+    ranking = result.judge_result.ranking
+    return result.shuffle_map.get(ranking[0]) if ranking else None
+
+
+async def _run_stages(
+    user_input: str,
+    platform: str,
+    config: Dict[str, Any],
+    trace: RunTrace,
+    on_stage: Optional[StageCallback],
+    deadline: Optional[float],
+    use_cache: bool = True,
+) -> PipelineResult:
+    """Run the stages of the config's pipeline_profile, recording each one."""
+    profile = config.get("pipeline_profile") or "full"
+    if profile not in PIPELINE_PROFILES:
+        raise ValueError(f"Unknown pipeline_profile '{profile}'")
+    stages = PIPELINE_PROFILES[profile]
 
     # Step 1: Generate v1 (with validation + 1 retry)
     # Note: generate returns ProviderResponse
-    v1_resp = await generate(user_input, platform, config)
+    v1_resp = await generate(
+        user_input,
+        platform,
+        config,
+        stage_deadline(deadline, "generator", stages),
+        use_cache=use_cache,
+    )
     v1 = v1_resp.content
 
     validation = OutputValidator.validate(v1, platform, config)
+    trace.stage("generator", "v1", v1_resp, config, validation_passed=validation.passed)
 
     if not validation.passed:
-        # Retry once
-        v1_resp = await generate(user_input, platform, config)
+        # Retry once, with a fresh sample: the cached call is the invalid draft
+        if v1_resp.cache_key:
+            await PROVIDER_CACHE.delete(v1_resp.cache_key)
+        v1_resp = await generate(
+            user_input,
+            platform,
+            config,
+            stage_deadline(deadline, "generator", stages),
+            use_cache=False,
+        )
         v1 = v1_resp.content
         validation = OutputValidator.validate(v1, platform, config)
+        trace.stage(
+            "generator",
+            "v1",
+            v1_resp,
+            config,
+            attempt=2,
+            validation_passed=validation.passed,
+        )
 
         if not validation.passed:
             raise ValueError(f"Generator failed validation twice: {validation.reason}")
 
+    if on_stage:
+        await on_stage("v1", _stage_payload(v1_resp))
+
+    if profile == "fast":
+        return _early_result(profile, "v1", v1_resp)
+
     # Step 2: Critique → v2
-    v2_resp = await critique(v1, platform, config)
+    v2_resp = await critique(
+        v1,
+        platform,
+        config,
+        stage_deadline(deadline, "critic", stages[1:]),
+        use_cache=use_cache,
+    )
     v2 = v2_resp.content
+    trace.stage("critic", "v2", v2_resp, config)
+
+    if on_stage:
+        await on_stage("v2", _stage_payload(v2_resp))
+
+    if profile == "balanced":
+        # No judge: the critic's rewrite wins if it still fits the platform
+        passed = OutputValidator.validate(v2, platform, config).passed
+        return _early_result(profile, "v2" if passed else "v1", v1_resp, v2_resp)
+
+    # The critic kept v1: improving and judging two copies of it is waste
+    if DRAFT_DEDUPER.identical(v1, v2):
+        DRAFT_DEDUPER.stats["critic_unchanged"] += 1
+        return _early_result(
+            profile,
+            "v1",
+            v1_resp,
+            v2_resp,
+            short_circuit="critic_unchanged",
+            duplicates={"v2": "v1"},
+        )
+
+    # A small critic edit is still a correction: ship the reviewed v2, as
+    # the balanced profile does, if it fits the platform
+    if DRAFT_DEDUPER.same(v1, v2):
+        if OutputValidator.validate(v2, platform, config).passed:
+            DRAFT_DEDUPER.stats["critic_minor_edit"] += 1
+            return _early_result(
+                profile, "v2", v1_resp, v2_resp, short_circuit="critic_minor_edit"
+            )
 
     # Step 3: Improve → v3
-    v3_resp = await improve(v1, v2, platform, config)
+    v3_resp = await improve(
+        v1,
+        v2,
+        platform,
+        config,
+        stage_deadline(deadline, "improver", stages[2:]),
+        use_cache=use_cache,
+    )
     v3 = v3_resp.content
+    trace.stage("improver", "v3", v3_resp, config)
+
+    if on_stage:
+        await on_stage("v3", _stage_payload(v3_resp))
+
+    # Each distinct draft is judged once (v1 and v2 are not identical)
+    candidates, duplicates = DRAFT_DEDUPER.unique([("v1", v1), ("v2", v2), ("v3", v3)])
 
     # Step 4: Shuffle for blind judging
-    texts_for_judge, reveal_map = shuffle_versions(v1, v2, v3)
+    texts_for_judge, reveal_map = shuffle_drafts(candidates)
 
     # Step 5: Judge (blind)
-    judge_result = await judge(texts_for_judge, platform, config)
+    judge_result = await judge(
+        texts_for_judge,
+        platform,
+        config,
+        stage_deadline(deadline, "judge", stages[3:]),
+        use_cache=use_cache,
+    )
+    # An unparseable answer must not be replayed to the retry either
+    if not judge_result.ranking and judge_result.cache_key:
+        await PROVIDER_CACHE.delete(judge_result.cache_key)
 
-    return PipelineResult(
+    result = PipelineResult(
         v1=v1,
         v1_model=v1_resp.model_name,
         v2=v2,
@@ -126,4 +406,44 @@ async def run_pipeline(
         v3_model=v3_resp.model_name,
         shuffle_map=reveal_map,
         judge_result=judge_result,
+        duplicates=duplicates,
+    )
+
+    judge_payload = _judge_payload(result)
+    trace.judge(judge_result, config, judge_payload["scores"])
+
+    if on_stage:
+        await on_stage("judge", judge_payload)
+
+    return result
+
+
+def _early_result(
+    profile: str,
+    winner: str,
+    v1_resp: ProviderResponse,
+    v2_resp: Optional[ProviderResponse] = None,
+    short_circuit: Optional[str] = None,
+    duplicates: Optional[Dict[str, str]] = None,
+) -> PipelineResult:
+    """
+    PipelineResult for a run that ended without the judge.
+
+    `winner` ("v1" or "v2") takes the place of the judge's first pick;
+    stages that did not run are listed in skipped_stages.
+    """
+    ran = ["generator", "critic"] if v2_resp else ["generator"]
+    return PipelineResult(
+        v1=v1_resp.content,
+        v1_model=v1_resp.model_name,
+        v2=v2_resp.content if v2_resp else "",
+        v2_model=v2_resp.model_name if v2_resp else "",
+        v3="",
+        v3_model="",
+        shuffle_map={"A": winner},
+        judge_result=JudgeResult(ranking=["A"], scores={}, model_name=""),
+        profile=profile,
+        short_circuit=short_circuit,
+        skipped_stages=[stage for stage in PIPELINE_STAGES if stage not in ran],
+        duplicates=duplicates or {},
     )
@@ -5,24 +5,21 @@ Single responsibility: Critique the initial draft and create an improved version
 Does NOT load config - receives it from orchestrate.py.
 """
 
-from typing import Dict, Any
-from app.core.policy import build_prompt_instructions
-from app.providers.ai_provider import create_provider, resolve_model
+from typing import Dict, Any, Optional
+from app.core.compiled_policy import policy_instructions
+from app.services.model_router import ModelRouter
+from app.utils.result_cache import stage_uses_cache
 from app.utils.resilience import generate_with_resilience
 from app.models.provider import ProviderResponse
 
 
-def _get_pipeline_model(config: Dict[str, Any], stage: str) -> str:
-    """Get user's model choice for a pipeline stage, with fallback to default."""
-    models = config.get("models", {})
-    pipeline = models.get("pipeline", {})
-    stage_model = pipeline.get(stage)
-    if stage_model:
-        return stage_model
-    return models.get("default", "gemini")
-
-
-async def critique(v1: str, platform: str, config: Dict[str, Any]) -> ProviderResponse:
+async def critique(
+    v1: str,
+    platform: str,
+    config: Dict[str, Any],
+    deadline: Optional[float] = None,
+    use_cache: bool = True,
+) -> ProviderResponse:
     """
     Critique v1 and create improved v2.
 
@@ -30,11 +27,14 @@ async def critique(v1: str, platform: str, config: Dict[str, Any]) -> ProviderRe
         v1: The initial draft from generator
         platform: Target platform (linkedin, x, etc.)
         config: Configuration dict (loaded by orchestrate.py)
+        deadline: Optional time.monotonic() deadline for this stage
+        use_cache: False forces a fresh sample even if the critic stage
+            may reuse cached provider calls
 
     Returns:
         ProviderResponse: The improved draft (v2) and metrics
     """
-    style_instructions = build_prompt_instructions(config)
+    style_instructions = policy_instructions(config)
 
     prompt = f"""You are a Critical Reviewer for {platform}.
 
@@ -48,15 +48,12 @@ Evaluate the draft against these criteria. If there are weaknesses, rewrite to f
 
 Output ONLY the final post. No commentary."""
 
-    # Get user's model choice for critic stage
-    model_id = _get_pipeline_model(config, "critic")
-    provider_name, specific_model = resolve_model(model_id)
-
-    # Set up fallback provider
-    fallback_name = "openai" if provider_name == "gemini" else "gemini"
-
-    primary = create_provider(provider_name)
-    fallback = create_provider(fallback_name)
-    providers = (primary, fallback)
+    # Ordered fallback chain for the critic stage (preferred model first)
+    chain = ModelRouter.route(config, "critic")
 
-    return await generate_with_resilience(providers, prompt, specific_model)
+    return await generate_with_resilience(
+        chain,
+        prompt,
+        deadline=deadline,
+        use_cache=use_cache and stage_uses_cache(config, "critic"),
+    )
@@ -5,26 +5,13 @@ Single responsibility: Generate one content draft using config weights.
 Does NOT load config - receives it from orchestrate.py.
 """
 
-from typing import Dict, Any
-from app.core.policy import build_prompt_instructions
-from app.providers.ai_provider import create_provider, resolve_model
+from typing import Dict, Any, Optional
+from app.core.compiled_policy import policy_instructions
+from app.services.model_router import ModelRouter
+from app.utils.result_cache import stage_uses_cache
 from app.models.provider import ProviderResponse
 
 
-def _get_pipeline_model(config: Dict[str, Any], stage: str) -> str:
-    """Get user's model choice for a pipeline stage, with fallback to default."""
-    models = config.get("models", {})
-    pipeline = models.get("pipeline", {})
-
-    # User's choice for this stage
-    stage_model = pipeline.get(stage)
-    if stage_model:
-        return stage_model
-
-    # Fallback to default model
-    return models.get("default", "gemini")
-
-
 def build_generation_prompt(
     user_input: str, platform: str, config: Dict[str, Any]
 ) -> str:
@@ -39,7 +26,7 @@ def build_generation_prompt(
     Returns:
         The complete prompt string ready for AI
     """
-    style_instructions = build_prompt_instructions(config)
+    style_instructions = policy_instructions(config)
 
     return f"""You are a content creator for {platform}.
 
@@ -56,7 +43,11 @@ Generate the post now:"""
 
 
 async def generate(
-    user_input: str, platform: str, config: Dict[str, Any]
+    user_input: str,
+    platform: str,
+    config: Dict[str, Any],
+    deadline: Optional[float] = None,
+    use_cache: bool = True,
 ) -> ProviderResponse:
     """
     Generate initial draft (v1) from idea and config.
@@ -65,24 +56,24 @@ async def generate(
         user_input: Content/topic/brief from user
         platform: Target platform (linkedin, x, etc.)
         config: Configuration dict (loaded by orchestrate.py)
+        deadline: Optional time.monotonic() deadline for this stage
+        use_cache: False forces a fresh sample even if the generator stage
+            may reuse cached provider calls
 
     Returns:
         ProviderResponse: The generated content and metrics
     """
     prompt = build_generation_prompt(user_input, platform, config)
 
-    # Get user's model choice for generator stage
-    model_id = _get_pipeline_model(config, "generator")
-    provider_name, specific_model = resolve_model(model_id)
-
-    # Set up fallback provider
-    fallback_name = "openai" if provider_name == "gemini" else "gemini"
-
-    primary = create_provider(provider_name)
-    fallback = create_provider(fallback_name)
-    providers = (primary, fallback)
+    # Ordered fallback chain for the generator stage (preferred model first)
+    chain = ModelRouter.route(config, "generator")
 
     # Execute with resilience
     from app.utils.resilience import generate_with_resilience
 
-    return await generate_with_resilience(providers, prompt, specific_model)
+    return await generate_with_resilience(
+        chain,
+        prompt,
+        deadline=deadline,
+        use_cache=use_cache and stage_uses_cache(config, "generator"),
+    )
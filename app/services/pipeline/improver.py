@@ -5,25 +5,21 @@ Single responsibility: Combine the best of v1 and v2 into a final improved versi
 Does NOT load config - receives it from orchestrate.py.
 """
 
-from typing import Dict, Any
-from app.core.policy import build_prompt_instructions
-from app.providers.ai_provider import create_provider, resolve_model
+from typing import Dict, Any, Optional
+from app.core.compiled_policy import policy_instructions
+from app.services.model_router import ModelRouter
+from app.utils.result_cache import stage_uses_cache
 from app.utils.resilience import generate_with_resilience
 from app.models.provider import ProviderResponse
 
 
-def _get_pipeline_model(config: Dict[str, Any], stage: str) -> str:
-    """Get user's model choice for a pipeline stage, with fallback to default."""
-    models = config.get("models", {})
-    pipeline = models.get("pipeline", {})
-    stage_model = pipeline.get(stage)
-    if stage_model:
-        return stage_model
-    return models.get("default", "gemini")
-
-
 async def improve(
-    v1: str, v2: str, platform: str, config: Dict[str, Any]
+    v1: str,
+    v2: str,
+    platform: str,
+    config: Dict[str, Any],
+    deadline: Optional[float] = None,
+    use_cache: bool = True,
 ) -> ProviderResponse:
     """
     Synthesize v1 and v2 into improved v3.
@@ -33,11 +29,14 @@ async def improve(
         v2: The revised draft from critic
         platform: Target platform (linkedin, x, etc.)
         config: Configuration dict (loaded by orchestrate.py)
+        deadline: Optional time.monotonic() deadline for this stage
+        use_cache: False forces a fresh sample even if the improver stage
+            may reuse cached provider calls
 
     Returns:
         ProviderResponse: The synthesized draft (v3) and metrics
     """
-    style_instructions = build_prompt_instructions(config)
+    style_instructions = policy_instructions(config)
 
     prompt = f"""You are a Content Synthesizer for {platform}.
 
@@ -59,15 +58,12 @@ If one version is clearly better, use it. Don't blend for the sake of blending.
 
 Output ONLY the final post. No commentary."""
 
-    # Get user's model choice for improver stage
-    model_id = _get_pipeline_model(config, "improver")
-    provider_name, specific_model = resolve_model(model_id)
-
-    # Set up fallback provider
-    fallback_name = "openai" if provider_name == "gemini" else "gemini"
-
-    primary = create_provider(provider_name)
-    fallback = create_provider(fallback_name)
-    providers = (primary, fallback)
+    # Ordered fallback chain for the improver stage (preferred model first)
+    chain = ModelRouter.route(config, "improver")
 
-    return await generate_with_resilience(providers, prompt, specific_model)
+    return await generate_with_resilience(
+        chain,
+        prompt,
+        deadline=deadline,
+        use_cache=use_cache and stage_uses_cache(config, "improver"),
+    )
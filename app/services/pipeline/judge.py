@@ -9,10 +9,11 @@ Does NOT load config - receives it from orchestrate.py.
 """
 
 import json
-from typing import Dict, Any, List
-from dataclasses import dataclass
-from app.providers.ai_provider import create_provider, resolve_model
-from app.core.policy import build_prompt_instructions
+from typing import Dict, Any, List, Optional, Sequence
+from dataclasses import dataclass, field
+from app.services.model_router import ModelRouter
+from app.utils.result_cache import stage_uses_cache
+from app.core.compiled_policy import policy_instructions
 from app.utils.resilience import generate_with_resilience
 
 
@@ -24,76 +25,74 @@ class JudgeResult:
     scores: Dict[str, int]  # {"A": 85, "B": 70, "C": 78}
     model_name: str  # Model used for judging
     raw_response: str = ""  # Original response if parsing fails
-
-
-def _get_pipeline_model(config: Dict[str, Any], stage: str) -> str:
-    """Get user's model choice for a pipeline stage, with fallback to default."""
-    models = config.get("models", {})
-    pipeline = models.get("pipeline", {})
-    stage_model = pipeline.get(stage)
-    if stage_model:
-        return stage_model
-    return models.get("default", "gemini")
+    provider_name: str = ""  # Provider that answered (may be a fallback)
+    metrics: Dict[str, Any] = field(default_factory=dict)  # ProviderMetrics fields
+    cache_key: Optional[str] = None  # PROVIDER_CACHE entry of the raw response
 
 
 async def judge(
-    texts: Dict[str, str], platform: str, config: Dict[str, Any]
+    texts: Dict[str, str],
+    platform: str,
+    config: Dict[str, Any],
+    deadline: Optional[float] = None,
+    use_cache: bool = True,
 ) -> JudgeResult:
     """
     Score anonymous texts against config criteria.
 
     Args:
         texts: Dictionary of anonymous texts {"A": "...", "B": "...", "C": "..."}
+            (fewer labels when duplicate drafts were dropped)
         platform: Target platform (linkedin, x, etc.)
         config: Configuration dict (loaded by orchestrate.py)
+        deadline: Optional time.monotonic() deadline for this stage
+        use_cache: False forces a fresh sample even if the judge stage
+            may reuse cached provider calls
 
     Returns:
         JudgeResult with ranking and scores
     """
     # Build evaluation criteria from config
-    criteria = build_prompt_instructions(config)
+    criteria = policy_instructions(config)
 
     # Build the judge prompt - request JSON output
+    labels = sorted(texts)
+    sections = "\n\n".join(f"TEXT {label}:\n{texts[label]}" for label in labels)
     prompt = f"""You are a Blind Judge for {platform} content.
 
-TEXT A:
-{texts.get("A", "")}
-
-TEXT B:
-{texts.get("B", "")}
-
-TEXT C:
-{texts.get("C", "")}
+{sections}
 
 CRITERIA:
 {criteria}
 
 Score each text (0-100) based on how well it matches the criteria.
 
-Output ONLY valid JSON with keys: A, B, C (scores 0-100), and "ranking" (array, best to worst)."""
+Output ONLY valid JSON with keys: {", ".join(labels)} (scores 0-100), and "ranking" (array, best to worst)."""
 
-    # Get user's model choice for judge stage
-    model_id = _get_pipeline_model(config, "judge")
-    provider_name, specific_model = resolve_model(model_id)
-
-    # Set up fallback provider
-    fallback_name = "openai" if provider_name == "gemini" else "gemini"
-
-    primary = create_provider(provider_name)
-    fallback = create_provider(fallback_name)
-    providers = (primary, fallback)
+    # Ordered fallback chain for the judge stage (preferred model first)
+    chain = ModelRouter.route(config, "judge")
 
     # Generate with resilience
-    response = await generate_with_resilience(providers, prompt, specific_model)
+    response = await generate_with_resilience(
+        chain,
+        prompt,
+        deadline=deadline,
+        use_cache=use_cache and stage_uses_cache(config, "judge"),
+    )
 
     # Parse the JSON response
-    result = parse_judge_response(response.content)
+    result = parse_judge_response(response.content, labels)
     # Add the actual model used
     result.model_name = response.model_name
+    result.provider_name = response.provider_name
+    result.metrics = response.metrics.model_dump()
+    result.cache_key = response.cache_key
     return result
 
 
-def parse_judge_response(response: str) -> JudgeResult:
+def parse_judge_response(
+    response: str, labels: Sequence[str] = ("A", "B", "C")
+) -> JudgeResult:
     """Parse the judge's JSON response into structured data."""
     try:
         # Try to extract JSON from response (in case there's extra text)
@@ -104,12 +103,8 @@ def parse_judge_response(response: str) -> JudgeResult:
             json_str = response[json_start:json_end]
             data = json.loads(json_str)
 
-            scores = {
-                "A": int(data.get("A", 0)),
-                "B": int(data.get("B", 0)),
-                "C": int(data.get("C", 0)),
-            }
-            ranking = data.get("ranking", [])
+            scores = {label: int(data.get(label, 0)) for label in labels}
+            ranking = [label for label in data.get("ranking", []) if label in scores]
 
             # If no ranking provided, derive from scores
             if not ranking:
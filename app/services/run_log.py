@@ -0,0 +1,183 @@
+"""
+Pipeline run log: every run_pipeline call, persisted stage by stage.
+
+run_pipeline opens a RunTrace, adds a row per stage as it finishes
+(draft, provider, model, tokens, latency, fallback and cache use; the
+judge's scores by version) and closes it with the outcome. Finished
+traces go through a write-behind MetricsBuffer: the pipeline only
+enqueues them, and they are written to the pipeline_runs /
+pipeline_stage_runs tables in batches, one transaction per batch. A
+failed write is logged and never fails the generation. stop() (app
+shutdown) flushes what is still buffered.
+
+Settings come from the `pipeline_runs` section of config.yaml.
+"""
+
+import json
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from app.core.database import AsyncSessionLocal
+from app.core.policy import load_config
+from app.models.provider import ProviderMetrics, ProviderResponse
+from app.providers.ai_provider import resolve_model
+from app.repositories import pipeline_repo
+from app.repositories.metrics_repo import MetricsBuffer
+from app.services.model_router import ModelRouter
+from app.services.pipeline.judge import JudgeResult
+
+
+class RunTrace:
+    """Collects one pipeline run's rows until it finishes."""
+
+    def __init__(self, log: "PipelineRunLog", idea: str, platform: str):
+        self.log = log
+        self.run: Dict[str, Any] = {
+            "platform": platform,
+            "idea_prompt": idea,
+            "started_at": datetime.now(timezone.utc),
+        }
+        self.stages: List[Dict[str, Any]] = []
+        self._started = time.monotonic()
+
+    def _add(
+        self,
+        stage: str,
+        provider: str,
+        model: str,
+        metrics: ProviderMetrics,
+        draft: Optional[str],
+        config: Dict[str, Any],
+        **extra: Any,
+    ):
+        preferred, _ = resolve_model(ModelRouter.get_stage_model(config, stage))
+        self.stages.append(
+            {
+                "stage": stage,
+                "provider": provider,
+                "model": model,
+                "fallback_used": provider != preferred,
+                "cached": metrics.cached,
+                "input_tokens": metrics.input_tokens,
+                "output_tokens": metrics.output_tokens,
+                "latency_ms": metrics.latency_ms,
+                "draft": draft,
+                **extra,
+            }
+        )
+
+    def stage(
+        self,
+        stage: str,
+        version: str,
+        response: ProviderResponse,
+        config: Dict[str, Any],
+        **extra: Any,
+    ):
+        """Record a finished drafting stage (generator, critic, improver)."""
+        self._add(
+            stage,
+            response.provider_name,
+            response.model_name,
+            response.metrics,
+            response.content,
+            config,
+            version=version,
+            **extra,
+        )
+
+    def judge(
+        self, result: JudgeResult, config: Dict[str, Any], scores: Dict[str, Any]
+    ):
+        """Record the judge stage, with its scores keyed by version."""
+        self._add(
+            "judge",
+            result.provider_name,
+            result.model_name,
+            ProviderMetrics(**result.metrics),
+            result.raw_response or None,
+            config,
+            scores=json.dumps(scores),
+        )
+
+    async def finish(
+        self,
+        status: str,
+        error: Optional[str] = None,
+        winner_version: Optional[str] = None,
+    ):
+        self.run.update(
+            status=status,
+            error=error,
+            winner_version=winner_version,
+            input_tokens=sum(s["input_tokens"] for s in self.stages),
+            output_tokens=sum(s["output_tokens"] for s in self.stages),
+            latency_ms=(time.monotonic() - self._started) * 1000,
+            finished_at=datetime.now(timezone.utc),
+        )
+        await self.log.write(self.run, self.stages)
+
+
+class PipelineRunLog:
+    """Buffers finished RunTraces and writes them to the database in batches."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        session_factory: Callable = AsyncSessionLocal,
+        buffer_size: int = 1000,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        enqueue_timeout: float = 0.1,
+    ):
+        self.enabled = enabled
+        self.session_factory = session_factory
+        self.buffer = MetricsBuffer(
+            self._write_batch,
+            max_size=buffer_size,
+            batch_size=batch_size,
+            flush_interval=flush_interval,
+            enqueue_timeout=enqueue_timeout,
+        )
+        self.stats = {"runs": 0, "errors": 0}
+
+    @classmethod
+    def from_config(cls) -> "PipelineRunLog":
+        settings = load_config().get("pipeline_runs") or {}
+        return cls(
+            enabled=bool(settings.get("enabled", True)),
+            buffer_size=int(settings.get("buffer_size", 1000)),
+            batch_size=int(settings.get("batch_size", 100)),
+            flush_interval=float(settings.get("flush_interval_s", 1.0)),
+            enqueue_timeout=float(settings.get("enqueue_timeout_s", 0.1)),
+        )
+
+    def trace(self, idea: str, platform: str) -> RunTrace:
+        return RunTrace(self, idea, platform)
+
+    async def write(self, run: Dict[str, Any], stages: List[Dict[str, Any]]):
+        """Queue a finished run for the next batch (no database access)."""
+        if not self.enabled:
+            return
+        await self.buffer.put((run, stages))
+
+    async def _write_batch(self, batch: List[Any]):
+        try:
+            async with self.session_factory() as db:
+                await pipeline_repo.create_runs(db, batch)
+        except Exception:
+            self.stats["errors"] += len(batch)
+            raise
+        self.stats["runs"] += len(batch)
+
+    async def stop(self):
+        """Flush buffered runs (call from the app lifespan on shutdown)."""
+        await self.buffer.stop()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"enabled": self.enabled, **self.stats, "buffer": self.buffer.to_dict()}
+
+
+# Global Pipeline Run Log (config.yaml `pipeline_runs` section)
+PIPELINE_RUN_LOG = PipelineRunLog.from_config()
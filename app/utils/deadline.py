@@ -0,0 +1,104 @@
+"""
+Request deadlines.
+
+A deadline is an absolute time.monotonic() value (or None for "no
+deadline"). It is set once per request and passed down unchanged, so
+every layer - pipeline stages, the fallback chain, retries and the
+provider call itself - works against the same clock instead of
+stacking its own timeouts.
+"""
+
+import time
+from typing import Dict, Optional, Sequence
+
+from app.core.exceptions import DeadlineExceededError
+from app.core.policy import load_config
+
+# Share of the remaining budget each pipeline stage may use.
+# Drafting stages produce full posts; the judge only returns scores.
+STAGE_WEIGHTS: Dict[str, float] = {
+    "generator": 3,
+    "critic": 2,
+    "improver": 2,
+    "judge": 1,
+}
+
+# Client-supplied timeout header (seconds)
+TIMEOUT_HEADER = "X-Request-Timeout"
+
+
+def _deadline_config() -> Dict[str, float]:
+    return load_config().get("deadlines") or {}
+
+
+def resolve_timeout(
+    requested: Optional[float] = None, header: Optional[str] = None
+) -> Optional[float]:
+    """
+    Pick the request timeout in seconds.
+
+    Priority: body field, then X-Request-Timeout header, then
+    config.yaml `deadlines.request_timeout_s`. The result is capped at
+    `deadlines.max_request_timeout_s` when configured.
+
+    Raises:
+        ValueError: If the header is not a positive number
+    """
+    settings = _deadline_config()
+    timeout = requested
+    if timeout is None and header:
+        timeout = float(header)
+        if timeout <= 0:
+            raise ValueError(f"{TIMEOUT_HEADER} must be positive")
+    if timeout is None:
+        timeout = settings.get("request_timeout_s")
+
+    limit = settings.get("max_request_timeout_s")
+    if timeout is not None and limit:
+        timeout = min(float(timeout), float(limit))
+    return timeout
+
+
+def deadline_after(seconds: Optional[float]) -> Optional[float]:
+    """Absolute deadline `seconds` from now (None stays None)."""
+    if seconds is None:
+        return None
+    return time.monotonic() + seconds
+
+
+def remaining(deadline: Optional[float]) -> Optional[float]:
+    """Seconds left before the deadline (never negative), or None."""
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+def check_deadline(deadline: Optional[float], what: str = "Request"):
+    """Raise DeadlineExceededError if the deadline has passed."""
+    if deadline is not None and time.monotonic() >= deadline:
+        raise DeadlineExceededError(f"{what} exceeded its deadline")
+
+
+def stage_deadline(
+    deadline: Optional[float], stage: str, stages_left: Sequence[str]
+) -> Optional[float]:
+    """
+    Deadline for one pipeline stage.
+
+    The time left on the request is split across the stages still to
+    run in proportion to STAGE_WEIGHTS, so a slow early stage eats into
+    the later ones only by its own share. Time a stage does not use is
+    handed on to the next.
+
+    Args:
+        deadline: Request deadline
+        stage: Stage about to run
+        stages_left: That stage plus every stage after it
+    """
+    if deadline is None:
+        return None
+    check_deadline(deadline, f"Pipeline stage '{stage}'")
+
+    total = sum(STAGE_WEIGHTS.get(s, 1) for s in stages_left)
+    share = STAGE_WEIGHTS.get(stage, 1) / total
+    return time.monotonic() + remaining(deadline) * share
@@ -0,0 +1,104 @@
+"""
+Near-duplicate detection for pipeline drafts.
+
+The critic may hand v1 back unchanged and the improver may settle on one
+of its inputs. Two drafts are identical when they match after trimming
+leading/trailing whitespace (compared by hash); case, line breaks and
+every other edit count. Only identical critic output lets the pipeline
+stop with v1. The similarity threshold (a difflib ratio) is looser and
+only decides which drafts are judged once: it never discards a draft
+that no other stage or the judge will see.
+
+Settings come from the `short_circuit` section of config.yaml.
+"""
+
+import hashlib
+from difflib import SequenceMatcher
+from typing import Any, Dict, List, Tuple
+
+from app.core.policy import load_config
+
+
+def normalize_text(text: str) -> str:
+    """Text with leading/trailing whitespace trimmed (case and newlines kept)."""
+    return (text or "").strip()
+
+
+def text_fingerprint(text: str) -> str:
+    """SHA-256 of the trimmed text."""
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+class DraftDeduper:
+    """Decides which drafts are the same post, and counts what it saved."""
+
+    def __init__(self, enabled: bool = True, similarity_threshold: float = 0.97):
+        self.enabled = enabled
+        self.similarity_threshold = similarity_threshold
+        self.stats = {"critic_unchanged": 0, "critic_minor_edit": 0, "duplicates": 0}
+
+    @classmethod
+    def from_config(cls) -> "DraftDeduper":
+        settings = load_config().get("short_circuit") or {}
+        return cls(
+            enabled=bool(settings.get("enabled", True)),
+            similarity_threshold=float(settings.get("similarity_threshold", 0.97)),
+        )
+
+    def identical(self, a: str, b: str) -> bool:
+        """Whether two drafts are the same text (up to surrounding whitespace)."""
+        return self.enabled and text_fingerprint(a) == text_fingerprint(b)
+
+    def same(self, a: str, b: str) -> bool:
+        """Whether two drafts are identical or near-identical."""
+        if not self.enabled:
+            return False
+        if self.identical(a, b):
+            return True
+        a, b = normalize_text(a), normalize_text(b)
+        matcher = SequenceMatcher(None, a, b)
+        # quick_ratio() is an upper bound of ratio() and much cheaper
+        return (
+            matcher.quick_ratio() >= self.similarity_threshold
+            and matcher.ratio() >= self.similarity_threshold
+        )
+
+    def unique(
+        self, drafts: List[Tuple[str, str]]
+    ) -> Tuple[List[Tuple[str, str]], Dict[str, str]]:
+        """
+        Drop drafts that repeat an earlier one.
+
+        Args:
+            drafts: (version, text) pairs, earliest first
+
+        Returns:
+            Tuple of (kept pairs, {dropped version: version it repeats})
+        """
+        kept: List[Tuple[str, str]] = []
+        by_fingerprint: Dict[str, str] = {}
+        duplicates: Dict[str, str] = {}
+        for version, text in drafts:
+            fingerprint = text_fingerprint(text) if self.enabled else version
+            # Exact (trimmed) repeats by hash, near ones by similarity
+            original = by_fingerprint.get(fingerprint) or next(
+                (v for v, t in kept if self.same(t, text)), None
+            )
+            if original is None:
+                kept.append((version, text))
+                by_fingerprint[fingerprint] = version
+            else:
+                duplicates[version] = original
+        self.stats["duplicates"] += len(duplicates)
+        return kept, duplicates
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "similarity_threshold": self.similarity_threshold,
+            **self.stats,
+        }
+
+
+# Global Draft Deduper (config.yaml `short_circuit` section)
+DRAFT_DEDUPER = DraftDeduper.from_config()
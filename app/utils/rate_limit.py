@@ -0,0 +1,245 @@
+"""
+Client-side rate limiting for AI provider calls.
+
+Each (provider, model) gets two token buckets: requests-per-minute and
+tokens-per-minute. Calls wait for capacity instead of being fired and
+rejected with a 429. Token usage is estimated from the prompt up front
+and reconciled with the real counts once the response arrives.
+
+Each provider can also cap how many calls are in flight at once
+(`max_concurrency`), so a burst of bulk work cannot hog its quota.
+
+Budgets come from the `rate_limits` section of config.yaml. Providers or
+models without a configured budget are not limited.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from app.core.policy import load_config
+
+logger = logging.getLogger(__name__)
+
+# Rough chars-per-token ratio used to estimate prompt tokens
+CHARS_PER_TOKEN = 4
+
+# Default output budget reserved per call until the real count is known
+DEFAULT_OUTPUT_TOKENS = 1024
+
+
+class TokenBucket:
+    """
+    Classic token bucket refilled continuously up to `capacity`.
+
+    The level may go negative when a reconciliation reveals more usage
+    than was reserved; later callers then wait for the debt to refill.
+    """
+
+    def __init__(self, capacity: float, per_minute: float):
+        self.capacity = capacity
+        self.rate = per_minute / 60.0  # tokens per second
+        self.level = capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(
+            self.capacity, self.level + (now - self.updated_at) * self.rate
+        )
+        self.updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` can be taken (0 if available now)."""
+        self._refill()
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def take(self, amount: float):
+        self._refill()
+        self.level -= amount
+
+    def give_back(self, amount: float):
+        self._refill()
+        self.level = min(self.capacity, self.level + amount)
+
+
+@dataclass
+class Reservation:
+    """Capacity held by one in-flight call, settled by reconcile()."""
+
+    key: Tuple[str, str]
+    estimated_tokens: int
+    waited_s: float = 0.0
+
+
+class ModelLimiter:
+    """RPM + TPM buckets for one (provider, model)."""
+
+    def __init__(self, rpm: Optional[int], tpm: Optional[int]):
+        self.requests = TokenBucket(rpm, rpm) if rpm else None
+        self.tokens = TokenBucket(tpm, tpm) if tpm else None
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, estimated_tokens: int) -> Tuple[float, int]:
+        """
+        Wait until both buckets have capacity, then take it.
+
+        Returns:
+            Tuple of (seconds waited, tokens actually reserved)
+        """
+        if self.tokens:
+            # A single call larger than the whole budget would never fit
+            estimated_tokens = min(estimated_tokens, int(self.tokens.capacity))
+
+        waited = 0.0
+        # The lock keeps waiters FIFO so large calls are not starved
+        async with self._lock:
+            while True:
+                wait = max(
+                    self.requests.wait_time(1) if self.requests else 0.0,
+                    self.tokens.wait_time(estimated_tokens) if self.tokens else 0.0,
+                )
+                if wait <= 0:
+                    break
+                waited += wait
+                await asyncio.sleep(wait)
+
+            if self.requests:
+                self.requests.take(1)
+            if self.tokens:
+                self.tokens.take(estimated_tokens)
+        return waited, estimated_tokens
+
+    def reconcile(self, estimated_tokens: int, actual_tokens: int):
+        """Correct the TPM bucket once the real usage is known."""
+        if not self.tokens:
+            return
+        delta = estimated_tokens - actual_tokens
+        if delta > 0:
+            self.tokens.give_back(delta)
+        elif delta < 0:
+            self.tokens.take(-delta)
+
+
+class RateLimiter:
+    """Registry of per-(provider, model) limiters built from config."""
+
+    def __init__(self, limits: Optional[Dict[str, Any]] = None):
+        self._limits = limits
+        self._limiters: Dict[Tuple[str, str], Optional[ModelLimiter]] = {}
+        self._slots: Dict[str, Optional[asyncio.Semaphore]] = {}
+        self.in_flight: Dict[str, int] = {}
+        self.stats: Dict[str, Dict[str, float]] = {}
+
+    def _get_limits(self) -> Dict[str, Any]:
+        if self._limits is None:
+            self._limits = load_config().get("rate_limits") or {}
+        return self._limits
+
+    def _budget(self, provider: str, model: str) -> Tuple[Optional[int], Optional[int]]:
+        """Model budget, falling back to the provider-wide one."""
+        provider_cfg = self._get_limits().get(provider) or {}
+        model_cfg = (provider_cfg.get("models") or {}).get(model) or {}
+        rpm = model_cfg.get("rpm", provider_cfg.get("rpm"))
+        tpm = model_cfg.get("tpm", provider_cfg.get("tpm"))
+        return rpm, tpm
+
+    def _get_limiter(self, provider: str, model: str) -> Optional[ModelLimiter]:
+        key = (provider, model)
+        if key not in self._limiters:
+            rpm, tpm = self._budget(provider, model)
+            self._limiters[key] = ModelLimiter(rpm, tpm) if (rpm or tpm) else None
+        return self._limiters[key]
+
+    def estimate_tokens(self, provider: str, prompt: str) -> int:
+        """Estimate total tokens (prompt + reserved output) for a call."""
+        provider_cfg = self._get_limits().get(provider) or {}
+        output_tokens = provider_cfg.get(
+            "estimated_output_tokens", DEFAULT_OUTPUT_TOKENS
+        )
+        return math.ceil(len(prompt) / CHARS_PER_TOKEN) + output_tokens
+
+    async def acquire(self, provider: str, model: str, prompt: str) -> Reservation:
+        """
+        Wait for capacity for one call.
+
+        Args:
+            provider: Provider name (e.g., 'openai')
+            model: Model ID the call will use
+            prompt: Prompt text (used to estimate tokens)
+
+        Returns:
+            Reservation to pass to reconcile() when the call completes
+        """
+        estimated = self.estimate_tokens(provider, prompt)
+        reservation = Reservation(key=(provider, model), estimated_tokens=estimated)
+
+        limiter = self._get_limiter(provider, model)
+        if limiter is None:
+            return reservation
+
+        reservation.waited_s, reservation.estimated_tokens = await limiter.acquire(
+            estimated
+        )
+        if reservation.waited_s > 0:
+            logger.info(
+                f"Rate limiter: waited {reservation.waited_s:.2f}s for {provider}/{model}"
+            )
+
+        stats = self.stats.setdefault(
+            f"{provider}/{model}", {"calls": 0, "delayed": 0, "wait_s": 0.0}
+        )
+        stats["calls"] += 1
+        if reservation.waited_s > 0:
+            stats["delayed"] += 1
+            stats["wait_s"] += reservation.waited_s
+        return reservation
+
+    @asynccontextmanager
+    async def slot(self, provider: str) -> AsyncIterator[None]:
+        """
+        Hold one of the provider's concurrent-call slots for the block.
+
+        Waits while `max_concurrency` calls are already in flight;
+        providers without a cap are not limited.
+        """
+        if provider not in self._slots:
+            cap = (self._get_limits().get(provider) or {}).get("max_concurrency")
+            self._slots[provider] = asyncio.Semaphore(cap) if cap else None
+        semaphore = self._slots[provider]
+
+        if semaphore is None:
+            yield
+            return
+        async with semaphore:
+            self.in_flight[provider] = self.in_flight.get(provider, 0) + 1
+            try:
+                yield
+            finally:
+                self.in_flight[provider] -= 1
+
+    def reconcile(self, reservation: Reservation, actual_tokens: int):
+        """
+        Settle a reservation with the real token usage.
+
+        Args:
+            reservation: Value returned by acquire()
+            actual_tokens: input_tokens + output_tokens reported by the provider
+        """
+        if actual_tokens <= 0:
+            # Provider did not report usage; keep the estimate
+            return
+        limiter = self._limiters.get(reservation.key)
+        if limiter is not None:
+            limiter.reconcile(reservation.estimated_tokens, actual_tokens)
+
+
+# Global Rate Limiter Instance
+# Shared by every AIProvider call in the process
+RATE_LIMITER = RateLimiter()
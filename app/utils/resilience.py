@@ -1,10 +1,261 @@
 """
-Resilience utilities: Retry logic and Circuit Breaker pattern.
+Resilience utilities: Retry logic, Circuit Breaker and hedged requests.
 """
 
+import asyncio
+import logging
+import random
 import time
-from typing import Any, Dict, Tuple
-from app.core.exceptions import AIProviderError
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+from app.core.exceptions import AIProviderError, DeadlineExceededError
+from app.core.policy import load_config
+from app.providers.registry import PROVIDER_REGISTRY
+from app.utils.deadline import check_deadline, remaining
+
+logger = logging.getLogger(__name__)
+
+
+# Optional Third-Party Imports (SDK exception types for classification)
+try:
+    import openai
+except ImportError:
+    openai = None
+
+try:
+    import anthropic
+except ImportError:
+    anthropic = None
+
+try:
+    from google.api_core import exceptions as google_exceptions
+except ImportError:
+    google_exceptions = None
+
+
+# Error codes for classification
+class ErrorCode:
+    """Standard error codes for content generation failures."""
+
+    RATE_LIMIT = "RATE_LIMIT"
+    TIMEOUT = "TIMEOUT"
+    NETWORK_ERROR = "NETWORK_ERROR"
+    INVALID_API_KEY = "INVALID_API_KEY"
+    VALIDATION_FAILED = "VALIDATION_FAILED"
+    PROVIDER_ERROR = "PROVIDER_ERROR"
+    ALL_MODELS_FAILED = "ALL_MODELS_FAILED"
+    UNKNOWN = "UNKNOWN"
+
+
+def _sdk_types(*names: str) -> Tuple[type, ...]:
+    """Collect exception classes with the given names from installed SDKs."""
+    found = []
+    for module in (openai, anthropic, google_exceptions):
+        for name in names:
+            exc_type = getattr(module, name, None) if module else None
+            if isinstance(exc_type, type):
+                found.append(exc_type)
+    return tuple(found)
+
+
+# Checked in order: timeouts subclass connection errors in the OpenAI SDK
+_ERROR_TYPES = [
+    (ErrorCode.RATE_LIMIT, _sdk_types("RateLimitError", "ResourceExhausted")),
+    (
+        ErrorCode.TIMEOUT,
+        _sdk_types("APITimeoutError", "DeadlineExceeded")
+        + (TimeoutError, DeadlineExceededError),
+    ),
+    (
+        ErrorCode.NETWORK_ERROR,
+        _sdk_types("APIConnectionError", "ServiceUnavailable", "BadGateway")
+        + (ConnectionError,),
+    ),
+    (
+        ErrorCode.INVALID_API_KEY,
+        _sdk_types("AuthenticationError", "PermissionDeniedError")
+        + _sdk_types("Unauthenticated", "PermissionDenied"),
+    ),
+    (ErrorCode.PROVIDER_ERROR, _sdk_types("InternalServerError")),
+]
+
+_STATUS_CODES = {
+    429: ErrorCode.RATE_LIMIT,
+    408: ErrorCode.TIMEOUT,
+    504: ErrorCode.TIMEOUT,
+    502: ErrorCode.NETWORK_ERROR,
+    503: ErrorCode.NETWORK_ERROR,
+    401: ErrorCode.INVALID_API_KEY,
+    403: ErrorCode.INVALID_API_KEY,
+}
+
+
+def _classify_by_message(error: Exception) -> str:
+    """Legacy string matching for errors without a known type."""
+    error_str = str(error).lower()
+
+    if any(kw in error_str for kw in ["rate limit", "429", "quota"]):
+        return ErrorCode.RATE_LIMIT
+    if any(kw in error_str for kw in ["timeout", "timed out"]):
+        return ErrorCode.TIMEOUT
+    if any(kw in error_str for kw in ["network", "connection", "503", "502"]):
+        return ErrorCode.NETWORK_ERROR
+    if any(kw in error_str for kw in ["api key", "401", "403", "unauthorized"]):
+        return ErrorCode.INVALID_API_KEY
+    if any(kw in error_str for kw in ["500", "internal server error"]):
+        return ErrorCode.PROVIDER_ERROR
+
+    return ErrorCode.UNKNOWN
+
+
+def classify_error(error: Exception) -> str:
+    """
+    Classify an error into a standard error code.
+
+    Uses the SDK exception type (or HTTP status) where possible and falls
+    back to message matching. Wrapped errors (AIProviderError raised
+    `from` a provider error) are classified by their cause.
+    """
+    while isinstance(error, AIProviderError) and error.__cause__ is not None:
+        error = error.__cause__
+
+    for code, types in _ERROR_TYPES:
+        if types and isinstance(error, types):
+            return code
+
+    status = getattr(error, "status_code", None) or getattr(error, "code", None)
+    if isinstance(status, int):
+        if status in _STATUS_CODES:
+            return _STATUS_CODES[status]
+        if status >= 500:
+            return ErrorCode.PROVIDER_ERROR
+
+    return _classify_by_message(error)
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """Seconds the provider asked us to wait (Retry-After header), if any."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    try:
+        retry_after_ms = headers.get("retry-after-ms")
+        if retry_after_ms is not None:
+            return float(retry_after_ms) / 1000
+        value = headers.get("retry-after")
+        if value is None:
+            return None
+        return float(value)
+    except (TypeError, ValueError):
+        # HTTP-date form is not worth parsing for our wait times
+        return None
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter, bounded by a per-call budget.
+
+    Only transient errors are retried. A provider's Retry-After overrides
+    the computed backoff, but no wait may run past the call's deadline.
+    """
+
+    RETRYABLE = {
+        ErrorCode.RATE_LIMIT,
+        ErrorCode.TIMEOUT,
+        ErrorCode.NETWORK_ERROR,
+        ErrorCode.PROVIDER_ERROR,
+    }
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 20.0,
+        budget: float = 180.0,
+    ):
+        """
+        Args:
+            max_attempts: Attempts per provider, including the first
+            base_delay: Backoff for the first retry (seconds)
+            max_delay: Cap for a single backoff (seconds)
+            budget: Default total time allowed per call (seconds)
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+
+    @classmethod
+    def from_config(cls) -> "RetryPolicy":
+        """Build the policy from config.yaml (`retry` section)."""
+        settings = load_config().get("retry") or {}
+        return cls(
+            max_attempts=settings.get("max_attempts", 3),
+            base_delay=settings.get("base_delay_s", 1.0),
+            max_delay=settings.get("max_delay_s", 20.0),
+            budget=settings.get("budget_s", 180.0),
+        )
+
+    def backoff(self, attempt: int) -> float:
+        """Jittered backoff before retry number `attempt` (1-based)."""
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+    def next_delay(
+        self, error: Exception, attempt: int, deadline: Optional[float] = None
+    ) -> Optional[float]:
+        """
+        Decide whether to retry after a failed attempt.
+
+        Args:
+            error: Exception raised by the attempt
+            attempt: Number of attempts made so far
+            deadline: time.monotonic() after which no retry may start
+
+        Returns:
+            Seconds to wait before retrying, or None to give up
+        """
+        if attempt >= self.max_attempts:
+            return None
+        if classify_error(error) not in self.RETRYABLE:
+            return None
+
+        delay = retry_after(error)
+        if delay is None:
+            delay = self.backoff(attempt)
+
+        if deadline is not None and time.monotonic() + delay >= deadline:
+            # Waiting would blow the request budget
+            return None
+        return delay
+
+    async def call(self, fn, deadline: Optional[float] = None):
+        """
+        Run `fn()` (an async callable) with retries.
+
+        Args:
+            fn: Zero-argument coroutine function to attempt
+            deadline: time.monotonic() bound for retries (default: now + budget)
+        """
+        if deadline is None:
+            deadline = time.monotonic() + self.budget
+
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return await fn()
+            except Exception as e:
+                delay = self.next_delay(e, attempt, deadline)
+                if delay is None:
+                    raise
+                logger.warning(
+                    f"Attempt {attempt} failed ({classify_error(e)}), "
+                    f"retrying in {delay:.1f}s: {e}"
+                )
+                await asyncio.sleep(delay)
 
 
 class RetryHandler:
@@ -21,201 +272,649 @@ class RetryHandler:
         Returns:
             Tuple of (should_retry: bool, wait_seconds: int)
         """
-        error_str = str(error).lower()
+        delay = RetryPolicy().next_delay(error, attempt=1)
+        if delay is None:
+            return False, 0
+        return True, int(round(delay))
 
-        # Rate limit errors - retry after waiting
-        if "rate limit" in error_str or "429" in error_str or "quota" in error_str:
-            return True, 60  # Wait 60 seconds
 
-        # Timeout errors - retry with shorter wait
-        if "timeout" in error_str or "timed out" in error_str:
-            return True, 5  # Wait 5 seconds
+class CircuitState:
+    """Circuit breaker states."""
 
-        # Network errors - retry quickly
-        if any(
-            keyword in error_str
-            for keyword in ["network", "connection", "unreachable", "503", "502"]
-        ):
-            return True, 3  # Wait 3 seconds
+    CLOSED = "closed"  # Normal traffic
+    OPEN = "open"  # Rejecting calls until the open period ends
+    HALF_OPEN = "half_open"  # Admitting a few probe calls
 
-        # Authentication errors - don't retry (won't fix itself)
-        if any(
-            keyword in error_str
-            for keyword in ["api key", "authentication", "unauthorized", "401", "403"]
-        ):
-            return False, 0  # Don't retry
 
-        # Server errors - retry with moderate wait
-        if "500" in error_str or "internal server error" in error_str:
-            return True, 10  # Wait 10 seconds
+def breaker_key(provider_name: str, model: Optional[str] = None) -> str:
+    """Circuit key: 'provider/model' (or just 'provider' without a model)."""
+    return f"{provider_name}/{model}" if model else provider_name
+
 
-        # Default: retry with short wait for unknown errors
-        return True, 2  # Wait 2 seconds
+class _Circuit:
+    """State of one provider+model circuit."""
+
+    def __init__(self):
+        self.state = CircuitState.CLOSED
+        # (timestamp, success, latency_ms) for calls inside the window
+        self.calls: Deque[Tuple[float, bool, Optional[float]]] = deque()
+        self.opened_at: Optional[float] = None
+        self.probes_in_flight = 0
+        self.probe_successes = 0
 
 
 class CircuitBreaker:
     """
     Circuit breaker to prevent repeated calls to failing AI models.
 
-    When a model fails multiple times (default: 3), the circuit "opens"
-    and the model is temporarily disabled. After a timeout period (default: 5 minutes),
-    the circuit automatically closes and the model is tried again.
+    Circuits are keyed by provider+model and driven by the error rate and
+    slow-call rate over a sliding time window. When either crosses its
+    threshold (with enough calls to be meaningful) the circuit opens.
+    After the open period it goes half-open and admits a limited number of
+    probe calls: enough probe successes close it, any probe failure
+    re-opens it.
+
+    All state changes are synchronous (no awaits), so concurrent asyncio
+    tasks cannot interleave inside a check-and-reserve.
     """
 
-    def __init__(self, failure_threshold: int = 3, timeout: int = 300):
+    def __init__(
+        self,
+        window: float = 60.0,
+        min_calls: int = 5,
+        error_rate_threshold: float = 0.5,
+        slow_call_ms: float = 60000.0,
+        slow_call_rate_threshold: float = 0.8,
+        timeout: float = 60.0,
+        half_open_max_calls: int = 2,
+        half_open_successes: int = 2,
+    ):
         """
         Initialize circuit breaker.
 
         Args:
-            failure_threshold: Number of failures before opening circuit (default: 3)
-            timeout: Seconds before auto-recovery (default: 300 = 5 minutes)
+            window: Sliding window length in seconds
+            min_calls: Calls needed in the window before rates are judged
+            error_rate_threshold: Failure ratio that opens the circuit
+            slow_call_ms: Latency above which a successful call counts as slow
+            slow_call_rate_threshold: Slow-call ratio that opens the circuit
+            timeout: Seconds a circuit stays open before probing
+            half_open_max_calls: Concurrent probe calls allowed when half-open
+            half_open_successes: Probe successes needed to close again
         """
-        self.failure_threshold = failure_threshold
+        self.window = window
+        self.min_calls = min_calls
+        self.error_rate_threshold = error_rate_threshold
+        self.slow_call_ms = slow_call_ms
+        self.slow_call_rate_threshold = slow_call_rate_threshold
         self.timeout = timeout
-        self.failures: Dict[str, int] = {}  # model_name -> failure_count
-        self.opened_at: Dict[str, float] = {}  # model_name -> timestamp when opened
-
-    def is_available(self, model_name: str) -> bool:
-        """
-        Check if a model is available (circuit closed).
+        self.half_open_max_calls = half_open_max_calls
+        self.half_open_successes = half_open_successes
+        self.circuits: Dict[str, _Circuit] = {}
+
+    @classmethod
+    def from_config(cls) -> "CircuitBreaker":
+        """Build the breaker from config.yaml (`circuit_breaker` section)."""
+        settings = load_config().get("circuit_breaker") or {}
+        return cls(
+            window=settings.get("window_s", 60.0),
+            min_calls=settings.get("min_calls", 5),
+            error_rate_threshold=settings.get("error_rate_threshold", 0.5),
+            slow_call_ms=settings.get("slow_call_ms", 60000.0),
+            slow_call_rate_threshold=settings.get("slow_call_rate_threshold", 0.8),
+            timeout=settings.get("open_s", 60.0),
+            half_open_max_calls=settings.get("half_open_max_calls", 2),
+            half_open_successes=settings.get("half_open_successes", 2),
+        )
+
+    def _circuit(self, key: str) -> _Circuit:
+        circuit = self.circuits.get(key)
+        if circuit is None:
+            circuit = self.circuits[key] = _Circuit()
+        return circuit
+
+    def _prune(self, circuit: _Circuit, now: float):
+        while circuit.calls and circuit.calls[0][0] < now - self.window:
+            circuit.calls.popleft()
+
+    def _refresh(self, circuit: _Circuit, now: float):
+        """Move OPEN -> HALF_OPEN once the open period has passed."""
+        if (
+            circuit.state == CircuitState.OPEN
+            and now - circuit.opened_at >= self.timeout
+        ):
+            circuit.state = CircuitState.HALF_OPEN
+            circuit.probes_in_flight = 0
+            circuit.probe_successes = 0
 
-        Args:
-            model_name: Name of the AI model
+    def _open(self, circuit: _Circuit, now: float):
+        circuit.state = CircuitState.OPEN
+        circuit.opened_at = now
+        circuit.probes_in_flight = 0
+        circuit.probe_successes = 0
 
-        Returns:
-            True if model is available, False if circuit is open
-        """
-        # Check if circuit is open
-        if model_name in self.opened_at:
-            # Check if timeout has expired (auto-recovery)
-            time_since_opened = time.time() - self.opened_at[model_name]
-            if time_since_opened > self.timeout:
-                # Auto-recover: close the circuit
-                self.reset(model_name)
-                return True
-            # Circuit still open
-            return False
+    def _keys_for(self, provider_name: str) -> list[str]:
+        prefix = provider_name + "/"
+        return [k for k in self.circuits if k == provider_name or k.startswith(prefix)]
 
-        # Circuit is closed
-        return True
-
-    def record_failure(self, model_name: str):
+    def is_available(self, provider_name: str, model: Optional[str] = None) -> bool:
         """
-        Record a failure for a model. Opens circuit if threshold reached.
+        Check if calls may be attempted (circuit closed, or half-open with
+        a free probe slot). Does not reserve anything; see allow_request().
 
-        Args:
-            model_name: Name of the AI model that failed
+        Without a model, a provider is available unless every tracked
+        model circuit of that provider is unavailable.
         """
-        # Increment failure count
-        self.failures[model_name] = self.failures.get(model_name, 0) + 1
+        now = time.monotonic()
+        if model is None and "/" not in provider_name:
+            keys = self._keys_for(provider_name)
+            if not keys:
+                return True
+            return any(self._available(self.circuits[k], now) for k in keys)
 
-        # Check if threshold reached
-        if self.failures[model_name] >= self.failure_threshold:
-            # Open the circuit
-            self.opened_at[model_name] = time.time()
+        circuit = self.circuits.get(breaker_key(provider_name, model))
+        return circuit is None or self._available(circuit, now)
 
-    def record_success(self, model_name: str):
-        """
-        Record a successful call. Resets failure count.
+    def _available(self, circuit: _Circuit, now: float) -> bool:
+        self._refresh(circuit, now)
+        if circuit.state == CircuitState.CLOSED:
+            return True
+        if circuit.state == CircuitState.HALF_OPEN:
+            return circuit.probes_in_flight < self.half_open_max_calls
+        return False
 
-        Args:
-            model_name: Name of the AI model that succeeded
+    def allow_request(self, provider_name: str, model: Optional[str] = None) -> bool:
         """
-        # Reset failure count
-        self.failures[model_name] = 0
+        Admit one call, reserving a probe slot when half-open.
+        Every admitted call must end in record_success/record_failure/release.
+        """
+        circuit = self._circuit(breaker_key(provider_name, model))
+        now = time.monotonic()
+        if not self._available(circuit, now):
+            return False
+        if circuit.state == CircuitState.HALF_OPEN:
+            circuit.probes_in_flight += 1
+        return True
 
-        # Close circuit if it was open
-        if model_name in self.opened_at:
-            del self.opened_at[model_name]
+    def release(self, provider_name: str, model: Optional[str] = None):
+        """Give back an admitted call that ended without an outcome (cancelled)."""
+        circuit = self.circuits.get(breaker_key(provider_name, model))
+        if circuit and circuit.state == CircuitState.HALF_OPEN:
+            circuit.probes_in_flight = max(0, circuit.probes_in_flight - 1)
+
+    def record_failure(
+        self,
+        provider_name: str,
+        model: Optional[str] = None,
+        latency_ms: Optional[float] = None,
+    ):
+        """
+        Record a failed call. Opens the circuit if the window's error rate
+        crosses the threshold, or immediately if it was a half-open probe.
+        """
+        circuit = self._circuit(breaker_key(provider_name, model))
+        now = time.monotonic()
+        self._refresh(circuit, now)
+
+        if circuit.state == CircuitState.HALF_OPEN:
+            # Still broken: back to open for another full period
+            self._open(circuit, now)
+            return
+
+        circuit.calls.append((now, False, latency_ms))
+        self._evaluate(circuit, now)
+
+    def record_success(
+        self,
+        provider_name: str,
+        model: Optional[str] = None,
+        latency_ms: Optional[float] = None,
+    ):
+        """
+        Record a successful call. Slow successes still count against the
+        slow-call rate; enough half-open probe successes close the circuit.
+        """
+        circuit = self._circuit(breaker_key(provider_name, model))
+        now = time.monotonic()
+        self._refresh(circuit, now)
+
+        if circuit.state == CircuitState.HALF_OPEN:
+            circuit.probes_in_flight = max(0, circuit.probes_in_flight - 1)
+            circuit.probe_successes += 1
+            if circuit.probe_successes >= self.half_open_successes:
+                # Recovered: close with a clean window
+                circuit.state = CircuitState.CLOSED
+                circuit.opened_at = None
+                circuit.calls.clear()
+            return
+
+        circuit.calls.append((now, True, latency_ms))
+        self._evaluate(circuit, now)
+
+    def _is_slow(self, latency_ms: Optional[float]) -> bool:
+        return latency_ms is not None and latency_ms > self.slow_call_ms
+
+    def _evaluate(self, circuit: _Circuit, now: float):
+        """Open a closed circuit whose window crosses a threshold."""
+        self._prune(circuit, now)
+        if circuit.state != CircuitState.CLOSED:
+            return
+        total = len(circuit.calls)
+        if total < self.min_calls:
+            return
+
+        failures = sum(1 for _, ok, _ in circuit.calls if not ok)
+        slow = sum(
+            1 for _, ok, latency in circuit.calls if ok and self._is_slow(latency)
+        )
+        if (
+            failures / total >= self.error_rate_threshold
+            or slow / total >= self.slow_call_rate_threshold
+        ):
+            self._open(circuit, now)
 
     def reset(self, model_name: str):
         """
-        Manually reset circuit breaker for a model.
+        Manually reset circuit breaker.
 
         Args:
-            model_name: Name of the AI model to reset
+            model_name: A circuit key ('provider/model') or a provider name,
+                which resets every model circuit of that provider
         """
-        # Clear failure count
-        if model_name in self.failures:
-            self.failures[model_name] = 0
+        keys = [model_name] if "/" in model_name else self._keys_for(model_name)
+        for key in keys:
+            self.circuits.pop(key, None)
 
-        # Close circuit
-        if model_name in self.opened_at:
-            del self.opened_at[model_name]
+    def keys(self) -> list[str]:
+        """All tracked circuit keys."""
+        return list(self.circuits.keys())
 
     def get_status(self, model_name: str) -> Dict[str, Any]:
         """
-        Get current status of a model's circuit.
+        Get current status of a circuit, including sliding-window stats.
 
         Args:
-            model_name: Name of the AI model
+            model_name: Circuit key ('provider/model') or provider name
 
         Returns:
             Dictionary with status information
         """
-        is_open = model_name in self.opened_at
-        failure_count = self.failures.get(model_name, 0)
+        now = time.monotonic()
+        circuit = self.circuits.get(model_name) or _Circuit()
+        self._refresh(circuit, now)
+        self._prune(circuit, now)
+
+        total = len(circuit.calls)
+        failures = sum(1 for _, ok, _ in circuit.calls if not ok)
+        latencies = [lat for _, ok, lat in circuit.calls if ok and lat is not None]
 
         status = {
             "model": model_name,
-            "circuit_open": is_open,
-            "failure_count": failure_count,
+            "state": circuit.state,
+            "circuit_open": circuit.state == CircuitState.OPEN,
+            "failure_count": failures,
             "available": self.is_available(model_name),
+            "window": {
+                "seconds": self.window,
+                "calls": total,
+                "failures": failures,
+                "error_rate": failures / total if total else 0.0,
+                "slow_calls": sum(1 for lat in latencies if self._is_slow(lat)),
+                "avg_latency_ms": (
+                    sum(latencies) / len(latencies) if latencies else None
+                ),
+            },
         }
 
-        if is_open:
-            time_remaining = self.timeout - (time.time() - self.opened_at[model_name])
+        if circuit.state == CircuitState.OPEN:
+            time_remaining = self.timeout - (now - circuit.opened_at)
             status["time_until_recovery"] = max(0, int(time_remaining))
+        if circuit.state == CircuitState.HALF_OPEN:
+            status["probes_in_flight"] = circuit.probes_in_flight
+            status["probe_successes"] = circuit.probe_successes
 
         return status
 
 
 # Global Circuit Breaker Instance
 # Used across the application to track provider health
-CIRCUIT_BREAKER = CircuitBreaker()
+CIRCUIT_BREAKER = CircuitBreaker.from_config()
+
+
+class LatencyTracker:
+    """
+    Keeps a window of recent successful call latencies per provider.
+    Used to decide when a slow primary is worth hedging.
+    """
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self.samples: Dict[str, Deque[float]] = {}
+
+    def record(self, provider_name: str, latency_ms: float):
+        samples = self.samples.get(provider_name)
+        if samples is None:
+            samples = self.samples[provider_name] = deque(maxlen=self.window)
+        samples.append(latency_ms)
+
+    def percentile(self, provider_name: str, pct: float) -> Optional[float]:
+        """Latency (ms) at the given percentile, or None with no samples."""
+        samples = self.samples.get(provider_name)
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(len(ordered) * pct / 100))
+        return ordered[index]
+
+    def count(self, provider_name: str) -> int:
+        return len(self.samples.get(provider_name, ()))
+
+
+class HedgeStats:
+    """Counters for hedged requests (exposed via /metrics)."""
+
+    def __init__(self):
+        self.calls = 0  # Calls eligible for hedging
+        self.hedged = 0  # Calls where the fallback was launched
+        self.primary_wins = 0  # Hedged calls the primary still won
+        self.hedge_wins = 0  # Hedged calls the fallback won
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "hedged": self.hedged,
+            "hedge_rate": self.hedged / self.calls if self.calls else 0.0,
+            "primary_wins": self.primary_wins,
+            "hedge_wins": self.hedge_wins,
+        }
+
+
+class ProviderHealth:
+    """
+    Live per-provider health: EWMA success rate and EWMA latency.
+    Feeds the router's fallback-chain ranking.
+    """
+
+    def __init__(self, alpha: float = 0.2):
+        self.alpha = alpha
+        self.success_rates: Dict[str, float] = {}
+        self.latencies: Dict[str, float] = {}
+
+    def _ewma(self, current: Optional[float], value: float) -> float:
+        if current is None:
+            return value
+        return self.alpha * value + (1 - self.alpha) * current
+
+    def record(
+        self, provider_name: str, success: bool, latency_ms: Optional[float] = None
+    ):
+        self.success_rates[provider_name] = self._ewma(
+            self.success_rates.get(provider_name), 1.0 if success else 0.0
+        )
+        if success and latency_ms is not None:
+            self.latencies[provider_name] = self._ewma(
+                self.latencies.get(provider_name), latency_ms
+            )
+
+    def success_rate(self, provider_name: str) -> float:
+        """EWMA success rate (1.0 for providers with no calls yet)."""
+        return self.success_rates.get(provider_name, 1.0)
+
+    def latency_ms(self, provider_name: str) -> Optional[float]:
+        """EWMA latency of successful calls, or None with no data."""
+        return self.latencies.get(provider_name)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            name: {
+                "success_rate": self.success_rate(name),
+                "ewma_latency_ms": self.latency_ms(name),
+            }
+            for name in self.success_rates
+        }
+
+
+# Global latency/hedging/health state
+LATENCY_TRACKER = LatencyTracker()
+HEDGE_STATS = HedgeStats()
+PROVIDER_HEALTH = ProviderHealth()
+
+# Global Retry Policy (config.yaml `retry` section)
+RETRY_POLICY = RetryPolicy.from_config()
+
+
+def _hedging_config() -> Dict[str, Any]:
+    """Hedging settings from config.yaml (`hedging` section)."""
+    return load_config().get("hedging") or {}
+
+
+def hedge_delay(provider_name: str) -> float:
+    """
+    Seconds to wait on the primary before launching the fallback.
+
+    Uses the primary's latency percentile once enough samples exist,
+    otherwise the configured default delay.
+    """
+    settings = _hedging_config()
+    default_delay = float(settings.get("default_delay_s", 30))
+    if LATENCY_TRACKER.count(provider_name) < settings.get("min_samples", 20):
+        return default_delay
+    latency_ms = LATENCY_TRACKER.percentile(
+        provider_name, settings.get("percentile", 95)
+    )
+    return latency_ms / 1000 if latency_ms is not None else default_delay
+
+
+async def _attempt(
+    provider,
+    prompt: str,
+    model: Optional[str],
+    deadline: Optional[float] = None,
+    use_cache: bool = True,
+):
+    """
+    Run one provider call (with retries) and update breaker/latency state.
+
+    Each attempt gets whatever time is left before `deadline` as its
+    timeout, so the provider call never outlives the request.
+    """
+    name = provider.get_name()
+    circuit_model = model or getattr(provider, "default_model", None)
+    check_deadline(deadline, f"Call to {breaker_key(name, circuit_model)}")
+    if not CIRCUIT_BREAKER.allow_request(name, circuit_model):
+        raise AIProviderError(f"Circuit open for {breaker_key(name, circuit_model)}")
+
+    start_time = time.monotonic()
+    try:
+        response = await RETRY_POLICY.call(
+            lambda: provider.generate(
+                prompt, model, timeout=remaining(deadline), use_cache=use_cache
+            ),
+            deadline,
+        )
+    except asyncio.CancelledError:
+        # Cancellation is not a provider failure, but frees a probe slot
+        CIRCUIT_BREAKER.release(name, circuit_model)
+        raise
+    except TimeoutError as e:
+        if deadline is not None and time.monotonic() >= deadline:
+            # Cut short by our own deadline, not a slow provider
+            CIRCUIT_BREAKER.release(name, circuit_model)
+            raise DeadlineExceededError(
+                f"Call to {breaker_key(name, circuit_model)} exceeded its deadline"
+            ) from e
+        latency = (time.monotonic() - start_time) * 1000
+        CIRCUIT_BREAKER.record_failure(name, circuit_model, latency)
+        PROVIDER_HEALTH.record(name, False)
+        raise
+    except Exception:
+        # Record Failure
+        latency = (time.monotonic() - start_time) * 1000
+        CIRCUIT_BREAKER.record_failure(name, circuit_model, latency)
+        PROVIDER_HEALTH.record(name, False)
+        raise
+
+    if response.metrics.cached:
+        # A cache hit says nothing about the provider's health or latency
+        CIRCUIT_BREAKER.release(name, circuit_model)
+        return response
+
+    # Record Success
+    CIRCUIT_BREAKER.record_success(name, circuit_model, response.metrics.latency_ms)
+    LATENCY_TRACKER.record(name, response.metrics.latency_ms)
+    PROVIDER_HEALTH.record(name, True, response.metrics.latency_ms)
+    return response
+
+
+async def _generate_hedged(
+    candidates: List[Tuple[Any, Optional[str]]],
+    prompt: str,
+    deadline: float,
+    use_cache: bool = True,
+):
+    """
+    Race the primary against the fallback once the primary is slow.
+
+    Returns:
+        Tuple of (response or None, last_exception, candidates tried).
+        Untried candidates are left to the sequential path.
+    """
+    (primary, primary_model), (fallback, fallback_model) = candidates[:2]
+    HEDGE_STATS.calls += 1
+
+    primary_task = asyncio.create_task(
+        _attempt(primary, prompt, primary_model, deadline, use_cache)
+    )
+    tasks = {primary_task}
+    last_exception = None
+    try:
+        delay = hedge_delay(primary.get_name())
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if not done:
+            # Primary is slower than its usual tail: launch the hedge
+            logger.info(
+                f"Hedging {primary.get_name()} with {fallback.get_name()} "
+                f"after {delay:.1f}s"
+            )
+            HEDGE_STATS.hedged += 1
+            tasks.add(
+                asyncio.create_task(
+                    _attempt(fallback, prompt, fallback_model, deadline, use_cache)
+                )
+            )
+        elif primary_task.exception() is not None:
+            # Primary failed fast: plain fallback, no race needed
+            return None, primary_task.exception(), 1
+
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task.exception() is not None:
+                    last_exception = task.exception()
+                    continue
+                # First success wins
+                if len(tasks) > 1:
+                    if task is primary_task:
+                        HEDGE_STATS.primary_wins += 1
+                    else:
+                        HEDGE_STATS.hedge_wins += 1
+                return task.result(), None, len(tasks)
+        return None, last_exception, len(tasks)
+    finally:
+        # Cancel the loser (or everything, if we were cancelled ourselves)
+        for task in tasks:
+            if not task.done():
+                task.cancel()
 
 
 async def generate_with_resilience(
-    providers: Tuple[object, ...], prompt: str, model: str = None
+    providers: Sequence[Any],
+    prompt: str,
+    model: str = None,
+    hedge: Optional[bool] = None,
+    deadline: Optional[float] = None,
+    use_cache: bool = True,
 ) -> object:
     """
     Execute generation with automatic fallback and circuit breaker updates.
 
     Args:
-        providers: Tuple of (primary, fallback) providers (AIProvider objects)
+        providers: Ordered fallback chain. Entries are AIProvider objects,
+            provider names (resolved to the pooled instances), or
+            (provider, model) pairs as produced by ModelRouter.route().
         prompt: The prompt to send
-        model: Optional specific model ID to use (e.g., "gpt-5-mini")
+        model: Optional specific model ID for the first entry when it is
+            not a (provider, model) pair (e.g., "gpt-5-mini")
+        hedge: Launch the fallback in parallel if the primary is slower than
+            its latency percentile (None = use config.yaml `hedging.enabled`)
+        deadline: Optional time.monotonic() deadline for the whole call,
+            fallbacks and retries included
+        use_cache: Allow providers to answer from PROVIDER_CACHE
 
     Returns:
         ProviderResponse: The result
 
     Raises:
         AIProviderError: If all providers fail
+        DeadlineExceededError: If the deadline passes first
     """
     last_exception = None
 
-    for i, provider in enumerate(providers):
+    # Resolve available providers (circuit closed)
+    candidates = []
+    for i, entry in enumerate(providers):
+        if isinstance(entry, tuple):
+            provider, model_to_use = entry
+        else:
+            # Only pass specific model to PRIMARY provider (i=0)
+            # Fallback providers use their own default model
+            provider, model_to_use = entry, (model if i == 0 else None)
+
+        if isinstance(provider, str):
+            provider = PROVIDER_REGISTRY.get_optional(provider)
         if not provider:
             continue
 
-        try:
-            # Check circuit (redundant if Router checked, but good for race conditions)
-            if not CIRCUIT_BREAKER.is_available(provider.get_name()):
-                continue
+        # Check circuit (redundant if Router checked, but good for race conditions)
+        circuit_model = model_to_use or getattr(provider, "default_model", None)
+        if not CIRCUIT_BREAKER.is_available(provider.get_name(), circuit_model):
+            continue
 
-            # Only pass specific model to PRIMARY provider (i=0)
-            # Fallback providers use their own default model
-            model_to_use = model if i == 0 else None
-            response = await provider.generate(prompt, model_to_use)
+        candidates.append((provider, model_to_use))
+
+    if hedge is None:
+        hedge = bool(_hedging_config().get("enabled", False))
+
+    # Retry budget shared by every provider tried for this call,
+    # tightened to the caller's deadline
+    budget_deadline = time.monotonic() + RETRY_POLICY.budget
+    deadline = budget_deadline if deadline is None else min(deadline, budget_deadline)
 
-            # Record Success
-            CIRCUIT_BREAKER.record_success(provider.get_name())
+    if hedge and len(candidates) >= 2:
+        response, last_exception, tried = await _generate_hedged(
+            candidates, prompt, deadline, use_cache
+        )
+        if response is not None:
             return response
+        candidates = candidates[tried:]
 
+    for provider, model_to_use in candidates:
+        try:
+            return await _attempt(
+                provider, prompt, model_to_use, deadline, use_cache
+            )
+        except DeadlineExceededError:
+            # No time left for any fallback either
+            raise
         except Exception as e:
-            # Record Failure
-            CIRCUIT_BREAKER.record_failure(provider.get_name())
             last_exception = e
 
+    if isinstance(last_exception, DeadlineExceededError):
+        raise last_exception
+
     # If we get here, all failed
-    raise AIProviderError(f"Generation failed: {str(last_exception)}")
+    message = f"Generation failed: {str(last_exception)}"
+    raise AIProviderError(message) from last_exception
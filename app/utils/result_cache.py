@@ -0,0 +1,280 @@
+"""
+Two-tier result cache: in-memory LRU in front of a persistent SQLite store.
+
+Values are JSON-serializable dicts addressed by a content hash of the
+inputs that produced them (see cache_key()). Both tiers expire entries
+after a TTL and evict least-recently-used entries past a size bound.
+A disk hit is promoted into the memory tier.
+
+Two instances are used: RESULT_CACHE for whole pipeline runs
+(`result_cache` section of config.yaml) and PROVIDER_CACHE for single
+AIProvider.generate calls (`provider_cache` section).
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.policy import load_config
+
+logger = logging.getLogger(__name__)
+
+# Per-request cache modes
+CACHE_USE = "use"  # read and write (default)
+CACHE_REFRESH = "refresh"  # skip the read, overwrite with a fresh result
+CACHE_BYPASS = "bypass"  # neither read nor write
+CACHE_MODES = (CACHE_USE, CACHE_REFRESH, CACHE_BYPASS)
+
+
+def cache_key(*parts: Any) -> str:
+    """Stable SHA-256 of JSON-serializable parts (dict key order ignored)."""
+    payload = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SqliteStore:
+    """
+    Persistent key -> JSON value table with TTL and LRU eviction.
+
+    Calls are blocking; ResultCache runs them in a worker thread.
+    The database file is only created on first use.
+    """
+
+    def __init__(self, path: str, max_entries: int, table: str = "cache_entries"):
+        self.path = path
+        self.max_entries = max_entries
+        self.table = table
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                f"CREATE INDEX IF NOT EXISTS ix_{self.table}_accessed_at "
+                f"ON {self.table} (accessed_at)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get(self, key: str, ttl: float) -> Optional[Tuple[Dict[str, Any], float]]:
+        """Return (value, created_at) for a live entry, else None."""
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                f"SELECT value, created_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            if now - row[1] > ttl:
+                conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                conn.commit()
+                return None
+            conn.execute(
+                f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            conn.commit()
+            return json.loads(row[0]), row[1]
+
+    def put(self, key: str, value: Dict[str, Any]) -> int:
+        """Store a value; returns how many entries were evicted."""
+        with self._lock:
+            conn = self._connect()
+            now = time.time()
+            conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} "
+                "(key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now),
+            )
+            count = conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+            evicted = max(0, count - self.max_entries)
+            if evicted:
+                conn.execute(
+                    f"DELETE FROM {self.table} WHERE key IN ("
+                    f"SELECT key FROM {self.table} ORDER BY accessed_at LIMIT ?)",
+                    (evicted,),
+                )
+            conn.commit()
+            return evicted
+
+    def delete(self, key: str):
+        with self._lock:
+            conn = self._connect()
+            conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            conn.commit()
+
+    def clear(self):
+        with self._lock:
+            if self._conn is None and not Path(self.path).exists():
+                return
+            conn = self._connect()
+            conn.execute(f"DELETE FROM {self.table}")
+            conn.commit()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class ResultCache:
+    """In-memory LRU tier backed by an optional SqliteStore tier."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        ttl: float = 86400,
+        memory_entries: int = 256,
+        store: Optional[SqliteStore] = None,
+    ):
+        self.enabled = enabled
+        self.ttl = ttl
+        self.memory_entries = memory_entries
+        self.store = store
+        self._memory: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+        }
+
+    @classmethod
+    def from_config(cls, section: str = "result_cache") -> "ResultCache":
+        """Build from a config.yaml section (ttl_s, memory_entries, disk_*)."""
+        settings = load_config().get(section) or {}
+        path = settings.get("disk_path")
+        store = None
+        if path:
+            store = SqliteStore(path, int(settings.get("disk_entries", 5000)))
+        return cls(
+            enabled=bool(settings.get("enabled", True)),
+            ttl=float(settings.get("ttl_s", 86400)),
+            memory_entries=int(settings.get("memory_entries", 256)),
+            store=store,
+        )
+
+    def _get_memory(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if time.time() - stored_at > self.ttl:
+            del self._memory[key]
+            return None
+        self._memory.move_to_end(key)
+        return value
+
+    def _put_memory(self, key: str, value: Dict[str, Any], stored_at: float):
+        self._memory[key] = (stored_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a key in memory, then on disk. Records hit/miss stats."""
+        if not self.enabled:
+            return None
+
+        value = self._get_memory(key)
+        if value is not None:
+            self.stats["memory_hits"] += 1
+            return value
+
+        if self.store is not None:
+            try:
+                entry = await asyncio.to_thread(self.store.get, key, self.ttl)
+            except sqlite3.Error as e:
+                logger.warning(f"Result cache read failed: {e}")
+                entry = None
+            if entry is not None:
+                value, created_at = entry
+                self.stats["disk_hits"] += 1
+                # Keep the original age so promotion does not extend the TTL
+                self._put_memory(key, value, created_at)
+                return value
+
+        self.stats["misses"] += 1
+        return None
+
+    async def put(self, key: str, value: Dict[str, Any]):
+        """Store a value in both tiers. Disk errors are logged, not raised."""
+        if not self.enabled:
+            return
+        self._put_memory(key, value, time.time())
+        self.stats["stores"] += 1
+
+        if self.store is not None:
+            try:
+                evicted = await asyncio.to_thread(self.store.put, key, value)
+                self.stats["evictions"] += evicted
+            except sqlite3.Error as e:
+                logger.warning(f"Result cache write failed: {e}")
+
+    async def delete(self, key: str):
+        """Drop a key from both tiers (e.g. a result that turned out unusable)."""
+        self._memory.pop(key, None)
+        if self.store is not None:
+            try:
+                await asyncio.to_thread(self.store.delete, key)
+            except sqlite3.Error as e:
+                logger.warning(f"Result cache delete failed: {e}")
+
+    def clear(self):
+        self._memory.clear()
+        if self.store is not None:
+            self.store.clear()
+
+    def to_dict(self) -> Dict[str, Any]:
+        lookups = (
+            self.stats["memory_hits"] + self.stats["disk_hits"] + self.stats["misses"]
+        )
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+        return {
+            "enabled": self.enabled,
+            "memory_size": len(self._memory),
+            "hit_rate": hits / lookups if lookups else None,
+            **self.stats,
+        }
+
+
+# Global Result Cache (config.yaml `result_cache` section)
+# Whole PipelineResults keyed by idea, platform, merged config and routing
+RESULT_CACHE = ResultCache.from_config()
+
+# Global Provider Call Cache (config.yaml `provider_cache` section)
+# Single AIProvider.generate calls keyed by provider, model, prompt and sampling
+PROVIDER_CACHE = ResultCache.from_config("provider_cache")
+
+
+def stage_uses_cache(config: Dict[str, Any], stage: str) -> bool:
+    """
+    Whether a pipeline stage may reuse cached provider calls.
+
+    Stages listed in the request's `fresh_stages` (merged config) or in
+    config.yaml `provider_cache.fresh_stages` always get a fresh sample.
+    For a CompiledPolicy the latter comes from its own config snapshot.
+    """
+    fresh = set(config.get("fresh_stages") or [])
+    configured = getattr(config, "configured_fresh_stages", None)
+    if configured is None:
+        configured = (load_config().get("provider_cache") or {}).get("fresh_stages")
+    fresh.update(configured or [])
+    return stage not in fresh
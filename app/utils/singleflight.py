@@ -0,0 +1,85 @@
+"""
+Singleflight: coalesce identical concurrent calls into one.
+
+The first caller for a key starts the work as a task; callers arriving
+while it is still running await the same task instead of starting their
+own. A waiter that is cancelled (e.g. its client disconnected) only
+detaches itself - the shared task is cancelled once no waiter is left.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Flight:
+    task: asyncio.Future
+    waiters: int = 0
+
+
+class SingleFlight:
+    """Registry of in-flight calls keyed by a caller-chosen string."""
+
+    def __init__(self):
+        self._flights: Dict[str, _Flight] = {}
+        self.stats = {"calls": 0, "coalesced": 0, "cancelled": 0}
+
+    def _start(self, key: str, fn: Callable[[], Awaitable[Any]]) -> _Flight:
+        flight = _Flight(task=asyncio.ensure_future(fn()))
+
+        def forget(_task):
+            # A later flight may already have replaced this one
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+
+        flight.task.add_done_callback(forget)
+        self._flights[key] = flight
+        return flight
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run `fn()` once per key among concurrent callers.
+
+        Args:
+            key: Identity of the work (equal keys share one run)
+            fn: Zero-argument coroutine function doing the work
+
+        Returns:
+            The shared result (exceptions are shared too)
+        """
+        self.stats["calls"] += 1
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = self._start(key, fn)
+        else:
+            self.stats["coalesced"] += 1
+            logger.info(f"Coalescing duplicate in-flight request {key[:12]}")
+
+        flight.waiters += 1
+        try:
+            # Shielded so one waiter's cancellation does not kill the others
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                self.stats["cancelled"] += 1
+                # Forget it now, not when it finishes cancelling: a caller
+                # arriving in between must start a new run, not join this one
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+                flight.task.cancel()
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"in_flight": self.in_flight, **self.stats}
+
+
+# Global registry for /content/generate platform runs
+GENERATION_FLIGHTS = SingleFlight()
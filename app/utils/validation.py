@@ -3,6 +3,8 @@
 from dataclasses import dataclass
 from typing import Optional, Dict, Any
 
+from app.core.platform_defaults import PLATFORM_REGISTRY
+
 
 @dataclass
 class ValidationResult:
@@ -42,7 +44,8 @@ class OutputValidator:
         if config and "constraints" in config:
             char_limit = config["constraints"].get("char_limit", 3000)
 
-        char_count = len(content)
+        # Counted the way the platform counts (e.g. links on X)
+        char_count = PLATFORM_REGISTRY.count(platform, content)
 
         # Check 1: Empty content
         if not content or not content.strip():
@@ -0,0 +1,158 @@
+"""
+Benchmark: GET /content history on a large table.
+
+Seeds a SQLite database with generated_content rows (1M by default), then
+times the old endpoint (every row, ordered by created_at) against keyset
+pages from content_repo.list_content: first page, a page deep in the
+history, and pages filtered by platform and by user - first without and
+then with the history indexes. No network calls are made.
+
+Usage: python scripts/bench_content_history.py [rows]
+"""
+
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models.models import GeneratedContent
+from app.repositories import content_repo
+
+PLATFORMS = ("linkedin", "x", "reddit", "instagram", "facebook")
+HISTORY_INDEXES = [
+    "ix_generated_content_created_at",
+    "ix_generated_content_user_id_created_at",
+    "ix_generated_content_platform_created_at",
+]
+PAGE = 50
+
+
+def seed(path: str, rows: int):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+
+    conn = sqlite3.connect(path)
+    for index in HISTORY_INDEXES:
+        conn.execute(f"DROP INDEX {index}")
+    conn.executemany(
+        "INSERT INTO users (id, email) VALUES (?, ?)",
+        [(n, f"user{n}@example.com") for n in range(1, 11)],
+    )
+    start = datetime(2024, 1, 1)
+    batch = []
+    for n in range(rows):
+        created_at = start + timedelta(seconds=n * 30)
+        batch.append(
+            (
+                f"idea {n}",
+                PLATFORMS[n % len(PLATFORMS)],
+                "lorem ipsum dolor sit amet " * 8,
+                "saved",
+                created_at.strftime("%Y-%m-%d %H:%M:%S.%f"),
+                n % 10 + 1,
+                "gemini-2.5-flash" if n % 3 else "gpt-4o",
+            )
+        )
+        if len(batch) == 50_000:
+            _insert(conn, batch)
+            batch = []
+    _insert(conn, batch)
+    conn.commit()
+    conn.close()
+
+
+def _insert(conn: sqlite3.Connection, batch: list):
+    conn.executemany(
+        "INSERT INTO generated_content (idea_prompt, platform, content_text, "
+        "status, created_at, user_id, model_used) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        batch,
+    )
+
+
+def add_indexes(path: str):
+    engine = create_engine(f"sqlite:///{path}")
+    for index in GeneratedContent.__table__.indexes:
+        if index.name in HISTORY_INDEXES:
+            index.create(engine)
+    engine.dispose()
+
+
+def bench_get_all(path: str) -> float:
+    # The old GET /content: every row through the ORM
+    engine = create_engine(f"sqlite:///{path}")
+    start = time.perf_counter()
+    with sessionmaker(bind=engine)() as db:
+        db.query(GeneratedContent).order_by(GeneratedContent.created_at.desc()).all()
+    elapsed = time.perf_counter() - start
+    engine.dispose()
+    return elapsed * 1000
+
+
+async def bench_pages(path: str, rows: int) -> dict:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def timed(**kwargs) -> float:
+        async with session_factory() as db:
+            start = time.perf_counter()
+            await content_repo.list_content(db, limit=PAGE, **kwargs)
+            return (time.perf_counter() - start) * 1000
+
+    async with session_factory() as db:
+        # Cursor pointing ~90% of the way into the history
+        deep_row = (
+            await db.execute(
+                select(GeneratedContent).where(
+                    GeneratedContent.id == max(1, rows // 10)
+                )
+            )
+        ).scalar_one()
+        deep_cursor = content_repo.encode_cursor(deep_row)
+
+    results = {
+        "first page": await timed(),
+        "deep page (cursor)": await timed(cursor=deep_cursor),
+        "platform=x": await timed(platform="x"),
+        "user_id=3, deep": await timed(user_id=3, cursor=deep_cursor),
+        "date range": await timed(
+            created_from=datetime(2024, 3, 1), created_to=datetime(2024, 3, 2)
+        ),
+    }
+    await engine.dispose()
+    return results
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "history.sqlite")
+        start = time.perf_counter()
+        seed(path, rows)
+        print(f"Seeded {rows:,} rows in {time.perf_counter() - start:.1f}s")
+
+        print(f"Before (GET /content, all rows):  {bench_get_all(path):10.1f} ms")
+
+        no_index = asyncio.run(bench_pages(path, rows))
+        add_indexes(path)
+        indexed = asyncio.run(bench_pages(path, rows))
+
+        print(f"After  (keyset page of {PAGE}):      no index    indexed")
+        for name in indexed:
+            print(f"  {name:<30} {no_index[name]:10.2f} ms {indexed[name]:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Benchmark: finding saved content by text on a large table.
+
+Seeds a SQLite database (1M rows by default; the FTS5 index is filled by
+the sync triggers) and compares, for a few queries:
+- Before: the client downloads the whole history and filters it
+  (GET /content all rows + substring match)
+- LIKE: a server-side '%term%' scan, the obvious fix without an index
+- After: content_repo.search_content (FTS5 MATCH, bm25 rank, snippets)
+No network calls are made.
+
+Usage: python scripts/bench_content_search.py [rows]
+"""
+
+import asyncio
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models.models import GeneratedContent
+from app.repositories import content_repo
+
+PLATFORMS = ("linkedin", "x", "reddit", "instagram", "facebook")
+# (query, platform) pairs: rare word, common word, two words, filtered
+QUERIES = [
+    ("kubernetes", None),
+    ("growth", None),
+    ("remote hiring", None),
+    ("launch", "x"),
+]
+
+
+def vocabulary(size: int = 20_000) -> list:
+    rng = random.Random(1)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = {"".join(rng.choices(letters, k=rng.randint(4, 9))) for _ in range(size)}
+    return sorted(words)
+
+
+def seed(path: str, rows: int):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+
+    rng = random.Random(7)
+    words = vocabulary()
+    # A few real words at different frequencies so the queries have hits
+    common = ["growth", "launch", "team", "remote"]
+    rare = ["kubernetes", "hiring"]
+
+    conn = sqlite3.connect(path)
+    conn.execute("INSERT INTO users (id, email) VALUES (1, 'bench@example.com')")
+    start = datetime(2024, 1, 1)
+    batch = []
+    for n in range(rows):
+        text = rng.choices(words, k=30)
+        if n % 5 == 0:
+            text[rng.randrange(30)] = rng.choice(common)
+        if n % 2000 == 0:
+            text[rng.randrange(30)] = rng.choice(rare)
+        batch.append(
+            (
+                " ".join(rng.choices(words, k=6)),
+                rng.choice(PLATFORMS),
+                " ".join(text),
+                "saved",
+                (start + timedelta(seconds=n * 30)).strftime("%Y-%m-%d %H:%M:%S.%f"),
+                1,
+            )
+        )
+        if len(batch) == 50_000:
+            _insert(conn, batch)
+            batch = []
+    _insert(conn, batch)
+    conn.commit()
+    conn.close()
+
+
+def _insert(conn: sqlite3.Connection, batch: list):
+    conn.executemany(
+        "INSERT INTO generated_content (idea_prompt, platform, content_text, "
+        "status, created_at, user_id) VALUES (?, ?, ?, ?, ?, ?)",
+        batch,
+    )
+
+
+def bench_client_side(path: str) -> float:
+    # The old way: ship every row, then filter in the browser
+    engine = create_engine(f"sqlite:///{path}")
+    start = time.perf_counter()
+    with sessionmaker(bind=engine)() as db:
+        rows = db.query(GeneratedContent).all()
+        for query, platform in QUERIES:
+            terms = query.lower().split()
+            [
+                row
+                for row in rows
+                if (platform is None or row.platform == platform)
+                and all(t in row.content_text.lower() for t in terms)
+            ]
+    engine.dispose()
+    return (time.perf_counter() - start) * 1000
+
+
+def bench_like(path: str) -> dict:
+    conn = sqlite3.connect(path)
+    results = {}
+    for query, platform in QUERIES:
+        sql = "SELECT id FROM generated_content WHERE 1=1"
+        params: list = []
+        for term in query.split():
+            sql += " AND (idea_prompt LIKE ? OR content_text LIKE ?)"
+            params += [f"%{term}%", f"%{term}%"]
+        if platform:
+            sql += " AND platform = ?"
+            params.append(platform)
+        start = time.perf_counter()
+        conn.execute(sql + " ORDER BY created_at DESC LIMIT 20", params).fetchall()
+        results[(query, platform)] = (time.perf_counter() - start) * 1000
+    conn.close()
+    return results
+
+
+async def bench_fts(path: str) -> dict:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    results = {}
+    async with session_factory() as db:
+        await content_repo.search_content(db, "warmup")  # Open the connection
+        for query, platform in QUERIES:
+            start = time.perf_counter()
+            hits, _ = await content_repo.search_content(db, query, platform=platform)
+            results[(query, platform)] = ((time.perf_counter() - start) * 1000, hits)
+    await engine.dispose()
+    return results
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "search.sqlite")
+        start = time.perf_counter()
+        seed(path, rows)
+        print(
+            f"Seeded {rows:,} rows (with FTS index) in {time.perf_counter() - start:.1f}s"
+        )
+
+        client_ms = bench_client_side(path)
+        like = bench_like(path)
+        fts = asyncio.run(bench_fts(path))
+
+        print(f"Before (all rows to client, filter there): {client_ms:10.1f} ms")
+        print(f"{'query':<28} {'LIKE scan':>12} {'FTS5':>10}  top snippet")
+        for key, (fts_ms, hits) in fts.items():
+            query, platform = key
+            label = query + (f" [platform={platform}]" if platform else "")
+            snippet = hits[0][1][:60] if hits else "-"
+            print(f"{label:<28} {like[key]:9.1f} ms {fts_ms:7.2f} ms  {snippet}")
+
+
+if __name__ == "__main__":
+    main()
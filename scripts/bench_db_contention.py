@@ -0,0 +1,140 @@
+"""
+Benchmark: concurrent saves and history reads on one SQLite file.
+
+N writer and M reader processes (think uvicorn workers plus the job
+queue) hammer one database through the async repositories: writers save
+content, readers page through history. Separate processes, so the
+numbers show file-lock contention rather than one event loop's CPU.
+
+Before: default engines (rollback journal, no pragmas).
+After: the `database` profile from create_async_engines (WAL, tuned
+pragmas, a single writer connection and read-only reader connections).
+No network calls are made.
+
+Usage: python scripts/bench_db_contention.py [writers] [readers] [seconds]
+"""
+
+import asyncio
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.database import Base, create_async_engines, to_async_url
+from app.core.policy import load_config
+from app.models.models import GeneratedContent
+from app.models.schemas import ContentSaveRequest
+from app.repositories import content_repo
+
+SEED_ROWS = 2000
+
+
+def engines(url: str, profile: bool):
+    if profile:
+        return create_async_engines(url, load_config().get("database") or {})
+    engine = create_async_engine(to_async_url(url))
+    return engine, engine
+
+
+async def seed(url: str, profile: bool):
+    writer, reader = engines(url, profile)
+    async with writer.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(writer, expire_on_commit=False)() as db:
+        user = await content_repo.get_or_create_default_user(db)
+        db.add_all(
+            GeneratedContent(
+                idea_prompt="seed", platform="x", content_text="seed", user_id=user.id
+            )
+            for _ in range(SEED_ROWS)
+        )
+        await db.commit()
+    await writer.dispose()
+    await reader.dispose()
+
+
+async def worker(url: str, profile: bool, role: str, seconds: float) -> dict:
+    writer, reader = engines(url, profile)
+    sessions = async_sessionmaker(
+        writer if role == "writer" else reader, expire_on_commit=False
+    )
+    request = ContentSaveRequest(
+        idea_prompt="bench idea",
+        platform="linkedin",
+        content_text="lorem ipsum dolor sit amet " * 20,
+    )
+    stop = time.monotonic() + seconds
+    ops, errors, latencies = 0, 0, []
+    while time.monotonic() < stop:
+        start = time.perf_counter()
+        try:
+            async with sessions() as db:
+                if role == "writer":
+                    await content_repo.create_content(db, request)
+                else:
+                    await content_repo.list_content(db, limit=50)
+            ops += 1
+            latencies.append((time.perf_counter() - start) * 1000)
+        except Exception:
+            errors += 1  # "database is locked" once busy_timeout runs out
+    await writer.dispose()
+    await reader.dispose()
+    return {"role": role, "ops": ops, "errors": errors, "latencies": latencies}
+
+
+def run_worker(args) -> dict:
+    return asyncio.run(worker(*args))
+
+
+def bench(url: str, profile: bool, writers: int, readers: int, seconds: float):
+    asyncio.run(seed(url, profile))
+    roles = ["writer"] * writers + ["reader"] * readers
+    with multiprocessing.Pool(len(roles)) as pool:
+        results = pool.map(run_worker, [(url, profile, r, seconds) for r in roles])
+
+    summary = {}
+    for role in ("writer", "reader"):
+        mine = [r for r in results if r["role"] == role]
+        latencies = sorted(ms for r in mine for ms in r["latencies"])
+        summary[role] = {
+            "per_s": sum(r["ops"] for r in mine) / seconds,
+            "p95": latencies[int(len(latencies) * 0.95)] if latencies else None,
+            "errors": sum(r["errors"] for r in mine),
+        }
+    return summary
+
+
+def report(label: str, summary: dict):
+    parts = []
+    for role in ("writer", "reader"):
+        stats = summary[role]
+        p95 = "-" if stats["p95"] is None else f"{stats['p95']:.1f}"
+        parts.append(
+            f"{role}s {stats['per_s']:7.1f}/s p95 {p95:>6} ms err {stats['errors']}"
+        )
+    print(f"{label} " + " | ".join(parts))
+
+
+def main():
+    writers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    readers = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    seconds = float(sys.argv[3]) if len(sys.argv) > 3 else 5.0
+
+    print(f"{writers} writer + {readers} reader processes, {seconds:.0f}s each")
+    with tempfile.TemporaryDirectory() as tmp:
+        before = bench(
+            f"sqlite:///{tmp}/before.sqlite", False, writers, readers, seconds
+        )
+        after = bench(f"sqlite:///{tmp}/after.sqlite", True, writers, readers, seconds)
+    report("Before (default engine):", before)
+    report("After  (WAL profile):   ", after)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Benchmark: event-loop lag under mixed generate + history load.
+
+Simulated generation streams (a token every few ms) share the loop with
+clients polling GET /content history. Before, history queries ran on a
+sync Session inside the async route, blocking the loop for the whole
+query; now they go through the async repository (aiosqlite). Loop lag
+is measured as how late a 5 ms ticker wakes up. No network calls are made.
+
+Usage: python scripts/bench_db_loop_lag.py [rows] [seconds]
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models.models import GeneratedContent, User
+from app.repositories import content_repo
+
+TICK_S = 0.005
+STREAMS = 8
+HISTORY_CLIENTS = 4
+
+
+def seed(url: str, rows: int):
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as db:
+        user = User(email="bench@example.com")
+        db.add(user)
+        db.flush()
+        start = datetime.now(timezone.utc)
+        db.add_all(
+            GeneratedContent(
+                idea_prompt=f"idea {n}",
+                platform=("linkedin", "x", "reddit")[n % 3],
+                content_text="lorem ipsum " * 40,
+                user_id=user.id,
+                created_at=start - timedelta(seconds=n),
+            )
+            for n in range(rows)
+        )
+        db.commit()
+    engine.dispose()
+
+
+async def ticker(stop: asyncio.Event, lags: list):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK_S)
+        lags.append((time.perf_counter() - start - TICK_S) * 1000)
+
+
+async def stream(stop: asyncio.Event, tokens: list):
+    # Stand-in for a provider stream: short awaits between tokens
+    while not stop.is_set():
+        await asyncio.sleep(0.002)
+        tokens[0] += 1
+
+
+async def run_mixed(history, seconds: float):
+    stop = asyncio.Event()
+    lags: list = []
+    tokens = [0]
+    reads = [0]
+
+    async def history_client():
+        while not stop.is_set():
+            await history()
+            reads[0] += 1
+            await asyncio.sleep(0)  # A sync query never yields on its own
+
+    tasks = [asyncio.create_task(ticker(stop, lags))]
+    tasks += [asyncio.create_task(stream(stop, tokens)) for _ in range(STREAMS)]
+    tasks += [asyncio.create_task(history_client()) for _ in range(HISTORY_CLIENTS)]
+    await asyncio.sleep(seconds)
+    stop.set()
+    await asyncio.gather(*tasks)
+
+    lags.sort()
+    return {
+        "p50": lags[len(lags) // 2],
+        "p99": lags[int(len(lags) * 0.99)],
+        "max": lags[-1],
+        "tokens_per_s": tokens[0] / seconds,
+        "reads": reads[0],
+    }
+
+
+async def bench_sync(url: str, seconds: float):
+    engine = create_engine(url, connect_args={"check_same_thread": False})
+    session_factory = sessionmaker(bind=engine)
+
+    async def history():
+        # The old GET /content: blocking query inside an async route
+        with session_factory() as db:
+            db.query(GeneratedContent).order_by(
+                GeneratedContent.created_at.desc()
+            ).all()
+
+    try:
+        return await run_mixed(history, seconds)
+    finally:
+        engine.dispose()
+
+
+async def bench_async(url: str, seconds: float):
+    engine = create_async_engine(url.replace("sqlite://", "sqlite+aiosqlite://"))
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def history():
+        async with session_factory() as db:
+            await content_repo.get_all_content(db)
+
+    try:
+        return await run_mixed(history, seconds)
+    finally:
+        await engine.dispose()
+
+
+def report(label: str, stats: dict):
+    print(
+        f"{label} loop lag p50 {stats['p50']:7.2f} ms | p99 {stats['p99']:7.2f} ms"
+        f" | max {stats['max']:7.2f} ms | stream tokens/s {stats['tokens_per_s']:7.0f}"
+        f" | history reads {stats['reads']}"
+    )
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 5.0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.sqlite')}"
+        seed(url, rows)
+
+        print(
+            f"History rows: {rows}, {STREAMS} streams + "
+            f"{HISTORY_CLIENTS} history clients, {seconds:.0f}s each"
+        )
+        report("Before (sync Session):   ", asyncio.run(bench_sync(url, seconds)))
+        report("After  (AsyncSession):   ", asyncio.run(bench_async(url, seconds)))
+    print(
+        "Note: async queries still cost CPU for ORM row building, but the "
+        "SQLite I/O runs off the loop, so streams keep flowing between rows."
+    )
+
+
+if __name__ == "__main__":
+    main()
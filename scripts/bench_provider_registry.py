@@ -0,0 +1,76 @@
+"""
+Benchmark: per-request provider construction vs the pooled registry.
+
+One platform run resolves 8 providers (primary + fallback for each of the
+4 stages). Before the registry every resolution built a fresh SDK client;
+now they come from PROVIDER_REGISTRY. No network calls are made.
+
+Usage: python scripts/bench_provider_registry.py [runs]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Dummy keys so every client can be constructed offline
+for key in ["GEMINI_API_KEY", "OPENAI_API_KEY", "ANTHROPIC_API_KEY", "GROK_API_KEY"]:
+    os.environ.setdefault(key, "bench-dummy-key")
+
+from app.providers.ai_provider import create_provider
+from app.providers.registry import ProviderRegistry
+
+# (primary, fallback) per stage with the default config.yaml routing
+STAGE_PROVIDERS = [
+    ("gemini", "openai"),  # generator
+    ("openai", "gemini"),  # critic
+    ("openai", "gemini"),  # improver
+    ("gemini", "openai"),  # judge
+]
+
+
+def bench_construct(runs: int) -> float:
+    start = time.perf_counter()
+    for _ in range(runs):
+        for primary, fallback in STAGE_PROVIDERS:
+            create_provider(primary)
+            create_provider(fallback)
+    return (time.perf_counter() - start) / runs * 1000
+
+
+def bench_registry(runs: int, registry: ProviderRegistry) -> float:
+    start = time.perf_counter()
+    for _ in range(runs):
+        for primary, fallback in STAGE_PROVIDERS:
+            registry.get(primary)
+            registry.get(fallback)
+    return (time.perf_counter() - start) / runs * 1000
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    registry = ProviderRegistry()
+    registry.startup()
+
+    construct_ms = bench_construct(runs)
+    registry_ms = bench_registry(runs, registry)
+
+    print(f"Platform runs: {runs} (8 provider resolutions each)")
+    print(f"Before (create_provider per stage): {construct_ms:8.3f} ms / run")
+    print(f"After  (PROVIDER_REGISTRY.get):     {registry_ms:8.3f} ms / run")
+    if registry_ms > 0:
+        print(f"Speedup: {construct_ms / registry_ms:,.0f}x")
+    print(
+        "Note: excludes the TLS handshakes each fresh client pays on its "
+        "first request; pooled clients reuse keep-alive connections."
+    )
+
+    asyncio.run(registry.shutdown())
+
+
+if __name__ == "__main__":
+    main()
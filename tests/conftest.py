@@ -0,0 +1,123 @@
+"""
+Shared fixtures - fake pipeline stages for the orchestrate.py tests.
+"""
+
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from app.models.provider import ProviderMetrics, ProviderResponse
+from app.services import orchestrate
+from app.services.pipeline.judge import JudgeResult
+from app.utils.dedupe import DraftDeduper
+from app.utils.result_cache import ResultCache
+
+
+def stage_response(
+    version: str,
+    content: str = "",
+    provider: str = "fake",
+    tokens: tuple = (0, 0),
+    cached: bool = False,
+) -> ProviderResponse:
+    """Canned stage answer; content defaults to "<version> text"."""
+    return ProviderResponse(
+        content=content or f"{version} text",
+        metrics=ProviderMetrics(
+            input_tokens=tokens[0], output_tokens=tokens[1], latency_ms=1, cached=cached
+        ),
+        provider_name=provider,
+        model_name=f"{version}-model",
+    )
+
+
+class FakeStages:
+    """
+    Scripted generator, critic, improver, judge and validator.
+
+    Tests adjust the attributes before running the pipeline:
+        responses: {"v1" | "v2" | "v3": ProviderResponse} per stage
+        judge_result: fixed JudgeResult (default: labels ranked A, B, C)
+        validations: pass/fail results used first, one per validation
+        rejected: texts that fail validation once `validations` is empty
+    and read back:
+        calls: stage names in call order
+        judged: the sorted labels of every judge call
+        use_cache: the use_cache flag of every stage call, in call order
+    """
+
+    def __init__(self, drafts: Dict[str, str]):
+        self.responses = {
+            version: stage_response(version, drafts.get(version, ""))
+            for version in ("v1", "v2", "v3")
+        }
+        self.judge_result = None
+        self.validations: List[bool] = []
+        self.rejected = set()
+        self.calls: List[str] = []
+        self.judged: List[List[str]] = []
+        self.use_cache: List[bool] = []
+
+    async def generate(
+        self, user_input, platform, config, deadline=None, use_cache=True
+    ):
+        self.calls.append("generator")
+        self.use_cache.append(use_cache)
+        return self.responses["v1"]
+
+    async def critique(self, v1, platform, config, deadline=None, use_cache=True):
+        self.calls.append("critic")
+        self.use_cache.append(use_cache)
+        return self.responses["v2"]
+
+    async def improve(self, v1, v2, platform, config, deadline=None, use_cache=True):
+        self.calls.append("improver")
+        self.use_cache.append(use_cache)
+        return self.responses["v3"]
+
+    async def judge(self, texts, platform, config, deadline=None, use_cache=True):
+        self.calls.append("judge")
+        self.use_cache.append(use_cache)
+        labels = sorted(texts)
+        self.judged.append(labels)
+        if self.judge_result is not None:
+            return self.judge_result
+        return JudgeResult(
+            ranking=labels,
+            scores={label: 90 - 10 * i for i, label in enumerate(labels)},
+            model_name="judge-model",
+        )
+
+    def validate(self, text, platform, config) -> Any:
+        if self.validations:
+            passed = self.validations.pop(0)
+        else:
+            passed = text not in self.rejected
+        return type("V", (), {"passed": passed, "reason": "too long"})
+
+
+@pytest.fixture
+def fake_stages(request, monkeypatch):
+    """
+    Replace the pipeline stages with a FakeStages.
+
+    Parametrize indirectly with {version: text} to script the drafts:
+        @pytest.mark.parametrize("fake_stages", [{"v2": "..."}], indirect=True)
+    Result cache and deduper are fresh for every test.
+    """
+    stages = FakeStages(getattr(request, "param", None) or {})
+    monkeypatch.setattr(orchestrate, "generate", stages.generate)
+    monkeypatch.setattr(orchestrate, "critique", stages.critique)
+    monkeypatch.setattr(orchestrate, "improve", stages.improve)
+    monkeypatch.setattr(orchestrate, "judge", stages.judge)
+    monkeypatch.setattr(
+        orchestrate.OutputValidator, "validate", staticmethod(stages.validate)
+    )
+    monkeypatch.setattr(orchestrate, "RESULT_CACHE", ResultCache())
+    monkeypatch.setattr(orchestrate, "DRAFT_DEDUPER", DraftDeduper())
+    return stages
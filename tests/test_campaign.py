@@ -0,0 +1,54 @@
+"""
+Test file for campaign.py - bulk generation under a global concurrency cap.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.models.response_models import PlatformResult
+from app.models.schemas import CampaignItem
+from app.services import content as content_service
+from app.services.campaign import CampaignScheduler
+
+
+def test_campaign_respects_global_cap_and_summarizes(monkeypatch):
+    active = []
+    peak = []
+
+    async def fake_generate(idea, platform, **kwargs):
+        active.append(1)
+        peak.append(len(active))
+        await asyncio.sleep(0.02 if platform == "reddit" else 0.01)
+        active.pop()
+        return PlatformResult(
+            platform=platform, success=platform != "reddit", content="post"
+        )
+
+    monkeypatch.setattr(content_service, "generate_for_platform_shared", fake_generate)
+    scheduler = CampaignScheduler(max_concurrency=2)
+    items = [
+        CampaignItem(idea_prompt=f"idea {n}", platforms=["x", "reddit"])
+        for n in range(3)
+    ]
+
+    async def run():
+        return [record async for record in scheduler.run(items)]
+
+    records = asyncio.run(run())
+
+    assert max(peak) == 2
+    results = [r for r in records if r["type"] == "result"]
+    assert len(results) == 6
+    assert {(r["item"], r["platform"]) for r in results} == {
+        (n, p) for n in range(3) for p in ["x", "reddit"]
+    }
+
+    summary = records[-1]
+    assert summary["type"] == "summary"
+    assert (summary["success_count"], summary["failure_count"]) == (3, 3)
+    assert summary["runs_per_minute"] > 0
+    assert summary["latency_ms"]["p50"] <= summary["latency_ms"]["p95"]
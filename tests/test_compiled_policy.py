@@ -0,0 +1,77 @@
+"""
+Test file for compiled_policy.py - cached, frozen merged configs.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from app.core import compiled_policy
+from app.core.compiled_policy import PolicyCache, policy_instructions, policy_key
+from app.core.policy import build_prompt_instructions, get_merged_config
+from app.models.schemas import PolicyOverride
+from app.services.pipeline.generator import build_generation_prompt
+
+OVERRIDES = {
+    "constraints": {"target_chars": 200, "hashtags": 1},
+    "writing_style": {"emojis": "none"},
+}
+
+
+def test_compiled_policy_matches_merged_config():
+    policy = PolicyCache().compile("linkedin", OVERRIDES)
+    merged = get_merged_config("linkedin", OVERRIDES)
+    assert json.dumps(policy, sort_keys=True) == json.dumps(merged, sort_keys=True)
+    assert policy.instructions == build_prompt_instructions(merged)
+    assert policy_instructions(policy) == policy.instructions
+
+
+def test_equivalent_overrides_share_one_compiled_policy():
+    cache = PolicyCache()
+    first = cache.compile("x", OVERRIDES)
+    reordered = dict(reversed(list(OVERRIDES.items())))
+    assert cache.compile("x", reordered) is first
+    assert cache.compile("x", {**OVERRIDES, "fresh_stages": ["judge"]}) is not first
+    assert cache.stats == {"hits": 1, "misses": 2, "evictions": 0}
+
+    # A Pydantic override hashes like the dict of the fields it sets
+    model = PolicyOverride(fresh_stages=["judge"])
+    assert policy_key("x", model) == policy_key("x", {"fresh_stages": ["judge"]})
+
+
+def test_compiled_policy_is_read_only():
+    policy = PolicyCache().compile("linkedin")
+    with pytest.raises(TypeError):
+        policy["constraints"]["target_chars"] = 1
+    with pytest.raises(TypeError):
+        policy.update({"models": {}})
+    copy = policy.copy()  # A plain, mutable dict
+    copy["constraints"] = {}
+    assert policy["constraints"]
+
+
+def test_cache_is_bounded_lru():
+    cache = PolicyCache(max_entries=2)
+    linkedin = cache.compile("linkedin")
+    cache.compile("x")
+    cache.compile("linkedin")  # Refresh linkedin
+    cache.compile("reddit")  # Evicts x
+    assert cache.compile("linkedin") is linkedin
+    assert cache.to_dict()["size"] == 2 and cache.stats["evictions"] == 1
+    cache.compile("x")
+    assert cache.stats["misses"] == 4
+
+
+def test_stages_reuse_compiled_instructions(monkeypatch):
+    policy = PolicyCache().compile("linkedin")
+
+    def no_rebuild(config):
+        raise AssertionError("instructions rebuilt")
+
+    monkeypatch.setattr(compiled_policy, "build_prompt_instructions", no_rebuild)
+    assert policy.instructions in build_generation_prompt("idea", "linkedin", policy)
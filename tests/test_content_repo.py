@@ -0,0 +1,261 @@
+"""
+Test file for content_repo.py / preferences_repo.py - async repository layer.
+"""
+
+import asyncio
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.database import Base, to_async_url
+from app.models.models import GeneratedContent, User
+from app.models.schemas import (
+    ContentSaveRequest,
+    ContentUpdateRequest,
+    UserPreferenceUpdate,
+)
+import pytest
+
+from app.repositories import content_repo, preferences_repo
+
+
+def run_with_session(tmp_path, fn):
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+                return await fn(db)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(run())
+
+
+def test_async_url_mapping():
+    assert to_async_url("sqlite:///./database.sqlite") == (
+        "sqlite+aiosqlite:///./database.sqlite"
+    )
+    assert to_async_url("postgresql+psycopg2://u:p@h/db") == (
+        "postgresql+asyncpg://u:p@h/db"
+    )
+    assert to_async_url("postgres://u@h/db") == "postgresql+asyncpg://u@h/db"
+    assert to_async_url("mysql+aiomysql://u@h/db") == "mysql+aiomysql://u@h/db"
+
+
+def test_content_crud_round_trip(tmp_path):
+    async def scenario(db):
+        first = await content_repo.create_content(
+            db,
+            ContentSaveRequest(idea_prompt="idea", platform="x", content_text="hello"),
+        )
+        await content_repo.create_content(
+            db,
+            ContentSaveRequest(
+                idea_prompt="idea", platform="linkedin", content_text="second"
+            ),
+        )
+        listed, _ = await content_repo.list_content(db)
+        updated = await content_repo.update_content(
+            db, first.id, ContentUpdateRequest(content_text="hello again")
+        )
+        deleted = await content_repo.delete_content(db, first.id)
+        missing = await content_repo.update_content(
+            db, first.id, ContentUpdateRequest(content_text="gone")
+        )
+        return (
+            listed,
+            updated,
+            deleted,
+            missing,
+            (await content_repo.list_content(db))[0],
+        )
+
+    listed, updated, deleted, missing, remaining = run_with_session(tmp_path, scenario)
+    assert [c.platform for c in listed] == ["linkedin", "x"]  # Newest first
+    assert updated.content_text == "hello again" and updated.char_count == 11
+    assert deleted is True
+    assert missing is None
+    assert [c.platform for c in remaining] == ["linkedin"]
+
+
+def test_preferences_created_then_updated(tmp_path):
+    async def scenario(db):
+        created = await preferences_repo.get_preferences(db)
+        updated = await preferences_repo.update_preferences(
+            db, UserPreferenceUpdate(last_idea_prompt="latest")
+        )
+        return created, updated
+
+    created, updated = run_with_session(tmp_path, scenario)
+    assert created.id == updated.id
+    assert updated.last_idea_prompt == "latest"
+
+
+async def seed_history(db, rows=7):
+    users = [User(email="a@example.com"), User(email="b@example.com")]
+    db.add_all(users)
+    await db.flush()
+    start = datetime(2026, 1, 1)
+    db.add_all(
+        GeneratedContent(
+            idea_prompt=f"idea {n}",
+            platform="x" if n % 2 else "linkedin",
+            content_text=f"text {n}",
+            user_id=users[n % 2].id,
+            # Pairs share a timestamp so the id tie-breaker is exercised
+            created_at=start + timedelta(minutes=n // 2),
+        )
+        for n in range(rows)
+    )
+    await db.commit()
+
+
+def test_keyset_pages_cover_every_row_once(tmp_path):
+    async def scenario(db):
+        await seed_history(db)
+        pages = {}
+        for sort in ("newest", "oldest"):
+            seen, cursor = [], None
+            while True:
+                items, cursor = await content_repo.list_content(
+                    db, limit=3, cursor=cursor, sort=sort
+                )
+                seen.append([c.idea_prompt for c in items])
+                if cursor is None:
+                    break
+            pages[sort] = seen
+        return pages
+
+    pages = run_with_session(tmp_path, scenario)
+    newest = [i for page in pages["newest"] for i in page]
+    oldest = [i for page in pages["oldest"] for i in page]
+    assert [len(p) for p in pages["newest"]] == [3, 3, 1]
+    assert newest == [f"idea {n}" for n in (6, 5, 4, 3, 2, 1, 0)]
+    assert oldest == [f"idea {n}" for n in range(7)]
+
+
+def test_history_filters(tmp_path):
+    async def scenario(db):
+        await seed_history(db)
+        by_platform, _ = await content_repo.list_content(db, platform="x")
+        by_range, _ = await content_repo.list_content(
+            db,
+            created_from=datetime(2026, 1, 1, 0, 1),
+            created_to=datetime(2026, 1, 1, 0, 3),
+        )
+        paged, cursor = await content_repo.list_content(db, platform="x", limit=2)
+        rest, end = await content_repo.list_content(
+            db, platform="x", limit=2, cursor=cursor
+        )
+        return by_platform, by_range, paged + rest, end
+
+    by_platform, by_range, paged, end = run_with_session(tmp_path, scenario)
+    assert {c.platform for c in by_platform} == {"x"} and len(by_platform) == 3
+    assert sorted(c.idea_prompt for c in by_range) == [
+        f"idea {n}" for n in (2, 3, 4, 5)
+    ]
+    assert [c.id for c in paged] == [c.id for c in by_platform]
+    assert end is None
+
+
+def test_malformed_cursor_is_rejected():
+    with pytest.raises(ValueError):
+        content_repo.decode_cursor("not-a-cursor")
+
+
+def test_search_is_ranked_filtered_and_follows_edits(tmp_path):
+    async def save(db, platform, idea, text):
+        return await content_repo.create_content(
+            db,
+            ContentSaveRequest(idea_prompt=idea, platform=platform, content_text=text),
+        )
+
+    async def scenario(db):
+        rust = await save(db, "x", "rust tips", "Borrow checker tricks for Rust")
+        await save(db, "linkedin", "hiring", "We use Rust and Python in production")
+        await save(db, "x", "coffee", "Morning coffee thoughts")
+
+        ranked, _ = await content_repo.search_content(db, "rust")
+        on_x, _ = await content_repo.search_content(db, "rust", platform="x")
+        prefix, _ = await content_repo.search_content(db, "borr")
+
+        await content_repo.update_content(
+            db, rust.id, ContentUpdateRequest(content_text="Lifetimes explained")
+        )
+        after_edit, _ = await content_repo.search_content(db, "borrow")
+        await content_repo.delete_content(db, rust.id)
+        after_delete, _ = await content_repo.search_content(db, "rust")
+        return ranked, on_x, prefix, after_edit, after_delete
+
+    ranked, on_x, prefix, after_edit, after_delete = run_with_session(
+        tmp_path, scenario
+    )
+    # Matching both the idea and the text ranks first
+    assert [c.idea_prompt for c, *_ in ranked] == ["rust tips", "hiring"]
+    assert ranked[0][3] <= ranked[1][3]
+    snippet, highlights = ranked[0][1], ranked[0][2]
+    assert [snippet[start:end] for start, end in highlights] == ["rust"]
+    assert [c.idea_prompt for c, *_ in on_x] == ["rust tips"]
+    assert [c.idea_prompt for c, *_ in prefix] == ["rust tips"]
+    assert after_edit == []
+    assert [c.idea_prompt for c, *_ in after_delete] == ["hiring"]
+
+
+def test_search_query_escapes_fts_syntax():
+    assert content_repo.fts_query('rust NEAR "x') == '"rust" "NEAR" """x"*'
+    with pytest.raises(ValueError):
+        content_repo.fts_query("   ")
+
+
+def test_search_snippet_is_plain_text_with_hit_offsets(tmp_path):
+    text = "<script>alert(1)</script> rust <mark>tips</mark>"
+
+    async def scenario(db):
+        await content_repo.create_content(
+            db, ContentSaveRequest(idea_prompt="xss", platform="x", content_text=text)
+        )
+        return await content_repo.search_content(db, "rust")
+
+    [(_, snippet, highlights, _)], _ = run_with_session(tmp_path, scenario)
+    # Saved markup comes back verbatim, as text; hits are offsets, not tags
+    assert snippet == text
+    assert [snippet[start:end] for start, end in highlights] == ["rust"]
+
+
+def test_highlight_offsets_count_utf16_units():
+    snippet, highlights = content_repo.split_snippet(
+        "🚀 Shipping \ue000rust\ue001 today 🎉 \ue000rust\ue001"
+    )
+    assert snippet == "🚀 Shipping rust today 🎉 rust"
+    assert highlights == [(12, 16), (26, 30)]
+    # How a JavaScript client slices it
+    units = snippet.encode("utf-16-le")
+    hits = [units[2 * a : 2 * b].decode("utf-16-le") for a, b in highlights]
+    assert hits == ["rust", "rust"]
+
+
+def test_search_flags_matches_outside_the_rank_window(tmp_path, monkeypatch):
+    monkeypatch.setattr(content_repo, "SEARCH_RANK_WINDOW", 2)
+
+    async def scenario(db):
+        for n in range(4):
+            await content_repo.create_content(
+                db,
+                ContentSaveRequest(
+                    idea_prompt=f"idea {n}", platform="x", content_text="launch day"
+                ),
+            )
+        common = await content_repo.search_content(db, "launch")
+        selective = await content_repo.search_content(db, "idea 1")
+        return common, selective
+
+    (hits, truncated), (_, selective_truncated) = run_with_session(tmp_path, scenario)
+    assert sorted(c.idea_prompt for c, *_ in hits) == ["idea 2", "idea 3"]
+    assert truncated and not selective_truncated
@@ -0,0 +1,62 @@
+"""
+Test file for content.generate_content_stream() - events arrive in completion order.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services import content as content_service
+from app.services.orchestrate import PipelineResult
+from app.services.pipeline.judge import JudgeResult
+
+# Slowest first, so request order != completion order
+DELAYS = {"reddit": 0.05, "linkedin": 0.02, "x": 0.0}
+
+
+async def fake_run_pipeline(
+    user_input, platform, overrides=None, on_stage=None, deadline=None, cache_mode=None
+):
+    await asyncio.sleep(DELAYS[platform])
+    for stage in ["v1", "v2", "v3"]:
+        if on_stage:
+            await on_stage(stage, {"model": "fake", "content": f"{platform} {stage}"})
+    if on_stage:
+        await on_stage("judge", {"model": "fake", "scores": {}, "ranking": []})
+    return PipelineResult(
+        v1=f"{platform} v1",
+        v1_model="fake",
+        v2=f"{platform} v2",
+        v2_model="fake",
+        v3=f"{platform} v3",
+        v3_model="fake",
+        shuffle_map={"A": "v3", "B": "v1", "C": "v2"},
+        judge_result=JudgeResult(ranking=["A"], scores={"A": 90}, model_name="fake"),
+    )
+
+
+async def _collect():
+    stream = content_service.generate_content_stream(
+        idea="idea", platforms=["reddit", "linkedin", "x"]
+    )
+    return [event async for event in stream]
+
+
+def test_stream_emits_results_in_completion_order(monkeypatch):
+    monkeypatch.setattr(content_service, "run_pipeline", fake_run_pipeline)
+
+    events = asyncio.run(_collect())
+
+    results = [e["result"]["platform"] for e in events if e["event"] == "result"]
+    assert results == ["x", "linkedin", "reddit"]
+
+    stages = [(e["platform"], e["stage"]) for e in events if e["event"] == "stage"]
+    assert stages[:4] == [("x", "v1"), ("x", "v2"), ("x", "v3"), ("x", "judge")]
+
+    done = events[-1]
+    assert done["event"] == "done"
+    assert done["success_count"] == 3
+    assert done["total_platforms"] == 3
@@ -0,0 +1,58 @@
+"""
+Test file for database.py - SQLite profile and reader/writer engines.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.core.database import create_async_engines
+
+SETTINGS = {"busy_timeout_ms": 1234, "cache_size_kib": 2048, "read_pool_size": 2}
+
+
+def test_file_sqlite_gets_wal_writer_and_read_only_readers(tmp_path):
+    async def run():
+        writer, reader = create_async_engines(
+            f"sqlite:///{tmp_path / 'db.sqlite'}", SETTINGS
+        )
+        try:
+            async with writer.begin() as conn:
+                await conn.execute(text("CREATE TABLE t (x INTEGER)"))
+                await conn.execute(text("INSERT INTO t VALUES (1)"))
+                journal = (await conn.execute(text("PRAGMA journal_mode"))).scalar()
+                busy = (await conn.execute(text("PRAGMA busy_timeout"))).scalar()
+                cache = (await conn.execute(text("PRAGMA cache_size"))).scalar()
+
+            async with reader.connect() as conn:
+                rows = (await conn.execute(text("SELECT x FROM t"))).scalars().all()
+                with pytest.raises(OperationalError):
+                    await conn.execute(text("INSERT INTO t VALUES (2)"))
+            return writer is reader, journal, busy, cache, rows, writer.pool.size()
+        finally:
+            await writer.dispose()
+            await reader.dispose()
+
+    same, journal, busy, cache, rows, writer_pool = asyncio.run(run())
+    assert same is False
+    assert journal == "wal"
+    assert busy == 1234
+    assert cache == -2048
+    assert rows == [1]
+    assert writer_pool == 1  # Single writer connection
+
+
+def test_in_memory_sqlite_shares_one_engine():
+    async def run():
+        writer, reader = create_async_engines("sqlite://", SETTINGS)
+        await writer.dispose()
+        return writer is reader
+
+    assert asyncio.run(run()) is True
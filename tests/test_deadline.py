@@ -0,0 +1,141 @@
+"""
+Test file for deadline.py - request budgets split across stages and cancellation.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from app.api.routes import _cancel_on_disconnect
+from app.core.exceptions import DeadlineExceededError
+from app.models.provider import ProviderMetrics, ProviderResponse
+from app.utils.deadline import deadline_after, stage_deadline
+from app.utils.resilience import CIRCUIT_BREAKER, generate_with_resilience
+
+
+class SlowProvider:
+    """Provider stub that honors the timeout it is given."""
+
+    def __init__(self, name: str, delay: float):
+        self.name = name
+        self.delay = delay
+        self.timeouts = []
+
+    def get_name(self) -> str:
+        return self.name
+
+    async def generate(self, prompt, model=None, timeout=None, use_cache=True):
+        self.timeouts.append(timeout)
+        await asyncio.wait_for(asyncio.sleep(self.delay), timeout=timeout)
+        return ProviderResponse(
+            content="done",
+            metrics=ProviderMetrics(latency_ms=self.delay * 1000),
+            provider_name=self.name,
+            model_name=self.name,
+        )
+
+
+def test_stage_deadline_splits_remaining_time_by_weight():
+    deadline = deadline_after(80)
+    stages = ["generator", "critic", "improver", "judge"]
+
+    # generator weight 3 of 8 -> 30s of 80s
+    first = stage_deadline(deadline, "generator", stages) - time.monotonic()
+    assert 29 < first <= 30
+    # judge alone gets everything that is left
+    last = stage_deadline(deadline, "judge", stages[3:]) - time.monotonic()
+    assert 79 < last <= 80
+
+    assert stage_deadline(None, "critic", stages[1:]) is None
+
+
+def test_expired_deadline_stops_before_calling_provider():
+    provider = SlowProvider("fake-expired", 0.0)
+
+    with pytest.raises(DeadlineExceededError):
+        stage_deadline(time.monotonic() - 1, "critic", ["critic", "judge"])
+    with pytest.raises(DeadlineExceededError):
+        asyncio.run(
+            generate_with_resilience(
+                [provider], "prompt", hedge=False, deadline=time.monotonic() - 1
+            )
+        )
+    assert provider.timeouts == []
+
+
+def test_deadline_bounds_provider_call_and_skips_fallbacks():
+    slow = SlowProvider("fake-deadline-slow", 5.0)
+    spare = SlowProvider("fake-deadline-spare", 0.0)
+
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceededError):
+        asyncio.run(
+            generate_with_resilience(
+                [slow, spare], "prompt", hedge=False, deadline=deadline_after(0.1)
+            )
+        )
+
+    assert time.monotonic() - start < 1.0
+    assert slow.timeouts[0] <= 0.1
+    # No time left for the fallback, and our deadline is not the provider's fault
+    assert spare.timeouts == []
+    assert CIRCUIT_BREAKER.get_status("fake-deadline-slow")["failure_count"] == 0
+
+
+class DisconnectingRequest:
+    """Stands in for a Starlette Request whose client goes away."""
+
+    def __init__(self, after_polls: int):
+        self.polls = 0
+        self.after_polls = after_polls
+
+    async def is_disconnected(self) -> bool:
+        self.polls += 1
+        return self.polls >= self.after_polls
+
+
+def test_client_disconnect_cancels_generation(monkeypatch):
+    from fastapi import HTTPException
+
+    from app.api import routes
+
+    monkeypatch.setattr(routes, "DISCONNECT_POLL_INTERVAL", 0.01)
+    cancelled = []
+
+    async def work():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def run():
+        await _cancel_on_disconnect(DisconnectingRequest(after_polls=2), work())
+
+    with pytest.raises(HTTPException):
+        asyncio.run(run())
+    assert cancelled == [True]
+
+
+def test_expired_request_deadline_is_a_504(monkeypatch):
+    from app.services import content as content_service
+
+    async def slow_pipeline(user_input, platform, deadline=None, **kwargs):
+        await asyncio.sleep(max(0.0, deadline - time.monotonic()))
+        stage_deadline(deadline, "judge", ["judge"])  # Out of time
+
+    monkeypatch.setattr(content_service, "run_pipeline", slow_pipeline)
+
+    with pytest.raises(DeadlineExceededError) as error:
+        asyncio.run(
+            content_service.generate_content(
+                "late idea", ["x", "linkedin"], deadline=deadline_after(0.01)
+            )
+        )
+    assert error.value.status_code == 504
@@ -0,0 +1,79 @@
+"""
+Test file for dedupe.py - near-duplicate drafts short-circuit the pipeline.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from app.services import content as content_service
+from app.services import orchestrate
+from app.utils.dedupe import DraftDeduper, text_fingerprint
+
+POST = "Simple code beats clever code.\n\nEvery single time, in my experience."
+
+
+def test_only_trimmed_repeats_are_identical():
+    deduper = DraftDeduper(similarity_threshold=0.97)
+    assert text_fingerprint(POST) == text_fingerprint(f"  {POST}\n")
+    assert deduper.identical(POST, f"  {POST}\n")
+    # Paragraph breaks and capitalization are edits, not noise
+    assert not deduper.identical(POST, POST.replace("\n\n", " "))
+    assert not deduper.identical(POST, POST.lower())
+    assert not DraftDeduper(enabled=False).identical(POST, POST)
+
+
+def test_near_identical_drafts_are_the_same():
+    deduper = DraftDeduper(similarity_threshold=0.97)
+    assert deduper.same(POST, f"  {POST}  ")
+    assert deduper.same(POST, POST.replace("single ", "singel "))  # One letter off
+    assert not deduper.same(POST, "Clever code wins. Fight me.")
+    assert not DraftDeduper(enabled=False).same(POST, POST)
+
+
+def test_unique_keeps_the_earliest_of_each_draft():
+    deduper = DraftDeduper()
+    kept, duplicates = deduper.unique([("v1", POST), ("v2", "Other"), ("v3", POST)])
+    assert [version for version, _ in kept] == ["v1", "v2"]
+    assert duplicates == {"v3": "v1"}
+
+
+@pytest.mark.parametrize(
+    "fake_stages", [{"v1": POST, "v2": POST + "\n"}], indirect=True
+)
+def test_unchanged_critic_skips_improver_and_judge(fake_stages):
+    result = asyncio.run(content_service.generate_for_platform("idea", "linkedin"))
+    assert fake_stages.calls == ["generator", "critic"]
+    assert result.content == POST and result.short_circuit == "critic_unchanged"
+    assert result.duplicates == {"v2": "v1"}
+    assert [d.step for d in result.drafts] == ["Generator (v1)", "Critic (v2)"]
+    assert orchestrate.DRAFT_DEDUPER.stats["critic_unchanged"] == 1
+
+
+# The improver went back to v1
+@pytest.mark.parametrize("fake_stages", [{"v1": POST, "v3": POST}], indirect=True)
+def test_duplicate_drafts_are_judged_once(fake_stages):
+    result = asyncio.run(orchestrate.run_pipeline("idea", "linkedin"))
+    assert fake_stages.calls == ["generator", "critic", "improver", "judge"]
+    assert fake_stages.judged == [["A", "B"]]
+    assert result.duplicates == {"v3": "v1"} and result.short_circuit is None
+    assert sorted(result.shuffle_map.values()) == ["v1", "v2"]
+
+
+# The generator made a typo; the critic fixes just that
+WITH_TYPO = POST.replace("single ", "singel ")
+
+
+@pytest.mark.parametrize("fake_stages", [{"v1": WITH_TYPO, "v2": POST}], indirect=True)
+def test_minor_critic_edit_ships_v2(fake_stages):
+    result = asyncio.run(orchestrate.run_pipeline("idea", "linkedin"))
+    assert fake_stages.calls == ["generator", "critic"]
+    assert result.v2 == POST
+    assert orchestrate._winner_version(result) == "v2"
+    assert result.short_circuit == "critic_minor_edit" and result.duplicates == {}
+    assert orchestrate.DRAFT_DEDUPER.stats["critic_minor_edit"] == 1
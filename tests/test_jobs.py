@@ -0,0 +1,136 @@
+"""
+Test file for jobs.py - durable job queue with leases, retries and events.
+"""
+
+import asyncio
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base
+from app.models.jobs import GenerationJob, JobStatus
+from app.models.response_models import PlatformResult
+from app.models.schemas import ContentGenerateRequest
+from app.repositories import job_repo
+from app.services import content as content_service
+from app.services.jobs import JobQueue
+
+
+@pytest.fixture
+def session_factory():
+    """Fresh in-memory database shared across threads."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)
+
+
+def test_lease_is_exclusive_until_it_expires(session_factory):
+    db = session_factory()
+    job = job_repo.create_job(db, "{}", max_attempts=3)
+
+    assert job_repo.claim_next_job(db, "w1", lease_s=60).id == job.id
+    assert job_repo.claim_next_job(db, "w2", lease_s=60) is None
+
+    # w1 died: once the visibility timeout passes, w2 takes over
+    db.query(GenerationJob).update(
+        {GenerationJob.locked_until: datetime.now(timezone.utc) - timedelta(seconds=1)}
+    )
+    db.commit()
+    reclaimed = job_repo.claim_next_job(db, "w2", lease_s=60)
+    assert reclaimed.worker_id == "w2" and reclaimed.attempts == 2
+
+    # The old owner can no longer renew or finish it
+    assert not job_repo.extend_lease(db, job.id, "w1", 60)
+    assert not job_repo.finish_job(db, job.id, "w1", JobStatus.COMPLETED)
+
+
+def _platform_result(platform, success):
+    return PlatformResult(
+        platform=platform,
+        success=success,
+        content="post" if success else None,
+        error=None if success else "provider down",
+    )
+
+
+def test_failed_platforms_are_retried_and_successes_kept(session_factory, monkeypatch):
+    calls = []
+
+    async def fake_stream(idea, platforms, **kwargs):
+        calls.append(list(platforms))
+        for platform in platforms:
+            # reddit fails on the first attempt only
+            success = platform != "reddit" or len(calls) > 1
+            result = _platform_result(platform, success)
+            yield {"event": "result", "result": result.model_dump()}
+        yield {"event": "done"}
+
+    monkeypatch.setattr(content_service, "generate_content_stream", fake_stream)
+    queue = JobQueue(
+        workers=1, poll_interval=0.01, retry_delay=0, session_factory=session_factory
+    )
+
+    async def run():
+        job = await queue.enqueue(
+            ContentGenerateRequest(idea_prompt="idea", platforms=["x", "reddit"])
+        )
+        # Subscribe before any worker can pick the job up
+        subscription = queue.subscribe(job["id"])
+        events = [await subscription.__anext__()]
+        await queue.start()
+        events += [event async for event in subscription]
+        await queue.stop()
+        return events, await queue.get(job["id"])
+
+    events, job = asyncio.run(asyncio.wait_for(run(), timeout=5))
+
+    assert calls == [["x", "reddit"], ["reddit"]]
+    assert job["status"] == JobStatus.COMPLETED
+    assert job["attempts"] == 2
+    assert [r["platform"] for r in job["result"]["results"]] == ["x", "reddit"]
+    assert job["result"]["success_count"] == 2
+
+    statuses = [e["status"] for e in events if e["event"] == "status"]
+    assert statuses[-1] == JobStatus.COMPLETED
+    assert JobStatus.QUEUED in statuses[1:]  # the retry was announced
+
+
+def test_queued_job_survives_restart(session_factory, monkeypatch):
+    async def fake_stream(idea, platforms, **kwargs):
+        for platform in platforms:
+            result = _platform_result(platform, True)
+            yield {"event": "result", "result": result.model_dump()}
+
+    monkeypatch.setattr(content_service, "generate_content_stream", fake_stream)
+
+    async def enqueue_only():
+        # No workers running: the job just sits in the table
+        producer = JobQueue(session_factory=session_factory)
+        return await producer.enqueue(
+            ContentGenerateRequest(idea_prompt="idea", platforms=["x"])
+        )
+
+    job = asyncio.run(enqueue_only())
+
+    async def new_process():
+        consumer = JobQueue(
+            workers=1, poll_interval=0.01, session_factory=session_factory
+        )
+        await consumer.start()
+        while (await consumer.get(job["id"]))["status"] != JobStatus.COMPLETED:
+            await asyncio.sleep(0.01)
+        await consumer.stop()
+
+    asyncio.run(asyncio.wait_for(new_process(), timeout=5))
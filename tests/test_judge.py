@@ -0,0 +1,24 @@
+"""
+Test file for judge.py - parsing the judge's JSON verdict.
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.pipeline.judge import parse_judge_response
+
+
+def test_judge_response_with_fewer_labels():
+    result = parse_judge_response(
+        '{"A": 60, "B": 90, "ranking": ["B", "A", "C"]}', "AB"
+    )
+    assert result.scores == {"A": 60, "B": 90}
+    assert result.ranking == ["B", "A"]
+
+
+def test_unparseable_judge_response_keeps_the_raw_text():
+    result = parse_judge_response("I liked B best.")
+    assert result.ranking == [] and result.raw_response == "I liked B best."
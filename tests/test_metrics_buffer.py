@@ -0,0 +1,92 @@
+"""
+Test file for metrics_repo.py - write-behind MetricsBuffer batching.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.repositories.metrics_repo import MetricsBuffer
+
+
+class Recorder:
+    """write_batch stand-in that records every batch."""
+
+    def __init__(self, delay=0.0):
+        self.batches = []
+        self.delay = delay
+
+    async def __call__(self, batch):
+        await asyncio.sleep(self.delay)
+        self.batches.append(list(batch))
+
+
+def test_full_batches_are_written_in_one_call():
+    async def run():
+        writer = Recorder()
+        buffer = MetricsBuffer(writer, batch_size=3, flush_interval=60)
+        for n in range(7):
+            assert await buffer.put(n)
+        await asyncio.sleep(0.01)
+        written = list(writer.batches)
+        await buffer.stop()
+        return written, writer.batches, buffer
+
+    before_stop, batches, buffer = asyncio.run(run())
+    assert before_stop == [[0, 1, 2], [3, 4, 5]]  # The 7th waits for the interval
+    assert batches == [[0, 1, 2], [3, 4, 5], [6]]  # stop() flushes it
+    assert buffer.stats["written"] == 7 and buffer.stats["batches"] == 3
+
+
+def test_partial_batch_is_flushed_after_the_interval():
+    async def run():
+        writer = Recorder()
+        buffer = MetricsBuffer(writer, batch_size=100, flush_interval=0.05)
+        await buffer.put("a")
+        await buffer.put("b")
+        await asyncio.sleep(0.15)
+        batches = list(writer.batches)
+        await buffer.stop()
+        return batches
+
+    assert asyncio.run(run()) == [["a", "b"]]
+
+
+def test_full_buffer_delays_then_drops():
+    async def run():
+        writer = Recorder(delay=0.2)  # Slow database
+        buffer = MetricsBuffer(
+            writer, max_size=2, batch_size=1, flush_interval=0, enqueue_timeout=0.01
+        )
+        results = [await buffer.put(n) for n in range(5)]
+        await buffer.stop()
+        return results, writer.batches, buffer.stats
+
+    results, batches, stats = asyncio.run(run())
+    assert results.count(False) == stats["dropped"] > 0
+    assert stats["delayed"] >= stats["dropped"]
+    assert stats["enqueued"] == stats["written"] == len(batches)
+    assert stats["enqueued"] + stats["dropped"] == 5
+
+
+def test_failed_batch_is_counted_and_flusher_keeps_going():
+    calls = []
+
+    async def flaky(batch):
+        calls.append(batch)
+        if len(calls) == 1:
+            raise RuntimeError("database is locked")
+
+    async def run():
+        buffer = MetricsBuffer(flaky, batch_size=2, flush_interval=60)
+        for n in range(4):
+            await buffer.put(n)
+        await buffer.stop()
+        return buffer.to_dict()
+
+    stats = asyncio.run(run())
+    assert calls == [[0, 1], [2, 3]]
+    assert stats["failed"] == 2 and stats["written"] == 2 and stats["pending"] == 0
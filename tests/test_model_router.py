@@ -0,0 +1,74 @@
+"""
+Test file for model_router.py - ordered fallback chains across all providers.
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from app.providers.registry import ProviderRegistry
+from app.services import model_router
+from app.services.model_router import ModelRouter
+from app.utils.resilience import CircuitBreaker, ProviderHealth
+
+
+@pytest.fixture
+def router_state(monkeypatch):
+    """Fresh registry/breaker/health with dummy keys for all providers."""
+    for key in [
+        "GEMINI_API_KEY",
+        "OPENAI_API_KEY",
+        "ANTHROPIC_API_KEY",
+        "GROK_API_KEY",
+    ]:
+        monkeypatch.setenv(key, "test-key")
+    breaker = CircuitBreaker(min_calls=1)
+    health = ProviderHealth()
+    monkeypatch.setattr(model_router, "PROVIDER_REGISTRY", ProviderRegistry())
+    monkeypatch.setattr(model_router, "CIRCUIT_BREAKER", breaker)
+    monkeypatch.setattr(model_router, "PROVIDER_HEALTH", health)
+    return breaker, health
+
+
+def _names(chain):
+    return [(provider.get_name(), model) for provider, model in chain]
+
+
+def test_config_yaml_stage_preference_leads_chain(router_state):
+    chain = ModelRouter.route({}, "critic")
+
+    # config.yaml: models.pipeline.critic = openai
+    assert _names(chain)[0] == ("openai", None)
+    assert {name for name, _ in _names(chain)} == {
+        "openai",
+        "gemini",
+        "anthropic",
+        "xai",
+    }
+
+
+def test_request_override_uses_specific_model(router_state):
+    config = {"models": {"pipeline": {"judge": "claude-haiku-4-5"}}}
+
+    chain = ModelRouter.route(config, "judge")
+
+    assert _names(chain)[0] == ("anthropic", "claude-haiku-4-5")
+
+
+def test_degraded_providers_fall_to_the_back(router_state):
+    breaker, health = router_state
+    breaker.record_failure("gemini", "gemini-3-flash-preview")
+    breaker.record_failure("openai", "gpt-5-mini")
+    health.record("xai", True, 500)
+    health.record("anthropic", True, 2000)
+
+    chain = _names(ModelRouter.route({}, "generator"))
+
+    # Healthy providers first (faster first), broken preferred model after them
+    assert [name for name, _ in chain[:2]] == ["xai", "anthropic"]
+    assert chain[2] == ("gemini", None)
+    assert chain[3][0] == "openai"
@@ -0,0 +1,68 @@
+"""
+Test file for orchestrate.py - fast, balanced and full pipeline profiles.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from pydantic import ValidationError
+
+from app.models.schemas import PolicyOverride
+from app.services import content as content_service
+from app.services import orchestrate
+
+
+def generate(overrides):
+    return asyncio.run(
+        content_service.generate_for_platform("idea", "linkedin", overrides=overrides)
+    )
+
+
+def test_fast_profile_runs_only_the_generator(fake_stages):
+    result = generate({"pipeline_profile": "fast"})
+    assert fake_stages.calls == ["generator"]
+    assert result.content == "v1 text" and result.pipeline_profile == "fast"
+    assert [d.step for d in result.drafts] == ["Generator (v1)"]
+    assert result.model_used == "Pipeline (Generator)"
+
+
+def test_balanced_profile_takes_the_critic_draft_without_judging(fake_stages):
+    result = generate(PolicyOverride(pipeline_profile="balanced"))
+    assert fake_stages.calls == ["generator", "critic"]
+    assert result.content == "v2 text"
+    assert [d.step for d in result.drafts] == ["Generator (v1)", "Critic (v2)"]
+
+    # A critic draft that breaks the platform limits loses to v1
+    fake_stages.calls.clear()
+    fake_stages.rejected.add("v2 text")
+    result = generate({"pipeline_profile": "balanced", "hashtags": 1})
+    assert fake_stages.calls == ["generator", "critic"]
+    assert result.content == "v1 text"
+
+
+def test_full_profile_is_the_default(fake_stages):
+    result = generate(None)
+    assert fake_stages.calls == ["generator", "critic", "improver", "judge"]
+    assert result.pipeline_profile == "full" and len(result.drafts) == 4
+
+
+def test_profile_per_platform_from_config(tmp_path, fake_stages):
+    config = tmp_path / "config.yaml"
+    config.write_text(
+        "defaults:\n  pipeline_profile: full\n"
+        "platforms:\n  x:\n    pipeline_profile: fast\n"
+    )
+    result = asyncio.run(orchestrate.run_pipeline("idea", "x", str(config)))
+    assert fake_stages.calls == ["generator"]
+    assert result.skipped_stages == ["critic", "improver", "judge"]
+
+
+def test_unknown_profile_is_rejected():
+    with pytest.raises(ValidationError):
+        PolicyOverride(pipeline_profile="turbo")
+    assert PolicyOverride(pipelineProfile="fast").pipeline_profile == "fast"
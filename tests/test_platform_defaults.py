@@ -0,0 +1,93 @@
+"""
+Test file for platform_defaults.py - the precomputed platform registry.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from app.core import platform_defaults
+from app.core.platform_defaults import (
+    FALLBACK_POLICY,
+    PLATFORM_REGISTRY,
+    PlatformRegistry,
+    get_platform_policy,
+)
+from app.utils.validation import OutputValidator
+
+
+class FakeEntryPoint:
+    def __init__(self, name, provided):
+        self.name = name
+        self.provided = provided
+
+    def load(self):
+        if isinstance(self.provided, Exception):
+            raise self.provided
+        return self.provided
+
+
+def registry_with(monkeypatch, plugins=(), platform_limits=None):
+    monkeypatch.setattr(platform_defaults, "entry_points", lambda group: list(plugins))
+    monkeypatch.setattr(
+        platform_defaults,
+        "load_config",
+        lambda: {"platform_limits": platform_limits or {}},
+    )
+    return PlatformRegistry.from_config()
+
+
+def test_plugins_and_config_add_and_override_platforms(monkeypatch):
+    registry = registry_with(
+        monkeypatch,
+        plugins=[
+            FakeEntryPoint("threads", {"threads": {"char_limit": 500}}),
+            FakeEntryPoint("broken", ImportError("missing dependency")),
+            FakeEntryPoint("lazy", lambda: {"Bluesky": {"char_limit": 300}}),
+        ],
+        platform_limits={
+            "threads": {"primary_model": "openai"},
+            "x": {"char_limit": 25000},
+        },
+    )
+    assert registry.policy("threads") == {
+        "char_limit": 500,
+        "primary_model": "openai",
+        "counting": "characters",
+    }
+    assert registry.get("BLUESKY").char_limit == 300
+    # Config overrides only the fields it sets
+    assert registry.policy("x")["char_limit"] == 25000
+    assert registry.get("x").counting == "x"
+    assert registry.policy("myspace") is FALLBACK_POLICY
+
+
+def test_unknown_counting_rule_is_rejected(monkeypatch):
+    with pytest.raises(ValueError, match="counting rule"):
+        registry_with(monkeypatch, platform_limits={"x": {"counting": "bytes"}})
+
+
+def test_policies_are_frozen_and_precomputed():
+    policy = get_platform_policy("instagram")
+    assert policy is get_platform_policy("Instagram")
+    assert policy["max_hashtags"] == 30
+    with pytest.raises(TypeError):
+        policy["char_limit"] = 1
+    assert json.loads(PLATFORM_REGISTRY.response_bytes) == {
+        name: dict(PLATFORM_REGISTRY.policy(name)) for name in PLATFORM_REGISTRY.names()
+    }
+
+
+def test_x_counts_links_as_fixed_length():
+    link = "https://example.com/" + "a" * 300
+    post = f"Read this: {link}"
+    assert PLATFORM_REGISTRY.count("x", post) == len("Read this: ") + 23
+    assert PLATFORM_REGISTRY.count("linkedin", post) == len(post)
+    assert OutputValidator.validate(
+        post, "x", {"constraints": {"char_limit": 280}}
+    ).passed
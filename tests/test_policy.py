@@ -0,0 +1,149 @@
+"""
+Test file for policy.py - immutable config snapshots and hot reload.
+"""
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from app.core.compiled_policy import PolicyCache
+from app.core.policy import (
+    ConfigWatcher,
+    get_config_snapshot,
+    get_merged_config,
+    load_config,
+    reload_config,
+)
+from app.services import orchestrate
+from app.services.model_router import ModelRouter
+from app.utils.result_cache import stage_uses_cache
+
+CONFIG = """
+defaults:
+  constraints:
+    target_chars: {target}
+    hashtags: 3
+"""
+
+
+def write_config(path, target, mtime):
+    path.write_text(CONFIG.format(target=target))
+    os.utime(path, (mtime, mtime))  # Distinct mtimes even on coarse clocks
+
+
+def test_merge_does_not_touch_the_snapshot(tmp_path):
+    path = tmp_path / "config.yaml"
+    write_config(path, 5000, 1000)
+
+    merged = get_merged_config("x", {"target_chars": 100}, str(path))
+    assert merged["constraints"]["target_chars"] == 100
+    merged = get_merged_config("x", None, str(path))
+    assert merged["constraints"] == {
+        "target_chars": 280,  # Capped at the X hard limit
+        "hashtags": 3,
+        "char_limit": 280,
+    }
+
+    # Hard limits used to be written into the cached defaults
+    constraints = load_config(str(path))["defaults"]["constraints"]
+    assert dict(constraints) == {"target_chars": 5000, "hashtags": 3}
+    with pytest.raises(TypeError):
+        constraints["target_chars"] = 1
+
+
+def test_reload_swaps_snapshot_and_keeps_old_one_intact(tmp_path):
+    path = tmp_path / "config.yaml"
+    write_config(path, 400, 1000)
+    cache = PolicyCache()
+    before = cache.compile("linkedin", config_path=str(path))
+    old = get_config_snapshot(str(path))
+
+    assert reload_config(str(path)) is None  # mtime unchanged
+    os.utime(path, (1001, 1001))
+    assert reload_config(str(path)) is None  # Touched, same content
+
+    write_config(path, 600, 1002)
+    new = reload_config(str(path))
+    assert new is not None and new.version != old.version
+    assert get_config_snapshot(str(path)) is new
+
+    # In-flight holders keep their version; new requests get the new one
+    assert old.data["defaults"]["constraints"]["target_chars"] == 400
+    assert before["constraints"]["target_chars"] == 400
+    after = cache.compile("linkedin", config_path=str(path))
+    assert after["constraints"]["target_chars"] == 600
+    assert (before.version, after.version) == (old.version, new.version)
+
+
+ROUTED_CONFIG = """
+defaults: {{}}
+models:
+  pipeline:
+    judge: {judge}
+provider_cache:
+  fresh_stages: [{fresh}]
+"""
+
+
+def test_running_pipeline_keeps_routing_and_cache_policy(
+    tmp_path, monkeypatch, fake_stages
+):
+    path = tmp_path / "config.yaml"
+    path.write_text(ROUTED_CONFIG.format(judge="openai", fresh="judge"))
+    os.utime(path, (1000, 1000))
+    seen = {}
+
+    async def critique_then_reload(*args, **kwargs):
+        path.write_text(ROUTED_CONFIG.format(judge="xai", fresh=""))
+        os.utime(path, (1001, 1001))
+        assert reload_config(str(path)) is not None
+        return await fake_stages.critique(*args, **kwargs)
+
+    async def judge(texts, platform, config, deadline=None, use_cache=True):
+        seen["model"] = ModelRouter.get_stage_model(config, "judge")
+        seen["use_cache"] = stage_uses_cache(config, "judge")
+        return await fake_stages.judge(texts, platform, config)
+
+    monkeypatch.setattr(orchestrate, "critique", critique_then_reload)
+    monkeypatch.setattr(orchestrate, "judge", judge)
+    asyncio.run(orchestrate.run_pipeline("idea", "linkedin", str(path)))
+
+    # Reloaded mid-run: the later stages still see the run's snapshot
+    assert seen == {"model": "openai", "use_cache": False}
+    reloaded = PolicyCache().compile("linkedin", config_path=str(path))
+    assert ModelRouter.get_stage_model(reloaded, "judge") == "xai"
+    assert stage_uses_cache(reloaded, "judge")
+
+
+def test_invalid_yaml_keeps_current_version(tmp_path):
+    path = tmp_path / "config.yaml"
+    write_config(path, 400, 1000)
+    current = get_config_snapshot(str(path))
+
+    path.write_text("defaults: [unclosed")
+    os.utime(path, (1001, 1001))
+    assert reload_config(str(path)) is None
+    assert get_config_snapshot(str(path)) is current
+
+
+def test_watcher_reloads_in_background(tmp_path):
+    path = tmp_path / "config.yaml"
+    write_config(path, 400, 1000)
+    get_config_snapshot(str(path))
+    watcher = ConfigWatcher(interval=0.01, config_path=str(path))
+
+    async def run():
+        await watcher.start()
+        write_config(path, 700, 1001)
+        await asyncio.sleep(0.1)
+        await watcher.stop()
+
+    asyncio.run(run())
+    assert watcher.stats["reloads"] == 1
+    assert load_config(str(path))["defaults"]["constraints"]["target_chars"] == 700
@@ -0,0 +1,48 @@
+"""
+Test file for registry.py - pooled provider clients are shared and closed.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.providers.registry import ProviderRegistry
+
+
+def test_registry_reuses_instances(monkeypatch):
+    """Every lookup of the same provider returns the same client."""
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    registry = ProviderRegistry()
+
+    first = registry.get("openai")
+    second = registry.get("OpenAI")
+
+    assert first is second
+    assert registry.active() == ["openai"]
+
+
+def test_registry_unknown_provider_is_optional():
+    """Unknown providers raise on get() and return None on get_optional()."""
+    registry = ProviderRegistry()
+
+    assert registry.get_optional("does-not-exist") is None
+    try:
+        registry.get("does-not-exist")
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+
+
+def test_registry_shutdown_clears_pool(monkeypatch):
+    """Shutdown closes clients and the next lookup builds a fresh one."""
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    registry = ProviderRegistry()
+    first = registry.get("openai")
+
+    asyncio.run(registry.shutdown())
+
+    assert registry.active() == []
+    assert registry.get("openai") is not first
@@ -0,0 +1,62 @@
+"""
+Test file for AIProvider.generate_stream() - deltas, final record and TTFT.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from typing import Tuple
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.providers.ai_provider import AIProvider
+
+
+class FakeProvider(AIProvider):
+    """Provider that streams fixed deltas without any network."""
+
+    provider_name = "fake"
+    default_model = "fake-1"
+
+    async def _generate_raw(self, prompt: str, model: str) -> Tuple[str, int, int]:
+        return "whole text", 3, 2
+
+    async def _stream_raw(self, prompt, model, usage):
+        for delta in ["Hello", ", ", "world"]:
+            await asyncio.sleep(0.01)
+            yield delta
+        usage["input_tokens"] = 5
+        usage["output_tokens"] = 3
+
+
+class NonStreamingProvider(FakeProvider):
+    """Provider that relies on the default (non-native) stream path."""
+
+    _stream_raw = AIProvider._stream_raw
+
+
+async def _collect(provider):
+    return [chunk async for chunk in provider.generate_stream("prompt")]
+
+
+def test_stream_yields_deltas_then_final_record():
+    chunks = asyncio.run(_collect(FakeProvider()))
+
+    assert [c.delta for c in chunks[:-1]] == ["Hello", ", ", "world"]
+    assert not any(c.is_final for c in chunks[:-1])
+
+    final = chunks[-1].response
+    assert final.content == "Hello, world"
+    assert final.model_name == "fake-1"
+    assert final.metrics.input_tokens == 5
+    assert final.metrics.output_tokens == 3
+    assert 0 < final.metrics.time_to_first_token_ms <= final.metrics.latency_ms
+
+
+def test_stream_falls_back_to_single_chunk():
+    chunks = asyncio.run(_collect(NonStreamingProvider()))
+
+    assert [c.delta for c in chunks[:-1]] == ["whole text"]
+    assert chunks[-1].response.content == "whole text"
+    assert chunks[-1].response.metrics.output_tokens == 2
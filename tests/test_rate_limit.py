@@ -0,0 +1,95 @@
+"""
+Test file for rate_limit.py - calls wait for RPM/TPM capacity and reconcile.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.utils.rate_limit import RateLimiter
+
+LIMITS = {
+    "openai": {
+        "rpm": 600,  # 10 requests/second refill, burst of 600
+        "tpm": 6000,  # 100 tokens/second refill
+        "estimated_output_tokens": 0,
+        "models": {"tiny": {"rpm": 2, "tpm": 6000}},
+    }
+}
+
+
+def test_unconfigured_provider_is_not_limited():
+    limiter = RateLimiter(LIMITS)
+
+    async def run():
+        for _ in range(50):
+            reservation = await limiter.acquire("gemini", "any", "prompt")
+            assert reservation.waited_s == 0
+
+    asyncio.run(run())
+    assert limiter.stats == {}
+
+
+def test_model_budget_overrides_provider_budget():
+    limiter = RateLimiter(LIMITS)
+
+    async def run():
+        await limiter.acquire("openai", "tiny", "x")
+        await limiter.acquire("openai", "tiny", "x")
+        # Third request exceeds rpm=2 burst: must wait ~30s, so time out fast
+        await asyncio.wait_for(limiter.acquire("openai", "tiny", "x"), timeout=0.1)
+
+    try:
+        asyncio.run(run())
+        assert False, "expected the third call to wait for capacity"
+    except asyncio.TimeoutError:
+        pass
+
+
+def test_tokens_wait_for_capacity_and_reconcile():
+    limiter = RateLimiter(LIMITS)
+    prompt = "x" * 4 * 5990  # ~5990 estimated tokens, nearly the whole bucket
+
+    async def run():
+        first = await limiter.acquire("openai", "gpt-5-mini", prompt)
+        # Real usage was tiny: refund almost all the reserved tokens
+        limiter.reconcile(first, 10)
+
+        start = time.monotonic()
+        second = await limiter.acquire("openai", "gpt-5-mini", prompt)
+        assert time.monotonic() - start < 0.5
+        assert second.waited_s < 0.5
+
+        # Without a refund the next call has to wait for the refill
+        start = time.monotonic()
+        await limiter.acquire("openai", "gpt-5-mini", "x" * 4 * 50)
+        assert time.monotonic() - start >= 0.3
+
+    asyncio.run(run())
+    assert limiter.stats["openai/gpt-5-mini"]["delayed"] >= 1
+
+
+def test_concurrency_cap_per_provider():
+    limiter = RateLimiter({"openai": {"max_concurrency": 1}})
+    order = []
+
+    async def call(name):
+        async with limiter.slot("openai"):
+            order.append(f"{name} start")
+            await asyncio.sleep(0.01)
+            order.append(f"{name} end")
+
+    async def run():
+        await asyncio.gather(call("a"), call("b"))
+        # Uncapped providers never wait
+        async with limiter.slot("gemini"):
+            async with limiter.slot("gemini"):
+                pass
+
+    asyncio.run(run())
+    assert order == ["a start", "a end", "b start", "b end"]
+    assert limiter.in_flight["openai"] == 0
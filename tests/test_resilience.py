@@ -0,0 +1,197 @@
+"""
+Test file for resilience.py - fallback, hedging, retries and circuit breaker.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.exceptions import AIProviderError
+from app.models.provider import ProviderMetrics, ProviderResponse
+from app.utils import resilience
+from app.utils.resilience import (
+    CIRCUIT_BREAKER,
+    HEDGE_STATS,
+    CircuitBreaker,
+    CircuitState,
+    ErrorCode,
+    RetryPolicy,
+    classify_error,
+    generate_with_resilience,
+)
+
+
+class FakeProvider:
+    """Provider stub with a fixed delay and optional failure."""
+
+    def __init__(self, name: str, delay: float, fail: bool = False):
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.cancelled = False
+
+    def get_name(self) -> str:
+        return self.name
+
+    async def generate(self, prompt, model=None, timeout=None, use_cache=True):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.fail:
+            raise RuntimeError(f"{self.name} failed")
+        return ProviderResponse(
+            content=f"from {self.name}",
+            metrics=ProviderMetrics(latency_ms=self.delay * 1000),
+            provider_name=self.name,
+            model_name=model or self.name,
+        )
+
+
+def _run(providers, hedge):
+    return asyncio.run(generate_with_resilience(providers, "prompt", hedge=hedge))
+
+
+def test_fallback_after_primary_failure():
+    primary = FakeProvider("fake-a", 0.0, fail=True)
+    fallback = FakeProvider("fake-b", 0.0)
+
+    response = _run((primary, fallback), hedge=False)
+
+    assert response.provider_name == "fake-b"
+    CIRCUIT_BREAKER.reset("fake-a")
+
+
+def test_hedge_fallback_wins_and_primary_is_cancelled(monkeypatch):
+    monkeypatch.setattr(resilience, "hedge_delay", lambda name: 0.02)
+    before = HEDGE_STATS.to_dict()
+    primary = FakeProvider("fake-slow", 5.0)
+    fallback = FakeProvider("fake-fast", 0.01)
+
+    response = _run((primary, fallback), hedge=True)
+
+    assert response.provider_name == "fake-fast"
+    assert primary.cancelled
+    after = HEDGE_STATS.to_dict()
+    assert after["hedged"] == before["hedged"] + 1
+    assert after["hedge_wins"] == before["hedge_wins"] + 1
+    # A cancelled hedge loser is not a provider failure
+    assert CIRCUIT_BREAKER.get_status("fake-slow")["failure_count"] == 0
+
+
+def test_no_hedge_when_primary_is_fast(monkeypatch):
+    monkeypatch.setattr(resilience, "hedge_delay", lambda name: 1.0)
+    primary = FakeProvider("fake-quick", 0.0)
+    fallback = FakeProvider("fake-spare", 0.0)
+
+    response = _run((primary, fallback), hedge=True)
+
+    assert response.provider_name == "fake-quick"
+    assert fallback.calls == 0
+
+
+def _status_error(status: int, headers=None):
+    """Build an OpenAI SDK status error without any network."""
+    import openai
+
+    response = SimpleNamespace(status_code=status, headers=headers or {}, request=None)
+    error_class = {
+        429: openai.RateLimitError,
+        401: openai.AuthenticationError,
+        500: openai.InternalServerError,
+    }[status]
+    return error_class("error", response=response, body=None)
+
+
+def test_classify_error_uses_exception_types():
+    assert classify_error(_status_error(429)) == ErrorCode.RATE_LIMIT
+    assert classify_error(_status_error(401)) == ErrorCode.INVALID_API_KEY
+    assert classify_error(_status_error(500)) == ErrorCode.PROVIDER_ERROR
+    assert classify_error(TimeoutError("slow")) == ErrorCode.TIMEOUT
+
+    # Wrapped provider errors are classified by their cause
+    try:
+        raise AIProviderError("Generation failed") from _status_error(429)
+    except AIProviderError as wrapped:
+        assert classify_error(wrapped) == ErrorCode.RATE_LIMIT
+
+
+def test_retry_policy_honors_retry_after_and_deadline():
+    policy = RetryPolicy(max_attempts=3, base_delay=0.01)
+    limited = _status_error(429, headers={"retry-after": "2"})
+
+    assert policy.next_delay(limited, attempt=1) == 2.0
+    # Waiting 2s would pass the deadline: give up instead
+    assert policy.next_delay(limited, 1, deadline=time.monotonic() + 1) is None
+    # Auth errors never retry, and attempts are capped
+    assert policy.next_delay(_status_error(401), attempt=1) is None
+    assert policy.next_delay(_status_error(500), attempt=3) is None
+
+
+def test_retry_policy_retries_transient_errors():
+    policy = RetryPolicy(max_attempts=3, base_delay=0.01)
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise _status_error(500)
+        return "ok"
+
+    assert asyncio.run(policy.call(flaky)) == "ok"
+    assert len(attempts) == 3
+
+
+def test_breaker_opens_on_error_rate_per_model():
+    breaker = CircuitBreaker(min_calls=4, error_rate_threshold=0.5, timeout=60)
+
+    for ok in [True, False, True, False]:
+        if ok:
+            breaker.record_success("openai", "gpt-5-mini", 100)
+        else:
+            breaker.record_failure("openai", "gpt-5-mini", 100)
+
+    assert not breaker.is_available("openai", "gpt-5-mini")
+    # Other models of the same provider are unaffected
+    assert breaker.is_available("openai", "gpt-5")
+    status = breaker.get_status("openai/gpt-5-mini")
+    assert status["state"] == CircuitState.OPEN
+    assert status["window"]["error_rate"] == 0.5
+
+
+def test_breaker_half_open_admits_limited_probes():
+    breaker = CircuitBreaker(
+        min_calls=1, timeout=0, half_open_max_calls=1, half_open_successes=2
+    )
+    breaker.record_failure("gemini", "flash")
+
+    # Open period is over: one probe at a time
+    assert breaker.allow_request("gemini", "flash")
+    assert not breaker.allow_request("gemini", "flash")
+
+    breaker.record_success("gemini", "flash")
+    assert breaker.get_status("gemini/flash")["state"] == CircuitState.HALF_OPEN
+    assert breaker.allow_request("gemini", "flash")
+    breaker.record_success("gemini", "flash")
+    assert breaker.get_status("gemini/flash")["state"] == CircuitState.CLOSED
+
+
+def test_breaker_probe_failure_reopens():
+    breaker = CircuitBreaker(min_calls=1, timeout=60)
+    breaker.record_failure("xai", "grok")
+    breaker.circuits["xai/grok"].opened_at -= 61  # open period elapsed
+
+    assert breaker.allow_request("xai", "grok")
+    breaker.record_failure("xai", "grok")
+
+    status = breaker.get_status("xai/grok")
+    assert status["state"] == CircuitState.OPEN
+    assert status["time_until_recovery"] > 50
@@ -0,0 +1,188 @@
+"""
+Test file for result_cache.py - pipeline result and provider call caches.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.providers import ai_provider
+from app.providers.ai_provider import AIProvider
+from app.services import orchestrate
+from app.services.pipeline import judge as judge_stage
+from app.utils.result_cache import ResultCache, SqliteStore, stage_uses_cache
+
+
+def test_disk_tier_survives_a_new_process(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+
+    async def run():
+        first = ResultCache(store=SqliteStore(path, max_entries=10))
+        await first.put("k", {"v": 1})
+        first.store.close()
+
+        # Fresh memory tier, same file: served from disk, then from memory
+        second = ResultCache(store=SqliteStore(path, max_entries=10))
+        assert await second.get("k") == {"v": 1}
+        assert await second.get("k") == {"v": 1}
+        assert await second.get("other") is None
+        return second.stats
+
+    stats = asyncio.run(run())
+    assert (stats["disk_hits"], stats["memory_hits"], stats["misses"]) == (1, 1, 1)
+
+
+def test_ttl_and_lru_eviction(tmp_path):
+    cache = ResultCache(
+        ttl=60,
+        memory_entries=2,
+        store=SqliteStore(str(tmp_path / "c.sqlite"), max_entries=2),
+    )
+
+    async def run():
+        for key in ["a", "b", "c"]:
+            await cache.put(key, {"key": key})
+        # "a" was least recently used in both tiers
+        assert await cache.get("a") is None
+
+        # Expire "c" everywhere
+        cache._memory["c"] = (time.time() - 120, {"key": "c"})
+        conn = cache.store._connect()
+        conn.execute("UPDATE cache_entries SET created_at = ?", (time.time() - 120,))
+        conn.commit()
+        assert await cache.get("c") is None
+
+    asyncio.run(run())
+    assert cache.stats["evictions"] >= 2
+
+
+def test_identical_run_is_served_from_cache(fake_stages):
+    async def run(**kwargs):
+        return await orchestrate.run_pipeline("same idea", "linkedin", **kwargs)
+
+    first = asyncio.run(run())
+    second = asyncio.run(run())
+
+    assert fake_stages.calls.count("generator") == 1
+    assert not first.cached and second.cached
+    assert second.v3 == first.v3 and second.shuffle_map == first.shuffle_map
+
+    # Different routing is a different key
+    asyncio.run(run(overrides={"models": {"pipeline": {"judge": "openai"}}}))
+    assert fake_stages.calls.count("generator") == 2
+
+    # refresh recomputes, bypass never touches the cache
+    assert not asyncio.run(run(cache_mode="refresh")).cached
+    assert not asyncio.run(run(cache_mode="bypass")).cached
+    assert fake_stages.calls.count("generator") == 4
+
+
+def test_refresh_and_bypass_skip_cached_provider_calls(fake_stages):
+    for mode in ("use", "refresh", "bypass"):
+        asyncio.run(orchestrate.run_pipeline(f"{mode} idea", "x", cache_mode=mode))
+
+    # Four stages per run: cached calls allowed only in "use" mode
+    assert fake_stages.use_cache == [True] * 4 + [False] * 8
+
+
+class CountingProvider(AIProvider):
+    """Provider that counts real (uncached) calls."""
+
+    provider_name = "fake-cache"
+    default_model = "fake-1"
+
+    def __init__(self, temperature: float = 0.7):
+        self.temperature = temperature
+        self.raw_calls = 0
+
+    @property
+    def sampling_params(self):
+        return {"temperature": self.temperature}
+
+    async def _generate_raw(self, prompt, model):
+        self.raw_calls += 1
+        return f"answer {self.raw_calls}", 10, 5
+
+
+def test_provider_calls_are_reused_unless_opted_out(monkeypatch):
+    monkeypatch.setattr(ai_provider, "PROVIDER_CACHE", ResultCache())
+    provider = CountingProvider()
+
+    async def run():
+        first = await provider.generate("prompt")
+        second = await provider.generate("prompt")
+        fresh = await provider.generate("prompt", use_cache=False)
+        other = await provider.generate("prompt", model="fake-2")
+        return first, second, fresh, other
+
+    first, second, fresh, other = asyncio.run(run())
+
+    assert second.content == first.content == "answer 1"
+    assert second.metrics.cached and second.metrics.input_tokens == 0
+    assert fresh.content == "answer 2" and not fresh.metrics.cached
+    assert other.content == "answer 3"
+
+    # Different sampling parameters are a different call
+    asyncio.run(CountingProvider(temperature=0.2).generate("prompt"))
+    assert ai_provider.PROVIDER_CACHE.stats["misses"] == 3
+
+
+def test_invalid_draft_is_evicted_and_retried_fresh(monkeypatch, fake_stages):
+    cache = ResultCache()
+    monkeypatch.setattr(ai_provider, "PROVIDER_CACHE", cache)
+    monkeypatch.setattr(orchestrate, "PROVIDER_CACHE", cache)
+    fake_stages.rejected.add("answer 1")
+    provider = CountingProvider()
+
+    async def fake_generate(
+        user_input, platform, config, deadline=None, use_cache=True
+    ):
+        return await provider.generate("prompt", use_cache=use_cache)
+
+    monkeypatch.setattr(orchestrate, "generate", fake_generate)
+
+    async def run():
+        result = await orchestrate.run_pipeline(
+            "idea", "linkedin", overrides={"pipeline_profile": "fast"}
+        )
+        return result, await provider.generate("prompt")
+
+    result, later = asyncio.run(run())
+
+    assert result.v1 == "answer 2"
+    # The invalid draft is not served to later identical calls either
+    assert later.content == "answer 3" and not later.metrics.cached
+
+
+def test_unparseable_judge_answer_is_retried_fresh(monkeypatch, fake_stages):
+    cache = ResultCache()
+    monkeypatch.setattr(ai_provider, "PROVIDER_CACHE", cache)
+    monkeypatch.setattr(orchestrate, "PROVIDER_CACHE", cache)
+    provider = CountingProvider()  # Answers "answer N", never JSON
+    # Same shuffle both times, so the retry sends the identical judge prompt
+    monkeypatch.setattr(orchestrate.random, "shuffle", lambda versions: None)
+    monkeypatch.setattr(orchestrate, "judge", judge_stage.judge)
+    monkeypatch.setattr(
+        judge_stage.ModelRouter,
+        "route",
+        staticmethod(lambda config, stage: [(provider, None)]),
+    )
+
+    def run():
+        return asyncio.run(orchestrate.run_pipeline("idea", "linkedin"))
+
+    first, retry = run(), run()
+
+    assert first.judge_result.ranking == [] and not retry.cached
+    assert retry.judge_result.raw_response == "answer 2"
+    assert not retry.judge_result.metrics["cached"]
+
+
+def test_stage_opt_out_from_request_and_config():
+    assert stage_uses_cache({}, "critic")
+    assert not stage_uses_cache({"fresh_stages": ["critic"]}, "critic")
+    assert stage_uses_cache({"fresh_stages": ["critic"]}, "judge")
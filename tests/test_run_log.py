@@ -0,0 +1,138 @@
+"""
+Test file for run_log.py - pipeline runs persisted stage by stage.
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import selectinload
+
+from app.core.database import Base
+from app.models.pipeline_runs import PipelineRun
+from app.services import orchestrate
+from app.services.pipeline.judge import JudgeResult
+from app.services.run_log import PipelineRunLog
+from tests.conftest import stage_response
+
+# Every stage prefers gemini, so only the critic's xai answer is a fallback
+ALL_GEMINI = {
+    "models": {
+        "pipeline": {
+            stage: "gemini" for stage in ["generator", "critic", "improver", "judge"]
+        }
+    }
+}
+
+
+@pytest.fixture
+def validations(fake_stages):
+    """Gemini answers (critic via xai fallback); returns the validation script."""
+    fake_stages.responses.update(
+        v1=stage_response("v1", provider="gemini", tokens=(10, 20)),
+        v2=stage_response("v2", provider="xai", tokens=(10, 20)),
+        v3=stage_response("v3", provider="gemini", cached=True),
+    )
+    fake_stages.judge_result = JudgeResult(
+        ranking=["B", "A", "C"],
+        scores={"A": 70, "B": 90, "C": 60},
+        model_name="judge-model",
+        provider_name="gemini",
+        metrics={"input_tokens": 30, "output_tokens": 5, "latency_ms": 3},
+    )
+    return fake_stages.validations
+
+
+def run_and_fetch(tmp_path, monkeypatch, scenario):
+    """Run `scenario()` against a run log on a temp DB; return stored runs."""
+
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'runs.sqlite'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        sessions = async_sessionmaker(engine, expire_on_commit=False)
+        log = PipelineRunLog(session_factory=sessions)
+        monkeypatch.setattr(orchestrate, "PIPELINE_RUN_LOG", log)
+        try:
+            await scenario()
+            await log.stop()
+            async with sessions() as db:
+                result = await db.execute(
+                    select(PipelineRun)
+                    .options(selectinload(PipelineRun.stages))
+                    .order_by(PipelineRun.started_at)
+                )
+                return list(result.scalars().all())
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(run())
+
+
+def test_completed_run_records_every_stage(tmp_path, monkeypatch, validations):
+    validations.extend([False, True])  # First generator draft is rejected
+
+    async def scenario():
+        await orchestrate.run_pipeline("idea", "linkedin", overrides=ALL_GEMINI)
+
+    [run] = run_and_fetch(tmp_path, monkeypatch, scenario)
+    assert run.status == "completed" and run.platform == "linkedin"
+    assert run.winner_version is not None
+    stages = [(s.stage, s.attempt, s.validation_passed) for s in run.stages]
+    assert stages == [
+        ("generator", 1, False),
+        ("generator", 2, True),
+        ("critic", 1, None),
+        ("improver", 1, None),
+        ("judge", 1, None),
+    ]
+    by_stage = {s.stage: s for s in run.stages}
+    assert by_stage["critic"].fallback_used and by_stage["critic"].provider == "xai"
+    assert not by_stage["generator"].fallback_used
+    assert by_stage["improver"].cached and by_stage["improver"].draft == "v3 text"
+    assert by_stage["judge"].model == "judge-model"
+    assert sorted(json.loads(by_stage["judge"].scores).values()) == [60, 70, 90]
+    assert run.input_tokens == 10 + 10 + 10 + 0 + 30
+    assert run.output_tokens == 20 + 20 + 20 + 0 + 5
+
+
+def test_failed_and_cached_runs_are_recorded(tmp_path, monkeypatch, validations):
+    async def scenario():
+        validations.extend([False, False])
+        with pytest.raises(ValueError):
+            await orchestrate.run_pipeline("idea", "x", overrides=ALL_GEMINI)
+        await orchestrate.run_pipeline("idea", "x", overrides=ALL_GEMINI)
+        await orchestrate.run_pipeline("idea", "x", overrides=ALL_GEMINI)
+
+    failed, completed, cached = run_and_fetch(tmp_path, monkeypatch, scenario)
+    assert failed.status == "failed" and "validation twice" in failed.error
+    assert [s.stage for s in failed.stages] == ["generator", "generator"]
+    assert completed.status == "completed"
+    assert cached.status == "cached" and cached.stages == []
+    assert cached.winner_version == completed.winner_version
+
+
+def test_write_failure_does_not_fail_the_run(monkeypatch, validations):
+    def broken_session():
+        raise RuntimeError("database is down")
+
+    log = PipelineRunLog(session_factory=broken_session)
+    monkeypatch.setattr(orchestrate, "PIPELINE_RUN_LOG", log)
+
+    async def run():
+        result = await orchestrate.run_pipeline("idea", "x")
+        assert log.stats == {"runs": 0, "errors": 0}  # Only enqueued so far
+        await log.stop()
+        return result
+
+    result = asyncio.run(run())
+    assert result.v3 == "v3 text"
+    assert log.stats == {"runs": 0, "errors": 1}
+    assert log.buffer.stats["failed"] == 1
@@ -0,0 +1,125 @@
+"""
+Test file for singleflight.py - identical in-flight requests share one run.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services import content as content_service
+from app.services.orchestrate import PipelineResult
+from app.services.pipeline.judge import JudgeResult
+from app.utils.singleflight import SingleFlight
+
+
+def test_concurrent_duplicates_share_one_run():
+    flights = SingleFlight()
+    runs = []
+
+    async def work():
+        runs.append(1)
+        await asyncio.sleep(0.02)
+        return "result"
+
+    async def run():
+        return await asyncio.gather(*(flights.do("key", work) for _ in range(3)))
+
+    assert asyncio.run(run()) == ["result"] * 3
+    assert len(runs) == 1
+    assert flights.stats["coalesced"] == 2
+    assert flights.in_flight == 0
+
+
+def test_run_is_cancelled_only_when_every_waiter_is_gone():
+    flights = SingleFlight()
+    cancelled = []
+
+    async def work():
+        try:
+            await asyncio.sleep(0.1)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+        return "done"
+
+    async def run():
+        first = asyncio.create_task(flights.do("key", work))
+        second = asyncio.create_task(flights.do("key", work))
+        await asyncio.sleep(0.01)
+
+        # One client leaves: the other still gets the result
+        first.cancel()
+        assert await second == "done"
+        assert cancelled == []
+
+        # Everyone leaves: the run is cancelled
+        third = asyncio.create_task(flights.do("other", work))
+        await asyncio.sleep(0.01)
+        third.cancel()
+        await asyncio.gather(third, return_exceptions=True)
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+    assert cancelled == [True]
+
+
+def test_caller_right_after_the_last_waiter_left_starts_a_new_run():
+    flights = SingleFlight()
+    runs = []
+
+    async def work():
+        runs.append(1)
+        try:
+            await asyncio.sleep(0.02)
+        except asyncio.CancelledError:
+            await asyncio.sleep(0.01)  # Slow to wind down
+            raise
+        return "done"
+
+    async def run():
+        first = asyncio.create_task(flights.do("key", work))
+        await asyncio.sleep(0.005)
+        first.cancel()
+        await asyncio.gather(first, return_exceptions=True)
+        # The cancelled run has not finished yet; a new client must not join it
+        return await flights.do("key", work)
+
+    assert asyncio.run(run()) == "done"
+    assert len(runs) == 2 and flights.stats["coalesced"] == 0
+
+
+def test_duplicate_generate_requests_run_the_pipeline_once(monkeypatch):
+    calls = []
+
+    async def fake_run_pipeline(user_input, platform, **kwargs):
+        calls.append(platform)
+        await asyncio.sleep(0.02)
+        return PipelineResult(
+            v1="v1",
+            v1_model="fake",
+            v2="v2",
+            v2_model="fake",
+            v3="v3",
+            v3_model="fake",
+            shuffle_map={"A": "v3", "B": "v1", "C": "v2"},
+            judge_result=JudgeResult(ranking=["A"], scores={"A": 90}, model_name="j"),
+        )
+
+    monkeypatch.setattr(content_service, "run_pipeline", fake_run_pipeline)
+
+    async def run():
+        return await asyncio.gather(
+            content_service.generate_content("same idea", ["x", "linkedin"]),
+            content_service.generate_content("same idea", ["x"]),
+            content_service.generate_content("other idea", ["x"]),
+        )
+
+    first, duplicate, other = asyncio.run(run())
+
+    assert sorted(calls) == ["linkedin", "x", "x"]
+    assert duplicate.results[0].content == first.results[0].content == "v3"
+    assert duplicate.results[0] is not first.results[0]
+    assert other.success_count == 1